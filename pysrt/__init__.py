@@ -4,7 +4,6 @@ from pysrt.srtexc import Error, InvalidItem, InvalidTimeString
 from pysrt.srtfile import SubRipFile
 from pysrt.srtitem import SubRipItem
 from pysrt.srttime import SubRipTime
-from pysrt.validation import ValidationError, ValidationOptions
 from pysrt.version import VERSION, VERSION_STRING
 
 __all__ = [
@@ -24,6 +23,18 @@ ERROR_PASS = SubRipFile.ERROR_PASS
 ERROR_LOG = SubRipFile.ERROR_LOG
 ERROR_RAISE = SubRipFile.ERROR_RAISE
 
+
+def __getattr__(name):
+    # Imported on first use to keep `import pysrt` and `srt` startup fast.
+    if name in ("ValidationError", "ValidationOptions"):
+        from pysrt import validation
+
+        return getattr(validation, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 open = SubRipFile.open
 stream = SubRipFile.stream
+stream_bytes = SubRipFile.stream_bytes
+iter_archive = SubRipFile.iter_archive
 from_string = SubRipFile.from_string
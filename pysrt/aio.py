@@ -0,0 +1,146 @@
+"""Asyncio counterparts of SubRipFile I/O methods.
+
+File reads and writes run in the default executor by chunks, and parsing
+or serializing yields back to the event loop after each chunk, so large
+files never block it for long.
+"""
+
+import asyncio
+import codecs
+import os
+
+from pysrt.compression import open_binary, open_file
+from pysrt.encoding import detect_encoding
+from pysrt.streaming import CHUNK_SIZE, BlockSplitter, LineSplitter, TextDecoder
+
+
+async def aopen(cls, path, encoding=None, error_handling=None):
+    """See SubRipFile.aopen."""
+    if error_handling is None:
+        error_handling = cls.ERROR_PASS
+    if encoding == cls.AUTO_ENCODING:
+        encoding = await asyncio.to_thread(detect_encoding, path, default=cls.DEFAULT_ENCODING)
+    elif not encoding:
+        encoding = await asyncio.to_thread(cls._detect_encoding, path)
+
+    source_file = await asyncio.to_thread(open_binary, path)
+    try:
+        new_file = cls(path=path, encoding=encoding)
+        lines = aiter_lines(_aiter_file(source_file), encoding)
+        first_line = await anext(lines, None)
+        if first_line is None:
+            new_file.eol = os.linesep
+            return new_file
+        new_file.eol = cls._guess_eol([first_line])
+        async for item in _aparse(cls, _prepend(first_line, lines), error_handling):
+            new_file.append(item)
+        return new_file
+    finally:
+        await asyncio.to_thread(source_file.close)
+
+
+async def astream(cls, source, encoding=None, error_handling=None):
+    """See SubRipFile.astream."""
+    if error_handling is None:
+        error_handling = cls.ERROR_PASS
+    if hasattr(source, "read"):
+        source = _aiter_reader(source)
+    async for item in _aparse(cls, aiter_lines(source, encoding), error_handling):
+        yield item
+
+
+async def awrite_into(srt_file, output, eol=None, encoding=None):
+    """See SubRipFile.awrite_into."""
+    # asyncio.StreamWriter: synchronous write() of bytes, then drain().
+    if hasattr(output, "drain"):
+        encoder = codecs.getincrementalencoder(encoding or srt_file.encoding)()
+        async for text in _aiter_output(srt_file, eol):
+            output.write(encoder.encode(text))
+            await output.drain()
+        output.write(encoder.encode("", final=True))
+        await output.drain()
+    else:
+        async for text in _aiter_output(srt_file, eol):
+            await output.write(text)
+
+
+async def asave(srt_file, path=None, encoding=None, eol=None):
+    """See SubRipFile.asave."""
+    path = path or srt_file.path
+    encoder = codecs.getincrementalencoder(encoding or srt_file.encoding)()
+    output_file = await asyncio.to_thread(open_file, path, "wb")
+    try:
+        async for text in _aiter_output(srt_file, eol):
+            await asyncio.to_thread(output_file.write, encoder.encode(text))
+        await asyncio.to_thread(output_file.write, encoder.encode("", final=True))
+    finally:
+        await asyncio.to_thread(output_file.close)
+
+
+async def aiter_lines(chunks, encoding=None):
+    """
+    Async counterpart of pysrt.streaming.iter_lines, also accepting str
+    chunks and letting the event loop run between chunks.
+    """
+    decoder = TextDecoder(encoding)
+    splitter = LineSplitter()
+    async for chunk in chunks:
+        text = chunk if isinstance(chunk, str) else decoder.decode(chunk)
+        for line in splitter.feed(text):
+            yield line
+        await asyncio.sleep(0)
+    for line in splitter.feed(decoder.decode(b"", final=True)) + splitter.close():
+        yield line
+
+
+async def _aparse(cls, lines, error_handling):
+    # Same item level semantics as SubRipFile.stream.
+    splitter = BlockSplitter()
+    async for line in lines:
+        block = splitter.feed(line)
+        if block:
+            item = cls._parse_block(block, error_handling)
+            if item is not None:
+                yield item
+    block = splitter.close()
+    if block:
+        item = cls._parse_block(block, error_handling)
+        if item is not None:
+            yield item
+
+
+async def _aiter_output(srt_file, eol):
+    batch = []
+    size = 0
+    for text in srt_file._iter_output(eol):
+        batch.append(text)
+        size += len(text)
+        if size >= CHUNK_SIZE:
+            yield "".join(batch)
+            batch = []
+            size = 0
+            await asyncio.sleep(0)
+    if batch:
+        yield "".join(batch)
+
+
+async def _aiter_file(source_file):
+    while True:
+        chunk = await asyncio.to_thread(source_file.read, CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def _aiter_reader(reader):
+    while True:
+        chunk = await reader.read(CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def _prepend(first, iterator):
+    yield first
+    async for value in iterator:
+        yield value
@@ -0,0 +1,226 @@
+"""
+Synchronization of a subtitle track against the audio of the video.
+
+The audio is read from a PCM WAV file with the standard `wave` module, a
+chunk at a time, and reduced to an energy envelope of one value per
+`frame_ms` frame. Frames louder than halfway between the quiet and loud
+ends of the envelope are considered speech. That voice activity signal
+replaces the reference track of pysrt.sync: the offset and frame rate
+ratio are estimated by cross correlation, then refined by a robust
+regression over the offsets found by correlating the two signals again
+in successive windows.
+
+NumPy is used when installed to compute the envelope.
+"""
+
+import math
+import sys
+import wave
+from array import array
+from operator import mul
+
+from pysrt.sync import (
+    MAX_OFFSET,
+    MAX_RATIO_CORRECTION,
+    MIN_ANCHORS,
+    RATIOS,
+    SyncResult,
+    align_signal,
+    default_resolution,
+    intervals,
+    numpy,
+    robust_linear_fit,
+    speech_signal,
+)
+
+FRAME_MS = 20
+CHUNK_FRAMES = 500
+# Energy does not need the whole spectrum: samples are decimated down to
+# about this rate before being squared.
+ENERGY_SAMPLE_RATE = 4000
+WINDOW_MS = 5 * 60 * 1000
+REFINE_PASSES = 2
+MIN_WINDOW_SPEECH = 0.1
+QUIET_PERCENTILE = 10
+LOUD_PERCENTILE = 90
+UNSIGNED_TO_SIGNED = bytes((value + 128) % 256 for value in range(256))
+
+
+def read_envelope(path, frame_ms=FRAME_MS, chunk_frames=CHUNK_FRAMES):
+    """
+    read_envelope(path[, frame_ms][, chunk_frames]) -> array of float
+
+    Energy in decibels of each `frame_ms` frame of the first channel of the
+    PCM WAV file at `path`. The file is read `chunk_frames` frames at a time,
+    so memory does not grow with the length of the audio. Raise ValueError
+    if the file is not PCM WAV.
+    """
+    try:
+        wav_file = wave.open(path, "rb")
+    except (wave.Error, EOFError) as error:
+        raise ValueError(f"{path}: not a PCM WAV file ({error})") from error
+    envelope = array("d")
+    with wav_file:
+        channels = wav_file.getnchannels()
+        width = wav_file.getsampwidth()
+        rate = wav_file.getframerate()
+        stride = channels * max(1, rate // ENERGY_SAMPLE_RATE)
+        frame_index = 0
+        while True:
+            # Frame boundaries in samples, exact even when a frame is not a
+            # whole number of samples.
+            bounds = [
+                (frame_index + offset) * rate * frame_ms // 1000
+                for offset in range(chunk_frames + 1)
+            ]
+            data = wav_file.readframes(bounds[-1] - bounds[0])
+            if not data:
+                break
+            samples = _samples(data, width)
+            count = len(samples) // channels
+            if numpy is not None:
+                envelope.extend(_numpy_energies(samples, bounds, count, channels))
+            else:
+                for start, end in zip(bounds, bounds[1:]):
+                    start -= bounds[0]
+                    end = min(end - bounds[0], count)
+                    if start >= end:
+                        break
+                    frame = samples[start * channels : end * channels : stride]
+                    power = sum(map(mul, frame, frame)) / len(frame)
+                    envelope.append(10 * math.log10(power + 1))
+            frame_index += chunk_frames
+    return envelope
+
+
+def _samples(data, width):
+    if width == 1:
+        return array("b", data.translate(UNSIGNED_TO_SIGNED))
+    if width == 3:
+        # The two most significant bytes of each sample are plenty here.
+        truncated = bytearray(len(data) // 3 * 2)
+        truncated[0::2] = data[1::3]
+        truncated[1::2] = data[2::3]
+        data, width = truncated, 2
+    samples = array({2: "h", 4: "i"}[width], data)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples
+
+
+def _numpy_energies(samples, bounds, count, channels):
+    values = numpy.asarray(samples, dtype=numpy.float64)[: count * channels : channels]
+    starts = numpy.array([bound - bounds[0] for bound in bounds[:-1] if bound - bounds[0] < count])
+    powers = numpy.add.reduceat(values * values, starts) / numpy.diff(numpy.append(starts, count))
+    return 10 * numpy.log10(powers + 1)
+
+
+def voice_activity(envelope):
+    """
+    voice_activity(envelope) -> list of float
+
+    1.0 for frames louder than halfway between the QUIET_PERCENTILE and
+    LOUD_PERCENTILE of `envelope` (in decibels), 0.0 for the others.
+    """
+    if not envelope:
+        return []
+    ordered = sorted(envelope)
+    quiet = ordered[len(ordered) * QUIET_PERCENTILE // 100]
+    loud = ordered[min(len(ordered) * LOUD_PERCENTILE // 100, len(ordered) - 1)]
+    threshold = (quiet + loud) / 2
+    return [1.0 if value > threshold else 0.0 for value in envelope]
+
+
+def align_to_audio(
+    srt_file,
+    path,
+    ratios=RATIOS,
+    resolution=None,
+    max_offset=MAX_OFFSET,
+    frame_ms=FRAME_MS,
+    window=WINDOW_MS,
+    refine=True,
+):
+    """
+    align_to_audio(srt_file, path[, ratios][, resolution][, max_offset][, frame_ms]
+                   [, window][, refine]) -> pysrt.sync.SyncResult
+
+    Estimate the transform bringing `srt_file` in sync with the speech of
+    the PCM WAV file at `path`. Arguments are those of
+    pysrt.sync.synchronize, plus:
+
+    frame_ms -> duration of the audio frames in milliseconds.
+    window -> duration in milliseconds of the windows in which the offset
+        is measured again to refine the estimate.
+
+    Example:
+        >>> result = align_to_audio(subs, 'movie.wav')
+        >>> subs.shift(**result.shift_arguments)
+    """
+    target_intervals = intervals(srt_file)
+    if not target_intervals:
+        raise ValueError("cannot synchronize an empty track")
+    activity = voice_activity(read_envelope(path, frame_ms))
+    if not activity:
+        raise ValueError(f"no audio in {path}")
+    if resolution is None:
+        resolution = default_resolution(
+            len(activity) * frame_ms,
+            max(end for _, end in target_intervals),
+            ratios,
+            max_offset,
+            step=frame_ms,
+        )
+    factor = max(1, resolution // frame_ms)
+    resolution = factor * frame_ms
+
+    # Centered so that silence and speech weigh the same, and loud audio
+    # all along does not attract the target.
+    mean = sum(activity) / len(activity)
+    activity = [value - mean for value in activity]
+    reference = [
+        sum(activity[first : first + factor]) / factor for first in range(0, len(activity), factor)
+    ]
+    ratio, offset, score = align_signal(reference, target_intervals, ratios, resolution, max_offset)
+
+    anchors = 0
+    coarse_ratio = ratio
+    # Lags are only searched within one coarse bin of the estimate, so a
+    # drift between the candidate ratios takes a second pass to settle.
+    for _ in range(REFINE_PASSES if refine else 0):
+        fit = _fit_windows(activity, target_intervals, ratio, offset, frame_ms, resolution, window)
+        if fit is None or abs(fit[0] / coarse_ratio - 1) > MAX_RATIO_CORRECTION:
+            break
+        ratio, offset, anchors = fit
+    return SyncResult(ratio, round(offset), score, anchors)
+
+
+def _fit_windows(activity, target_intervals, ratio, offset, frame_ms, max_lag_ms, window):
+    mapped = [(start * ratio + offset, end * ratio + offset) for start, end in target_intervals]
+    target = speech_signal(mapped, frame_ms, length=len(activity))
+    max_lag = max(1, max_lag_ms // frame_ms)
+    window_size = max(1, window // frame_ms)
+    padded = [0.0] * max_lag + activity + [0.0] * max_lag
+
+    xs = []
+    ys = []
+    for first in range(0, len(target), window_size):
+        target_window = target[first : first + window_size]
+        if sum(target_window) < MIN_WINDOW_SPEECH * len(target_window):
+            continue
+        lag = _best_lag(target_window, padded[first : first + len(target_window) + 2 * max_lag])
+        middle = (first + len(target_window) / 2) * frame_ms
+        xs.append((middle - offset) / ratio)
+        ys.append(middle + (lag - max_lag) * frame_ms)
+    if len(xs) < MIN_ANCHORS:
+        return None
+    return robust_linear_fit(xs, ys)
+
+
+def _best_lag(window, reference):
+    # Lags are few and windows short: direct products beat FFTs here.
+    if numpy is not None:
+        correlation = numpy.correlate(numpy.asarray(reference), numpy.asarray(window), "valid")
+        return int(numpy.argmax(correlation))
+    lags = range(len(reference) - len(window) + 1)
+    return max(lags, key=lambda lag: sum(map(mul, window, reference[lag : lag + len(window)])))
@@ -0,0 +1,158 @@
+"""Run `srt` file commands over many files with a pool of workers."""
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from pysrt.compression import strip_compression_extension
+from pysrt.operations import OPERATIONS, run_operation
+
+EXTENSION = ".srt"
+
+
+def find_files(patterns, extension=EXTENSION):
+    """
+    find_files(patterns[, extension]) -> list of (path, relative path)
+
+    Expand directories (recursively, keeping files ending with `extension`,
+    possibly followed by a compression extension such as .gz),
+    glob patterns and plain paths. Relative paths are taken from the
+    directory given, from the leading components of a glob pattern
+    without wildcards, or are the file name for plain paths. Duplicates
+    are removed, order is kept.
+    """
+    found = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, dirs, names in os.walk(pattern):
+                dirs.sort()
+                for name in sorted(names):
+                    if is_subtitle_file(name, extension):
+                        path = os.path.join(root, name)
+                        found.setdefault(path, os.path.relpath(path, pattern))
+        elif os.path.exists(pattern):
+            found.setdefault(pattern, os.path.basename(pattern))
+        else:
+            root = pattern
+            while glob.has_magic(root):
+                root = os.path.dirname(root)
+            for path in sorted(glob.glob(pattern, recursive=True)):
+                if os.path.isfile(path):
+                    found.setdefault(path, os.path.relpath(path, root or os.curdir))
+    return list(found.items())
+
+
+def is_subtitle_file(name, extension=EXTENSION):
+    """True for .srt files, compressed or not."""
+    return strip_compression_extension(name).lower().endswith(extension)
+
+
+def process_file(op, arguments, path, in_place=False, output_encoding=None, output_path=None):
+    """
+    process_file(op, arguments, path[, in_place][, output_encoding][, output_path])
+        -> progress record
+
+    Run `op` on a single file. Errors are reported in the record rather
+    than raised, so one bad file does not stop the batch.
+    """
+    started = time.perf_counter()
+    record = {"event": "file", "path": path}
+    try:
+        if output_path:
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        result = run_operation(
+            op,
+            arguments,
+            path=path,
+            in_place=in_place,
+            output_encoding=output_encoding,
+            output_path=output_path,
+        )
+    except Exception as error:
+        record.update(ok=False, error=f"{type(error).__name__}: {error}")
+    else:
+        record["ok"] = True
+        if "errors" in result:
+            record["errors"] = len(result["errors"])
+        if "paths" in result:
+            record["paths"] = result["paths"]
+        if output_path and "paths" not in result:
+            record["output"] = output_path
+    record["seconds"] = round(time.perf_counter() - started, 6)
+    return record
+
+
+def run_batch(
+    op,
+    patterns,
+    arguments=None,
+    jobs=None,
+    processes=False,
+    in_place=False,
+    output_encoding=None,
+    output_dir=None,
+    report=None,
+):
+    """
+    run_batch(op, patterns[, arguments][, jobs][, processes][, in_place]
+              [, output_encoding][, output_dir][, report]) -> summary
+
+    Run the `srt` command `op` (see pysrt.operations) on every file matched
+    by `patterns`, `jobs` files at a time.
+
+    processes -> bool: use a process pool instead of a thread pool, for
+        CPU bound commands on many cores.
+    in_place -> bool: overwrite each file, keeping a .bak backup.
+    output_dir -> str: write results there instead, keeping the directory
+        layout. One of `in_place` or `output_dir` is required by commands
+        producing a new file.
+    report -> callable: called with each progress record as files are
+        done, then with the summary.
+
+    Example:
+        >>> run_batch('shift', ['season1/'], {'time_offset': 2000}, in_place=True)
+        {'event': 'summary', 'files': 22, 'succeeded': 22, 'failed': 0, ...}
+    """
+    if op not in OPERATIONS:
+        raise ValueError(f"unknown operation {op!r}")
+    if op not in ("validate", "split") and not (in_place or output_dir):
+        raise ValueError(f"{op} needs either in_place or output_dir")
+
+    started = time.perf_counter()
+    summary = {"event": "summary", "files": 0, "succeeded": 0, "failed": 0, "invalid": 0}
+    files = find_files(patterns)
+    if output_dir:
+        sources = {}
+        for path, relative_path in files:
+            other = sources.setdefault(os.path.normcase(relative_path), path)
+            if other != path:
+                raise ValueError(
+                    f"{other} and {path} would both be written to "
+                    f"{os.path.join(output_dir, relative_path)}"
+                )
+    executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with executor_class(max_workers=jobs) as executor:
+        futures = {}
+        for path, relative_path in files:
+            output_path = os.path.join(output_dir, relative_path) if output_dir else None
+            future = executor.submit(
+                process_file, op, arguments, path, in_place, output_encoding, output_path
+            )
+            futures[future] = path
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except Exception as error:  # e.g. a crashed worker process
+                record = {"event": "file", "path": futures[future], "ok": False}
+                record["error"] = f"{type(error).__name__}: {error}"
+            summary["files"] += 1
+            summary["succeeded" if record["ok"] else "failed"] += 1
+            if record.get("errors"):
+                summary["invalid"] += 1
+            if report:
+                report(record)
+    summary["seconds"] = round(time.perf_counter() - started, 6)
+    if report:
+        report(summary)
+    return summary
@@ -0,0 +1,164 @@
+"""Persistent on-disk cache of parsed subtitle files."""
+
+import hashlib
+import os
+import tempfile
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+
+class ParseCache:
+    """
+    ParseCache(directory[, max_size])
+
+    Store parsed SubRipFile instances in `directory` so that opening an
+    unchanged file again skips encoding detection and parsing entirely.
+
+    Entries are keyed by absolute path, size, mtime, content hash and the
+    requested encoding. The total size of the directory is kept under
+    `max_size` bytes by evicting the least recently used entries. Entries
+    use the SubRipFile.to_bytes() binary format.
+
+    Several processes can share the same directory: entries are written to
+    a temporary file and atomically renamed into place, and readers treat a
+    vanished or unreadable entry as a cache miss.
+
+    Example:
+        >>> cache = ParseCache('/var/cache/pysrt')
+        >>> subs = pysrt.open('movie.srt', cache=cache)
+    """
+
+    SUFFIX = ".srtc"
+    LOW_WATER_RATIO = 0.9
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self._size = None
+        os.makedirs(directory, exist_ok=True)
+
+    def open(self, path, encoding=None, error_handling=None, jobs=1, cls=None):
+        """
+        open(path[, encoding][, error_handling][, jobs]) -> SubRipFile
+
+        Same as SubRipFile.open, but served from the cache when possible.
+        Parsing errors are only reported the first time a file is parsed.
+        """
+        if cls is None:
+            from pysrt.srtfile import SubRipFile as cls
+        if error_handling is None:
+            error_handling = cls.ERROR_PASS
+
+        key = self.key(path, encoding)
+        srt_file = self.load(key, path, cls)
+        if srt_file is None:
+            srt_file = cls.open(path, encoding=encoding, error_handling=error_handling, jobs=jobs)
+            self.store(key, srt_file)
+        return srt_file
+
+    def key(self, path, encoding=None):
+        stat = os.stat(path)
+        with open(path, "rb") as source_file:
+            content_hash = hashlib.file_digest(source_file, "sha256").hexdigest()
+        identity = "\0".join(
+            (
+                os.path.abspath(path),
+                str(stat.st_size),
+                str(stat.st_mtime_ns),
+                content_hash,
+                encoding or "",
+            )
+        )
+        return hashlib.sha256(identity.encode("utf-8", "surrogateescape")).hexdigest()
+
+    def load(self, key, path, cls):
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "rb") as entry_file:
+                payload = entry_file.read()
+            os.utime(entry_path)
+        except OSError:
+            return None
+        try:
+            return self.decode(payload, path, cls)
+        except ValueError:
+            return None
+
+    def store(self, key, srt_file):
+        payload = self.encode(srt_file)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                temp_file.write(payload)
+            os.replace(temp_path, self._entry_path(key))
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+
+        if self._size is None:
+            self._size = self._scan_size()
+        else:
+            self._size += len(payload)
+        if self._size > self.max_size:
+            self.evict()
+
+    def evict(self, target_size=None):
+        """
+        evict([target_size])
+
+        Remove least recently used entries until the cache is smaller than
+        `target_size` bytes (default to a bit less than `max_size`).
+        """
+        if target_size is None:
+            target_size = int(self.max_size * self.LOW_WATER_RATIO)
+
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total_size = sum(size for _, size, _ in entries)
+
+        entries.sort()
+        for _, size, entry_path in entries:
+            if total_size <= target_size:
+                break
+            try:
+                os.remove(entry_path)
+            except OSError:
+                pass
+            total_size -= size
+        self._size = total_size
+
+    def clear(self):
+        self.evict(target_size=0)
+
+    def encode(self, srt_file):
+        return srt_file.to_bytes()
+
+    def decode(self, payload, path, cls):
+        return cls.from_bytes(payload, path=path)
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def _entries(self):
+        try:
+            with os.scandir(self.directory) as entries:
+                return [entry for entry in entries if entry.name.endswith(self.SUFFIX)]
+        except OSError:
+            return []
+
+    def _scan_size(self):
+        total_size = 0
+        for entry in self._entries():
+            try:
+                total_size += entry.stat().st_size
+            except OSError:
+                pass
+        return total_size
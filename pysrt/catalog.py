@@ -0,0 +1,308 @@
+"""SQLite catalog of many subtitle files, for cross-file time and text queries."""
+
+import hashlib
+import os
+import sqlite3
+import time
+
+from pysrt.markup import join_text, strip_tags
+from pysrt.search import PREFIX_MARK, RE_TOKEN
+from pysrt.srtfile import SubRipFile
+from pysrt.srtitem import SubRipItem
+from pysrt.srttime import SubRipTime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER,
+    mtime_ns INTEGER,
+    sha256 TEXT,
+    encoding TEXT,
+    eol TEXT,
+    cue_count INTEGER NOT NULL,
+    ingested_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cues (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files (id),
+    position INTEGER NOT NULL,
+    idx TEXT,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    layout TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cues_file_start ON cues (file_id, start);
+CREATE INDEX IF NOT EXISTS cues_start ON cues (start);
+CREATE VIRTUAL TABLE IF NOT EXISTS cues_fts USING fts5 (
+    text, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+TRANSACTION_SIZE = 500
+
+
+def file_digest(path):
+    """file_digest(path) -> sha256 hex digest of the content of `path`"""
+    with open(path, "rb") as source_file:
+        return hashlib.file_digest(source_file, "sha256").hexdigest()
+
+
+class SubRipCatalog:
+    """
+    SubRipCatalog([path])
+
+    Catalog of subtitle files in a SQLite database (in memory by default),
+    answering queries over the cues of every file without opening them.
+
+    Cues are stored with their start and end times in milliseconds, and
+    their text, without tags, in an FTS5 full-text index which ignores case
+    and accents. Files are stored with their size, mtime, content hash,
+    encoding and end of line, so that ingesting a library again only
+    re-parses new and changed files.
+
+    Example:
+        >>> with SubRipCatalog('library.db') as catalog:
+        ...     catalog.ingest(['library/'])
+        ...     for srt_file in catalog.query('police', path='*/Show X/*',
+        ...                                   start={'minutes': 10}, end={'minutes': 12}):
+        ...         print(srt_file.path, [sub.start for sub in srt_file])
+    """
+
+    def __init__(self, path=":memory:"):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def ingest(self, patterns, encoding=SubRipFile.AUTO_ENCODING, force=False, report=None):
+        """
+        ingest(patterns[, encoding][, force][, report]) -> summary
+
+        Add the .srt files (possibly compressed) found in `patterns`, which
+        can be files, directories or glob patterns, as in `srt batch`.
+
+        Files whose size and mtime did not change are skipped, and so are
+        files whose content hash did not change. `force` re-parses every
+        file. Inserts are grouped in transactions of TRANSACTION_SIZE files.
+
+        report -> callable: called with a record for each file, then with
+            the summary.
+        """
+        from pysrt.batch import find_files
+
+        started = time.perf_counter()
+        summary = {"event": "summary", "files": 0, "added": 0, "updated": 0}
+        summary.update(unchanged=0, failed=0)
+        files = find_files(patterns)
+        for offset in range(0, len(files), TRANSACTION_SIZE):
+            with self.connection:
+                for path, _ in files[offset : offset + TRANSACTION_SIZE]:
+                    record = self._ingest_file(os.path.abspath(path), encoding, force)
+                    summary["files"] += 1
+                    summary[record["status"]] += 1
+                    if report:
+                        report(record)
+        summary["seconds"] = round(time.perf_counter() - started, 6)
+        if report:
+            report(summary)
+        return summary
+
+    def _ingest_file(self, path, encoding, force):
+        record = {"event": "file", "path": path}
+        try:
+            stat = os.stat(path)
+            row = self.connection.execute(
+                "SELECT size, mtime_ns, sha256 FROM files WHERE path = ?", (path,)
+            ).fetchone()
+            if not force and row and row[:2] == (stat.st_size, stat.st_mtime_ns):
+                record["status"] = "unchanged"
+                return record
+            digest = file_digest(path)
+            if not force and row and row[2] == digest:
+                self.connection.execute(
+                    "UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?",
+                    (stat.st_size, stat.st_mtime_ns, path),
+                )
+                record["status"] = "unchanged"
+                return record
+            srt_file = SubRipFile.open(path, encoding=encoding)
+            self._store(srt_file, path, stat.st_size, stat.st_mtime_ns, digest)
+        except Exception as error:
+            record.update(status="failed", error=f"{type(error).__name__}: {error}")
+            return record
+        record.update(status="updated" if row else "added", cues=len(srt_file))
+        return record
+
+    def add(self, srt_file, path=None):
+        """
+        add(srt_file[, path])
+
+        Store an already loaded SubRipFile under `path`, default to its own
+        path, replacing any previous version. It will be re-parsed by the
+        next `ingest` of that path.
+        """
+        path = path or srt_file.path
+        if not path:
+            raise ValueError("a path is required to catalog a SubRipFile")
+        with self.connection:
+            self._store(srt_file, path, None, None, None)
+
+    def _store(self, srt_file, path, size, mtime_ns, digest):
+        connection = self.connection
+        self._delete(path)
+        cursor = connection.execute(
+            "INSERT INTO files (path, size, mtime_ns, sha256, encoding, eol, cue_count,"
+            " ingested_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                path,
+                size,
+                mtime_ns,
+                digest,
+                srt_file.encoding,
+                srt_file._eol,
+                len(srt_file),
+                time.time(),
+            ),
+        )
+        file_id = cursor.lastrowid
+        first_id = (connection.execute("SELECT max(id) FROM cues").fetchone()[0] or 0) + 1
+        connection.executemany(
+            "INSERT INTO cues (id, file_id, position, idx, start, end, text, layout)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    first_id + position,
+                    file_id,
+                    position,
+                    None if item.index is None else str(item.index),
+                    item.start.ordinal,
+                    item.end.ordinal,
+                    item.text,
+                    item.position,
+                )
+                for position, item in enumerate(srt_file)
+            ),
+        )
+        connection.executemany(
+            "INSERT INTO cues_fts (rowid, text) VALUES (?, ?)",
+            (
+                (first_id + position, join_text(item.markup.tokens, " "))
+                for position, item in enumerate(srt_file)
+            ),
+        )
+
+    def remove(self, path):
+        """remove(path) -> True if `path` was in the catalog"""
+        with self.connection:
+            return self._delete(path)
+
+    def _delete(self, path):
+        row = self.connection.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return False
+        self.connection.execute(
+            "DELETE FROM cues_fts WHERE rowid IN (SELECT id FROM cues WHERE file_id = ?)", row
+        )
+        self.connection.execute("DELETE FROM cues WHERE file_id = ?", row)
+        self.connection.execute("DELETE FROM files WHERE id = ?", row)
+        return True
+
+    def files(self, path=None):
+        """
+        files([path]) -> list of dict
+
+        Metadata of the cataloged files, optionally only those matching the
+        `path` glob pattern, sorted by path.
+        """
+        columns = ("path", "size", "mtime_ns", "sha256", "encoding", "eol", "cue_count")
+        sql = f"SELECT {', '.join(columns)} FROM files"
+        parameters = ()
+        if path is not None:
+            sql += " WHERE path GLOB ?"
+            parameters = (path,)
+        rows = self.connection.execute(sql + " ORDER BY path", parameters)
+        return [dict(zip(columns, row)) for row in rows]
+
+    def open(self, path):
+        """open(path) -> the whole cataloged SubRipFile stored under `path`"""
+        srt_files = self._select("files.path = ?", [path])
+        if not srt_files:
+            raise KeyError(path)
+        return srt_files[0]
+
+    def query(self, text=None, path=None, start=None, end=None, match=None, limit=None):
+        """
+        query([text][, path][, start][, end][, match][, limit]) -> list of SubRipFile
+
+        Cues of every cataloged file matching all the given criteria, one
+        SubRipFile per file, sorted by path. The returned files only hold
+        the matching cues.
+
+        text -> str: words which must appear next to each other in the cue,
+            case and accents ignored. A trailing * matches word prefixes.
+        path -> str: glob pattern on the absolute file path.
+        start, end -> objects coercible to SubRipTime: cues overlapping
+            this time window.
+        match -> str: raw FTS5 query, e.g. 'police NOT car'.
+        limit -> int: maximum number of cues.
+        """
+        conditions = []
+        parameters = []
+        if text is not None:
+            words = RE_TOKEN.findall(strip_tags(text, " "))
+            if not words:
+                return []
+            phrase = '"' + " ".join(words) + '"'
+            if text.rstrip().endswith(PREFIX_MARK):
+                phrase += " *"
+            match = phrase if match is None else f"({match}) AND {phrase}"
+        if match is not None:
+            conditions.append("cues.id IN (SELECT rowid FROM cues_fts WHERE cues_fts MATCH ?)")
+            parameters.append(match)
+        if path is not None:
+            conditions.append("files.path GLOB ?")
+            parameters.append(path)
+        if start is not None:
+            conditions.append("cues.end > ?")
+            parameters.append(SubRipTime.coerce(start).ordinal)
+        if end is not None:
+            conditions.append("cues.start < ?")
+            parameters.append(SubRipTime.coerce(end).ordinal)
+        return self._select(" AND ".join(conditions) or "1", parameters, limit)
+
+    def _select(self, condition, parameters, limit=None):
+        sql = (
+            "SELECT files.path, files.encoding, files.eol,"
+            " cues.idx, cues.start, cues.end, cues.text, cues.layout"
+            " FROM cues JOIN files ON files.id = cues.file_id"
+            f" WHERE {condition} ORDER BY files.path, cues.position"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters = list(parameters) + [limit]
+        srt_files = []
+        for path, encoding, eol, index, start, end, text, layout in self.connection.execute(
+            sql, parameters
+        ):
+            if not srt_files or srt_files[-1].path != path:
+                srt_files.append(SubRipFile(eol=eol, path=path, encoding=encoding))
+            item = SubRipItem(
+                index,
+                SubRipTime.from_ordinal(start),
+                SubRipTime.from_ordinal(end),
+                text,
+                layout,
+            )
+            srt_files[-1].append(item)
+        return srt_files
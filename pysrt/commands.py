@@ -5,13 +5,13 @@ import argparse
 import codecs
 import os
 import re
-import shutil
 import sys
 from textwrap import dedent
+from types import SimpleNamespace
 
-from chardet import detect
-
-from pysrt import VERSION_STRING, SubRipFile, SubRipTime
+from pysrt import VERSION_STRING, InvalidTimeString, SubRipFile, SubRipTime
+from pysrt.compression import open_file, strip_compression_extension
+from pysrt.encoding import detect_encoding, normalize_encoding
 
 
 def underline(string):
@@ -26,7 +26,12 @@ class TimeAwareArgumentParser(argparse.ArgumentParser):
             args = sys.argv[1:]
         args = list(args)
         for index, arg in enumerate(args):
-            match = self.RE_TIME_REPRESENTATION.match(arg)
+            if arg == "--":
+                time_index = -1
+                break
+            # Only negative offsets could be mistaken for options, and
+            # option values such as `--jobs 2` must be left alone.
+            match = arg.startswith("-") and self.RE_TIME_REPRESENTATION.match(arg)
             if match:
                 time_index = index
                 break
@@ -88,20 +93,193 @@ class SubRipShifter:
                 $ srt split 20m 20m movie.srt
                 => creates movie.1.srt, movie.2.srt and movie.3.srt
     """)
+    SYNC_EPILOG = dedent("""\
+
+        The estimated transform is printed on stderr, the synchronized
+        subtitles on stdout (or in place with -i).
+
+        Examples:
+            Synchronize a release against another one, or another language:
+                $ srt -i sync reference.srt movie.srt
+
+            Synchronize against the audio of the video, as a PCM WAV file:
+                $ ffmpeg -i movie.mkv -ac 1 -ar 16000 movie.wav
+                $ srt -i sync movie.wav movie.srt
+
+            Only print the estimate, as JSON:
+                $ srt sync --estimate reference.srt movie.srt
+    """)
+    REMAP_EPILOG = dedent("""\
+
+        Times between two anchors are interpolated, times before the first
+        anchor or after the last one keep its offset. Two anchors with the
+        same target mark a removed segment, whose cues are clipped (or
+        dropped with --drop). The number of removed cues is printed on stderr.
+
+        Examples:
+            2 minutes of ads were cut out after 10 minutes:
+                $ srt -i remap 10m=10m 12m=10m movie.srt
+
+            Anchors read from a file, one "HH:MM:SS,mmm HH:MM:SS,mmm" pair per line:
+                $ srt remap --anchors anchors.txt movie.srt > remapped.srt
+    """)
+    SNAP_EPILOG = dedent("""\
+
+        The shot changes file holds one timestamp per line, as HH:MM:SS,mmm
+        or in milliseconds. The number of subtitles moved is printed on
+        stderr; --report writes one JSON object per moved subtitle.
+
+        Examples:
+            Snap to shot changes within 12 frames at 25 fps:
+                $ srt -i snap --window 480ms shots.txt movie.srt
+
+            Keep the adjustments for QA:
+                $ srt snap --report snaps.ndjson shots.txt movie.srt > snapped.srt
+    """)
+    RETIME_EPILOG = dedent("""\
+
+        Subtitles read faster than --cps are extended into the gaps around
+        them, and take the spare time of their neighbours. Subtitles that
+        are still too fast are listed on stderr.
+
+        Examples:
+            At most 15 characters per second, subtitles from 1 to 6 seconds:
+                $ srt -i retime --cps 15 --min-duration 1s --max-duration 6s movie.srt
+    """)
+    ANCHOR_HELP = "SOURCE=TARGET, both timestamps as [Hh][Mm]S[s][MSms] or HH:MM:SS,mmm"
     FRAME_RATE_HELP = "A frame rate in fps (commonly 23.9 or 25)"
     ENCODING_HELP = dedent("""\
         Change file encoding. Useful for players accepting only latin1 subtitles.
         List of supported encodings: http://docs.python.org/library/codecs.html#standard-encodings
     """)
     BREAK_EPILOG = dedent("""\
-        Break lines longer than defined length
+
+        Lines are laid out again, balanced and preferably broken after
+        punctuation. Tags do not count in the length and existing line
+        breaks are dropped, except before dialogue dashes.
+
+        Examples:
+            Lines of at most 42 characters:
+                $ srt -i break 42 movie.srt
+
+            At most 2 lines, of more than 32 characters for texts too long for 2 lines:
+                $ srt break --max-lines 2 32 movie.srt > wrapped.srt
+    """)
+    LENGTH_HELP = "Maximum number of characters per line, unless --max-lines is exceeded"
+    FOLLOW_EPILOG = dedent("""\
+
+        Examples:
+            Print cues as a live captioning encoder appends them:
+                $ srt follow live.srt
+
+            Only print cues appended from now on:
+                $ srt follow --new-only live.srt
     """)
-    LENGTH_HELP = "Maximum number of characters per line"
+
+    SERVE_EPILOG = dedent("""\
+
+        Requests and responses are JSON objects, one per line:
+            {"id": 1, "op": "shift", "path": "movie.srt", "args": {"time_offset": "2s"}}
+            {"id": 1, "ok": true, "content": "1\\n00:00:03,000 --> ..."}
+
+        Examples:
+            Serve on a Unix socket, caching parsed files:
+                $ srt serve --socket /tmp/srt.sock --cache-dir ~/.cache/pysrt
+
+            Forward commands to it:
+                $ srt --daemon /tmp/srt.sock shift 2s movie.srt
+                $ SRT_DAEMON_SOCKET=/tmp/srt.sock srt -i rate 23.9 25 movie.srt
+    """)
+    BATCH_EPILOG = dedent("""\
+
+        Progress is printed as one JSON object per file, then a summary:
+            {"event": "file", "path": "s01/e01.srt", "ok": true, "seconds": 0.004}
+            {"event": "summary", "files": 22, "succeeded": 22, "failed": 0, ...}
+
+        Examples:
+            Shift a whole season in-place, 8 files at a time:
+                $ srt -i batch -j 8 shift 2s season1/
+
+            Convert every file to latin1 into another directory:
+                $ srt -e iso-8859-1 batch -o latin1/ shift 0 'library/**/*.srt'
+
+            Validate a library:
+                $ srt batch validate library/
+    """)
+    WATCH_EPILOG = dedent("""\
+
+        Examples:
+            Fix overlaps then validate every file dropped in incoming/:
+                $ srt watch incoming/ -- fix-overlaps --buffer 50 -- validate
+
+            Write shifted copies instead of editing in-place:
+                $ srt watch -o shifted/ incoming/ -- shift 2s
+    """)
+    INDEX_EPILOG = dedent("""\
+
+        Only new and changed files are parsed again, progress is printed as
+        one JSON object per file, then a summary.
+
+        Examples:
+            Catalog a library:
+                $ srt index library.db library/
+    """)
+    QUERY_EPILOG = dedent("""\
+
+        Examples:
+            Cues of Show X containing "police" between 10 and 12 minutes:
+                $ srt query library.db police --path '*/Show X/*' --start 10m --end 12m
+
+            Words starting with "polic", as JSON lines:
+                $ srt query library.db 'polic*' --json
+    """)
+    GREP_EPILOG = dedent("""\
+
+        Matching cues are printed as PATH:INDEX:START --> END:TEXT, with the
+        lines of the text separated by " / ".
+
+        Examples:
+            Search a whole library, ignoring case and tags, 8 files at a time:
+                $ srt grep -i --strip-tags -j 8 'police' library/
+
+            Count matching cues per file, as JSON lines:
+                $ srt grep -c --json 'fuck|shit' 'library/**/*.srt'
+    """)
+    DAEMON_ENVIRON = "SRT_DAEMON_SOCKET"
+    # Options of the srt command itself which take a value.
+    VALUE_OPTIONS = ("-e", "--output-encoding", "--daemon")
+    DAEMON_HELP = dedent("""\
+        Forward the command to a `srt serve --socket` daemon if one is listening there.
+        Default to the SRT_DAEMON_SOCKET environment variable.
+    """)
+
+    COMMANDS = (
+        ("shift", "Shift subtitles by specified time offset", "add_shift_parser"),
+        ("rate", "Convert subtitles from a frame rate to another", "add_rate_parser"),
+        ("split", "Split a file in multiple parts", "add_split_parser"),
+        ("break", "Break long lines", "add_break_parser"),
+        ("validate", "Validate subtitle file integrity", "add_validate_parser"),
+        ("fix-overlaps", "Fix overlapping subtitles", "add_fix_overlaps_parser"),
+        ("follow", "Print cues as they are appended to a growing file", "add_follow_parser"),
+        ("serve", "Serve requests on a Unix socket or stdin/stdout", "add_serve_parser"),
+        ("batch", "Run a command over many files", "add_batch_parser"),
+        ("watch", "Run commands on files added or changed in a directory", "add_watch_parser"),
+        ("index", "Add files to a catalog database", "add_index_parser"),
+        ("query", "Search the cues of a catalog database", "add_query_parser"),
+        ("grep", "Print cues matching a regular expression in many files", "add_grep_parser"),
+        ("sync", "Synchronize subtitles against a reference track", "add_sync_parser"),
+        ("remap", "Move subtitles along a piecewise-linear mapping", "add_remap_parser"),
+        ("snap", "Snap subtitles to shot changes", "add_snap_parser"),
+        ("retime", "Lengthen subtitles to a reading speed", "add_retime_parser"),
+    )
+
+    FILELESS_COMMANDS = ("serve", "batch", "watch", "index", "query", "grep")
+    BATCH_COMMANDS = ("shift", "rate", "split", "break", "validate", "fix-overlaps")
 
     def __init__(self):
         self.output_file_path = None
 
-    def build_parser(self):
+    def build_parser(self, args=None):
         parser = TimeAwareArgumentParser(
             description=self.DESCRIPTION, formatter_class=argparse.RawTextHelpFormatter
         )
@@ -121,14 +299,61 @@ class SubRipShifter:
             type=self.parse_encoding,
             help=self.ENCODING_HELP,
         )
+        parser.add_argument(
+            "--daemon",
+            metavar=underline("socket"),
+            action="store",
+            dest="daemon",
+            default=os.environ.get(self.DAEMON_ENVIRON),
+            help=self.DAEMON_HELP,
+        )
         parser.add_argument(
             "-v", "--version", action="version", version=f"%(prog)s {VERSION_STRING}"
         )
-        subparsers = parser.add_subparsers(title="commands")
+        subparsers = parser.add_subparsers(title="commands", dest="command", required=True)
+
+        # Only the invoked command gets its full argument tree, the others
+        # are just listed for --help and command name validation.
+        command = self.find_command(args)
+        for name, help_text, add_arguments in self.COMMANDS:
+            if command is None or command == name:
+                command_parser = getattr(self, add_arguments)(subparsers, name, help_text)
+                command_parser.set_defaults(command=name)
+                if name not in self.FILELESS_COMMANDS:
+                    command_parser.add_argument("file", action="store")
+            else:
+                subparsers.add_parser(name, help=help_text, add_help=False)
+
+        return parser
+
+    def find_command(self, args):
+        if args is None:
+            return None
+        names = {name for name, _, _ in self.COMMANDS}
+        arguments = iter(args)
+        for arg in arguments:
+            if self.takes_value(arg):
+                next(arguments, None)
+            elif not arg.startswith("-"):
+                return arg if arg in names else None
+        return None
+
+    def takes_value(self, arg):
+        """True for a top level option followed by its value, e.g. `--daemon`."""
+        if arg in self.VALUE_OPTIONS:
+            return True
+        # argparse also accepts unambiguous prefixes of long options.
+        return (
+            arg.startswith("--")
+            and len(arg) > 2
+            and "=" not in arg
+            and any(option.startswith(arg) for option in self.VALUE_OPTIONS)
+        )
 
+    def add_shift_parser(self, subparsers, name, help_text):
         shift_parser = subparsers.add_parser(
-            "shift",
-            help="Shift subtitles by specified time offset",
+            name,
+            help=help_text,
             epilog=self.SHIFT_EPILOG,
             formatter_class=argparse.RawTextHelpFormatter,
         )
@@ -140,20 +365,24 @@ class SubRipShifter:
             help=self.TIMESTAMP_HELP,
         )
         shift_parser.set_defaults(action=self.shift)
+        return shift_parser
 
+    def add_rate_parser(self, subparsers, name, help_text):
         rate_parser = subparsers.add_parser(
-            "rate",
-            help="Convert subtitles from a frame rate to another",
+            name,
+            help=help_text,
             epilog=self.RATE_EPILOG,
             formatter_class=argparse.RawTextHelpFormatter,
         )
         rate_parser.add_argument("initial", action="store", type=float, help=self.FRAME_RATE_HELP)
         rate_parser.add_argument("final", action="store", type=float, help=self.FRAME_RATE_HELP)
         rate_parser.set_defaults(action=self.rate)
+        return rate_parser
 
+    def add_split_parser(self, subparsers, name, help_text):
         split_parser = subparsers.add_parser(
-            "split",
-            help="Split a file in multiple parts",
+            name,
+            help=help_text,
             epilog=self.SPLIT_EPILOG,
             formatter_class=argparse.RawTextHelpFormatter,
         )
@@ -161,27 +390,40 @@ class SubRipShifter:
             "limits", action="store", nargs="+", type=self.parse_time, help=self.LIMITS_HELP
         )
         split_parser.set_defaults(action=self.split)
+        return split_parser
 
+    def add_break_parser(self, subparsers, name, help_text):
         break_parser = subparsers.add_parser(
-            "break",
-            help="Break long lines",
+            name,
+            help=help_text,
             epilog=self.BREAK_EPILOG,
             formatter_class=argparse.RawTextHelpFormatter,
         )
         break_parser.add_argument("length", action="store", type=int, help=self.LENGTH_HELP)
+        break_parser.add_argument(
+            "--max-lines",
+            type=int,
+            default=0,
+            dest="max_lines",
+            help="Maximum number of lines per subtitle, made longer to fit (default: no limit)",
+        )
         break_parser.set_defaults(action=self.break_lines)
+        return break_parser
 
+    def add_validate_parser(self, subparsers, name, help_text):
         validate_parser = subparsers.add_parser(
-            "validate",
-            help="Validate subtitle file integrity",
+            name,
+            help=help_text,
             epilog="Check for timing issues, overlaps, and malformed entries",
             formatter_class=argparse.RawTextHelpFormatter,
         )
         validate_parser.set_defaults(action=self.validate_file)
+        return validate_parser
 
+    def add_fix_overlaps_parser(self, subparsers, name, help_text):
         fix_overlaps_parser = subparsers.add_parser(
-            "fix-overlaps",
-            help="Fix overlapping subtitles",
+            name,
+            help=help_text,
             epilog="Adjust timing to prevent subtitle overlaps",
             formatter_class=argparse.RawTextHelpFormatter,
         )
@@ -192,18 +434,421 @@ class SubRipShifter:
             help="Minimum gap between subtitles in milliseconds (default: 20)",
         )
         fix_overlaps_parser.set_defaults(action=self.fix_overlaps_action)
+        return fix_overlaps_parser
+
+    def add_sync_parser(self, subparsers, name, help_text):
+        sync_parser = subparsers.add_parser(
+            name,
+            help=help_text,
+            epilog=self.SYNC_EPILOG,
+            formatter_class=argparse.RawTextHelpFormatter,
+        )
+        sync_parser.add_argument(
+            "reference", action="store", help="Subtitles in sync, or a .wav file of the audio"
+        )
+        sync_parser.add_argument(
+            "--max-offset",
+            type=self.parse_time,
+            default=5 * SubRipTime.MINUTES_RATIO,
+            dest="max_offset",
+            help="Largest offset searched, either way (default: 5m)",
+        )
+        sync_parser.add_argument(
+            "--no-drift",
+            action="store_true",
+            dest="no_drift",
+            help="Only search an offset, not a frame rate conversion",
+        )
+        sync_parser.add_argument(
+            "--estimate", action="store_true", help="Only print the estimate, as JSON"
+        )
+        sync_parser.set_defaults(action=self.sync)
+        return sync_parser
 
-        parser.add_argument("file", action="store")
+    def add_remap_parser(self, subparsers, name, help_text):
+        remap_parser = subparsers.add_parser(
+            name,
+            help=help_text,
+            epilog=self.REMAP_EPILOG,
+            formatter_class=argparse.RawTextHelpFormatter,
+        )
+        remap_parser.add_argument(
+            "anchors", action="store", nargs="*", type=self.parse_anchor, help=self.ANCHOR_HELP
+        )
+        remap_parser.add_argument(
+            "--anchors",
+            metavar=underline("path"),
+            dest="anchors_file",
+            help="File of anchors, one whitespace separated SOURCE TARGET pair per line",
+        )
+        remap_parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="Drop the cues overlapping a removed segment instead of clipping them",
+        )
+        remap_parser.set_defaults(action=self.remap)
+        return remap_parser
 
-        return parser
+    def add_snap_parser(self, subparsers, name, help_text):
+        snap_parser = subparsers.add_parser(
+            name,
+            help=help_text,
+            epilog=self.SNAP_EPILOG,
+            formatter_class=argparse.RawTextHelpFormatter,
+        )
+        snap_parser.add_argument("shot_changes", action="store", help="Shot changes file")
+        snap_parser.add_argument(
+            "--window",
+            type=self.parse_time,
+            default=500,
+            help="Largest move of a start or end (default: 500ms)",
+        )
+        snap_parser.add_argument(
+            "--min-gap",
+            type=self.parse_time,
+            default=80,
+            dest="min_gap",
+            help="Minimum gap between subtitles (default: 80ms)",
+        )
+        snap_parser.add_argument(
+            "--min-duration",
+            type=self.parse_time,
+            default=833,
+            dest="min_duration",
+            help="Minimum subtitle duration (default: 833ms)",
+        )
+        snap_parser.add_argument(
+            "--report",
+            metavar=underline("path"),
+            help="Write the adjustments to this file, one JSON object per line",
+        )
+        snap_parser.set_defaults(action=self.snap)
+        return snap_parser
+
+    def add_retime_parser(self, subparsers, name, help_text):
+        retime_parser = subparsers.add_parser(
+            name,
+            help=help_text,
+            epilog=self.RETIME_EPILOG,
+            formatter_class=argparse.RawTextHelpFormatter,
+        )
+        retime_parser.add_argument(
+            "--cps",
+            type=float,
+            default=17,
+            help="Maximum characters per second (default: 17)",
+        )
+        retime_parser.add_argument(
+            "--min-gap",
+            type=self.parse_time,
+            default=80,
+            dest="min_gap",
+            help="Minimum gap between subtitles (default: 80ms)",
+        )
+        retime_parser.add_argument(
+            "--min-duration",
+            type=self.parse_time,
+            default=833,
+            dest="min_duration",
+            help="Minimum subtitle duration (default: 833ms)",
+        )
+        retime_parser.add_argument(
+            "--max-duration",
+            type=self.parse_time,
+            default=7000,
+            dest="max_duration",
+            help="Maximum subtitle duration (default: 7s)",
+        )
+        retime_parser.set_defaults(action=self.retime)
+        return retime_parser
+
+    def add_follow_parser(self, subparsers, name, help_text):
+        follow_parser = subparsers.add_parser(
+            name,
+            help=help_text,
+            epilog=self.FOLLOW_EPILOG,
+            formatter_class=argparse.RawTextHelpFormatter,
+        )
+        follow_parser.add_argument(
+            "--interval",
+            type=float,
+            default=0.25,
+            help="Polling interval in seconds (default: 0.25)",
+        )
+        follow_parser.add_argument(
+            "--new-only",
+            action="store_true",
+            dest="new_only",
+            help="Skip the cues already in the file",
+        )
+        follow_parser.set_defaults(action=self.follow)
+        return follow_parser
+
+    def add_serve_parser(self, subparsers, name, help_text):
+        serve_parser = subparsers.add_parser(
+            name,
+            help=help_text,
+            epilog=self.SERVE_EPILOG,
+            formatter_class=argparse.RawTextHelpFormatter,
+        )
+        serve_parser.add_argument(
+            "--socket",
+            metavar=underline("path"),
+            help="Listen on this Unix socket instead of stdin/stdout",
+        )
+        serve_parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of requests processed concurrently",
+        )
+        serve_parser.add_argument(
+            "--cache-dir",
+            metavar=underline("directory"),
+            dest="cache_dir",
+            help="Keep parsed files in this directory between requests",
+        )
+        serve_parser.set_defaults(action=self.serve)
+        return serve_parser
+
+    def add_batch_parser(self, subparsers, name, help_text):
+        batch_parser = subparsers.add_parser(
+            name,
+            help=help_text,
+            epilog=self.BATCH_EPILOG,
+            formatter_class=argparse.RawTextHelpFormatter,
+        )
+        batch_parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=None,
+            help="Number of files processed concurrently (default: number of CPUs)",
+        )
+        batch_parser.add_argument(
+            "--processes",
+            action="store_true",
+            help="Use worker processes instead of threads",
+        )
+        batch_parser.add_argument(
+            "-o",
+            "--output-dir",
+            metavar=underline("directory"),
+            dest="output_dir",
+            help="Write results in this directory instead of editing files in-place",
+        )
+        operation_parsers = batch_parser.add_subparsers(title="commands", required=True)
+        for operation_parser in self.add_operation_parsers(operation_parsers):
+            operation_parser.add_argument(
+                "paths", nargs="+", help="Files, directories or glob patterns"
+            )
+            operation_parser.set_defaults(action=self.batch)
+        return batch_parser
+
+    def add_watch_parser(self, subparsers, name, help_text):
+        watch_parser = subparsers.add_parser(
+            name,
+            help=help_text,
+            epilog=self.WATCH_EPILOG,
+            formatter_class=argparse.RawTextHelpFormatter,
+        )
+        watch_parser.add_argument("directory", action="store")
+        watch_parser.add_argument(
+            "operations",
+            nargs=argparse.REMAINDER,
+            help="Commands to run on each new or changed file, separated by --",
+        )
+        watch_parser.add_argument(
+            "--state",
+            metavar=underline("file"),
+            help="Where processed files are recorded (default: DIRECTORY/.srt-watch.json)",
+        )
+        watch_parser.add_argument(
+            "--debounce",
+            type=float,
+            default=1.0,
+            help="Seconds a file must stay unchanged before being processed (default: 1)",
+        )
+        watch_parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Polling interval in seconds when inotify is not used (default: 1)",
+        )
+        watch_parser.add_argument(
+            "--polling", action="store_true", help="Poll even if inotify is available"
+        )
+        watch_parser.add_argument(
+            "-o",
+            "--output-dir",
+            metavar=underline("directory"),
+            dest="output_dir",
+            help="Write results in this directory instead of editing files in-place",
+        )
+        watch_parser.set_defaults(action=self.watch)
+        return watch_parser
+
+    def add_index_parser(self, subparsers, name, help_text):
+        index_parser = subparsers.add_parser(
+            name,
+            help=help_text,
+            epilog=self.INDEX_EPILOG,
+            formatter_class=argparse.RawTextHelpFormatter,
+        )
+        index_parser.add_argument("database", action="store")
+        index_parser.add_argument("paths", nargs="+", help="Files, directories or glob patterns")
+        index_parser.add_argument(
+            "--force", action="store_true", help="Parse files again even if unchanged"
+        )
+        index_parser.set_defaults(action=self.index)
+        return index_parser
+
+    def add_query_parser(self, subparsers, name, help_text):
+        query_parser = subparsers.add_parser(
+            name,
+            help=help_text,
+            epilog=self.QUERY_EPILOG,
+            formatter_class=argparse.RawTextHelpFormatter,
+        )
+        query_parser.add_argument("database", action="store")
+        query_parser.add_argument(
+            "text",
+            nargs="?",
+            help="Words to search, case and accents ignored (trailing * for prefixes)",
+        )
+        query_parser.add_argument(
+            "--path", metavar=underline("pattern"), help="Only files matching this glob pattern"
+        )
+        query_parser.add_argument(
+            "--start", type=self.parse_time, help="Only cues ending after this time"
+        )
+        query_parser.add_argument(
+            "--end", type=self.parse_time, help="Only cues starting before this time"
+        )
+        query_parser.add_argument(
+            "--match", metavar=underline("query"), help="Raw FTS5 query, e.g. 'police NOT car'"
+        )
+        query_parser.add_argument("--limit", type=int, help="Maximum number of cues")
+        query_parser.add_argument(
+            "--json", action="store_true", help="Print one JSON object per cue"
+        )
+        query_parser.set_defaults(action=self.query)
+        return query_parser
+
+    def add_grep_parser(self, subparsers, name, help_text):
+        grep_parser = subparsers.add_parser(
+            name,
+            help=help_text,
+            epilog=self.GREP_EPILOG,
+            formatter_class=argparse.RawTextHelpFormatter,
+        )
+        grep_parser.add_argument("pattern", help="Regular expression searched in each cue")
+        grep_parser.add_argument("paths", nargs="+", help="Files, directories or glob patterns")
+        grep_parser.add_argument(
+            "-i", "--ignore-case", action="store_true", dest="ignore_case", help="Ignore case"
+        )
+        grep_parser.add_argument(
+            "-F",
+            "--fixed-strings",
+            action="store_true",
+            dest="fixed_strings",
+            help="Search the pattern as a plain string",
+        )
+        grep_parser.add_argument(
+            "--strip-tags",
+            action="store_true",
+            dest="strip_tags",
+            help="Search the text without tags such as <i>",
+        )
+        grep_parser.add_argument(
+            "--join-lines",
+            action="store_true",
+            dest="join_lines",
+            help="Search the lines of each cue joined by spaces",
+        )
+        grep_parser.add_argument(
+            "--encoding",
+            type=self.parse_encoding,
+            help="Input encoding (default: BOM, then UTF-8, then detected)",
+        )
+        grep_parser.add_argument(
+            "-c", "--count", action="store_true", help="Only print the number of matching cues"
+        )
+        grep_parser.add_argument(
+            "-l",
+            "--files-with-matches",
+            action="store_true",
+            dest="files_with_matches",
+            help="Only print the paths of files with matches",
+        )
+        grep_parser.add_argument(
+            "--json", action="store_true", help="Print one JSON object per line"
+        )
+        grep_parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=None,
+            help="Number of files searched concurrently (default: number of CPUs)",
+        )
+        grep_parser.add_argument(
+            "--processes",
+            action="store_true",
+            help="Use worker processes instead of threads",
+        )
+        grep_parser.set_defaults(action=self.grep)
+        return grep_parser
+
+    def add_operation_parsers(self, subparsers):
+        """Add the commands usable by batch and watch, return their parsers."""
+        operation_parsers = []
+        for name, help_text, add_arguments in self.COMMANDS:
+            if name in self.BATCH_COMMANDS:
+                operation_parser = getattr(self, add_arguments)(subparsers, name, help_text)
+                operation_parser.set_defaults(operation=name)
+                operation_parsers.append(operation_parser)
+        return operation_parsers
+
+    def parse_operations(self, args):
+        """
+        parse_operations(args) -> list of (operation, arguments)
+
+        Parse command lines such as `fix-overlaps --buffer 50 -- validate`.
+        """
+        from pysrt.operations import OPERATIONS
+
+        parser = TimeAwareArgumentParser(prog=f"{self.arguments.command} operations")
+        self.add_operation_parsers(parser.add_subparsers(title="commands", required=True))
+        operations = []
+        command_line = []
+        for arg in list(args) + ["--"]:
+            if arg != "--":
+                command_line.append(arg)
+            elif command_line:
+                namespace = parser.parse_args(command_line)
+                _, argument_types = OPERATIONS[namespace.operation]
+                arguments = {name: getattr(namespace, name) for name in argument_types}
+                operations.append((namespace.operation, arguments))
+                command_line = []
+        return operations
 
     def run(self, args):
-        self.arguments = self.build_parser().parse_args(args)
+        self.arguments = self.build_parser(args).parse_args(args)
+
+        if getattr(self.arguments, "file", None) is None:
+            self.arguments.action()
 
-        if os.path.isfile(self.arguments.file):
+        elif os.path.isfile(self.arguments.file):
+            if self.arguments.daemon and self.forward():
+                return
             if self.arguments.in_place:
                 self.create_backup()
-            self.arguments.action()
+            try:
+                self.arguments.action()
+            finally:
+                # Compressed outputs are only complete once closed.
+                if self.output_file_path and hasattr(self, "_output_file"):
+                    self._output_file.close()
 
         else:
             print("No such file", self.arguments.file)
@@ -218,6 +863,15 @@ class SubRipShifter:
         )
         return -ordinal if negative else ordinal
 
+    def parse_anchor(self, anchor_string):
+        source, separator, target = anchor_string.partition("=")
+        if not separator:
+            raise argparse.ArgumentTypeError(f"expected SOURCE=TARGET, got {anchor_string!r}")
+        return tuple(
+            SubRipTime.coerce(time_string) if ":" in time_string else self.parse_time(time_string)
+            for time_string in (source, target)
+        )
+
     def parse_encoding(self, encoding_name):
         try:
             codecs.lookup(encoding_name)
@@ -235,16 +889,27 @@ class SubRipShifter:
         self.input_file.write_into(self.output_file)
 
     def split(self):
+        file_names = []
         limits = [0] + self.arguments.limits + [self.input_file[-1].end.ordinal + 1]
-        base_name, extension = os.path.splitext(self.arguments.file)
+        # Parts are named after the output path when there is one: the
+        # original file with -i, the destination in batches.
+        path = self.output_file_path or self.arguments.file
+        uncompressed_path = strip_compression_extension(path)
+        base_name, extension = os.path.splitext(uncompressed_path)
+        # movie.srt.gz -> movie.1.srt.gz
+        extension += path[len(uncompressed_path) :]
         for index, (start, end) in enumerate(zip(limits[:-1], limits[1:])):
             file_name = f"{base_name}.{index + 1}{extension}"
             part_file = self.input_file.slice(ends_after=start, starts_before=end)
             part_file.shift(milliseconds=-start)
             part_file.clean_indexes()
             part_file.save(path=file_name, encoding=self.output_encoding)
+            file_names.append(file_name)
+        return file_names
 
     def create_backup(self):
+        import shutil
+
         backup_file = self.arguments.file + self.BACKUP_EXTENSION
         if not os.path.exists(backup_file):
             shutil.copy2(self.arguments.file, backup_file)
@@ -252,14 +917,14 @@ class SubRipShifter:
         self.arguments.file = backup_file
 
     def break_lines(self):
-        split_re = re.compile(r"(.{,%i})(?:\s+|$)" % self.arguments.length)
-        for item in self.input_file:
-            item.text = "\n".join(split_re.split(item.text)[1::2])
+        self.input_file.break_lines(self.arguments.length, self.arguments.max_lines)
         self.input_file.write_into(self.output_file)
 
     def validate_file(self):
         """Validate subtitle file and print errors."""
-        errors = self.input_file.validate()
+        self.report_validation(self.input_file.validate())
+
+    def report_validation(self, errors):
         if errors:
             print(f"Found {len(errors)} validation errors:")
             for err in errors[:20]:  # Show first 20
@@ -275,6 +940,339 @@ class SubRipShifter:
         self.input_file.fix_overlaps(buffer_ms=self.arguments.buffer)
         self.input_file.write_into(self.output_file)
 
+    def sync(self):
+        """Shift the file in sync with the reference track."""
+        import json
+
+        from pysrt.sync import RATIOS, synchronize
+
+        options = {
+            "ratios": (1.0,) if self.arguments.no_drift else RATIOS,
+            "max_offset": self.arguments.max_offset,
+        }
+        try:
+            if self.arguments.reference.lower().endswith(".wav"):
+                from pysrt.audio import align_to_audio
+
+                result = align_to_audio(self.input_file, self.arguments.reference, **options)
+            else:
+                reference = SubRipFile.open(
+                    self.arguments.reference,
+                    encoding=SubRipFile.AUTO_ENCODING,
+                    error_handling=SubRipFile.ERROR_LOG,
+                )
+                result = synchronize(reference, self.input_file, **options)
+        except ValueError as error:
+            print(error, file=sys.stderr)
+            sys.exit(2)
+        if self.arguments.estimate:
+            print(json.dumps(result._asdict()))
+            return
+        print(
+            f"Offset {result.offset}ms, ratio {result.ratio:.6f} "
+            f"(score {result.score:.2f}, {result.anchors} anchors)",
+            file=sys.stderr,
+        )
+        result.apply(self.input_file)
+        self.input_file.write_into(self.output_file)
+
+    def remap(self):
+        """Move the cues along the piecewise-linear mapping through the anchors."""
+        from pysrt.timing import parse_timestamp
+
+        anchors = list(self.arguments.anchors)
+        if self.arguments.anchors_file:
+            with open(self.arguments.anchors_file, encoding="utf-8") as anchors_file:
+                for line_number, line in enumerate(anchors_file, 1):
+                    if not line.strip() or line.lstrip().startswith("#"):
+                        continue
+                    try:
+                        source, target = line.split()
+                        anchors.append((parse_timestamp(source), parse_timestamp(target)))
+                    except (ValueError, InvalidTimeString):
+                        print(
+                            f"{self.arguments.anchors_file}:{line_number}: "
+                            f"expected 'source target' timestamps, got {line.strip()!r}",
+                            file=sys.stderr,
+                        )
+                        sys.exit(2)
+        try:
+            removed = self.input_file.remap(anchors, drop=self.arguments.drop)
+        except ValueError as error:
+            print(error, file=sys.stderr)
+            sys.exit(2)
+        if removed:
+            print(f"Removed {len(removed)} cues", file=sys.stderr)
+            self.input_file.clean_indexes()
+        self.input_file.write_into(self.output_file)
+
+    def snap(self):
+        """Snap the cues to the shot changes, and report the adjustments."""
+        import json
+        from dataclasses import asdict
+
+        from pysrt.timing import read_shot_changes
+
+        adjustments = self.input_file.snap_to_shot_changes(
+            read_shot_changes(self.arguments.shot_changes),
+            window_ms=self.arguments.window,
+            min_gap_ms=self.arguments.min_gap,
+            min_duration_ms=self.arguments.min_duration,
+        )
+        print(f"Snapped {len(adjustments)} of {len(self.input_file)} cues", file=sys.stderr)
+        if self.arguments.report:
+            with open(self.arguments.report, "w", encoding="utf-8") as report:
+                for adjustment in adjustments:
+                    report.write(json.dumps(asdict(adjustment)) + "\n")
+        self.input_file.write_into(self.output_file)
+
+    def retime(self):
+        """Lengthen the cues read too fast, and list those still too fast."""
+        unsatisfied = self.input_file.retime_for_cps(
+            max_cps=self.arguments.cps,
+            min_gap_ms=self.arguments.min_gap,
+            min_duration_ms=self.arguments.min_duration,
+            max_duration_ms=self.arguments.max_duration,
+        )
+        if unsatisfied:
+            print("Still too fast or too short:", file=sys.stderr)
+            for cue in unsatisfied:
+                print(
+                    f"  #{cue.index} {cue.characters_per_second} cps, {cue.missing_ms}ms short",
+                    file=sys.stderr,
+                )
+        self.input_file.write_into(self.output_file)
+
+    def follow(self):
+        """Print cues as soon as they are appended to the file."""
+        from pysrt.follow import SubRipFollower
+
+        follower = SubRipFollower(self.arguments.file, error_handling=SubRipFile.ERROR_LOG)
+        if self.arguments.new_only:
+            follower.poll()
+        try:
+            for item in follower.follow(interval=self.arguments.interval):
+                SubRipFile([item], eol="\n").write_into(self.output_file)
+                self.output_file.flush()
+        except KeyboardInterrupt:
+            pass
+
+    def serve(self):
+        """Process JSON-lines requests until interrupted, see pysrt.server."""
+        import signal
+
+        from pysrt.server import SubRipServer
+
+        # Let `kill` go through the same cleanup as ^C, removing the socket.
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        cache = None
+        if self.arguments.cache_dir:
+            from pysrt.cache import ParseCache
+
+            cache = ParseCache(self.arguments.cache_dir)
+        server = SubRipServer(workers=self.arguments.workers, cache=cache)
+        try:
+            if self.arguments.socket:
+                server.serve_unix(self.arguments.socket)
+            else:
+                server.serve_stdio()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+
+    def batch(self):
+        """Run the operation over every file and report progress as NDJSON."""
+        import json
+
+        from pysrt.batch import run_batch
+        from pysrt.operations import OPERATIONS
+
+        _, argument_types = OPERATIONS[self.arguments.operation]
+        try:
+            summary = run_batch(
+                self.arguments.operation,
+                self.arguments.paths,
+                arguments={name: getattr(self.arguments, name) for name in argument_types},
+                jobs=self.arguments.jobs,
+                processes=self.arguments.processes,
+                in_place=self.arguments.in_place,
+                output_encoding=self.arguments.output_encoding,
+                output_dir=self.arguments.output_dir,
+                report=lambda record: print(json.dumps(record, ensure_ascii=False), flush=True),
+            )
+        except ValueError as error:
+            print(error, file=sys.stderr)
+            sys.exit(2)
+        if summary["failed"] or summary["invalid"]:
+            sys.exit(1)
+
+    def watch(self):
+        """Process new and changed files until interrupted, reporting as NDJSON."""
+        import json
+
+        from pysrt.watch import SubRipWatcher
+
+        operations = self.parse_operations(self.arguments.operations)
+        if not operations:
+            print("No command to run, expected: srt watch DIRECTORY -- COMMAND", file=sys.stderr)
+            sys.exit(2)
+        watcher = SubRipWatcher(
+            self.arguments.directory,
+            operations,
+            state_path=self.arguments.state,
+            debounce=self.arguments.debounce,
+            interval=self.arguments.interval,
+            output_dir=self.arguments.output_dir,
+            output_encoding=self.arguments.output_encoding,
+            report=lambda record: print(json.dumps(record, ensure_ascii=False), flush=True),
+            polling=self.arguments.polling,
+        )
+        try:
+            watcher.watch()
+        except KeyboardInterrupt:
+            pass
+
+    def index(self):
+        """Add files to the catalog, reporting progress as NDJSON."""
+        import json
+
+        from pysrt.catalog import SubRipCatalog
+
+        with SubRipCatalog(self.arguments.database) as catalog:
+            summary = catalog.ingest(
+                self.arguments.paths,
+                force=self.arguments.force,
+                report=lambda record: print(json.dumps(record, ensure_ascii=False), flush=True),
+            )
+        if summary["failed"]:
+            sys.exit(1)
+
+    def query(self):
+        """Print the matching cues of the catalog, exit with 1 if there are none."""
+        import json
+
+        from pysrt.catalog import SubRipCatalog
+
+        if not os.path.isfile(self.arguments.database):
+            print("No such file", self.arguments.database)
+            sys.exit(2)
+        with SubRipCatalog(self.arguments.database) as catalog:
+            srt_files = catalog.query(
+                self.arguments.text,
+                path=self.arguments.path,
+                start=self.arguments.start,
+                end=self.arguments.end,
+                match=self.arguments.match,
+                limit=self.arguments.limit,
+            )
+        for srt_file in srt_files:
+            if self.arguments.json:
+                for item in srt_file:
+                    print(json.dumps(self.cue_record(srt_file.path, item), ensure_ascii=False))
+            else:
+                print(f"==> {srt_file.path} <==")
+                srt_file.write_into(self.output_file, eol="\n")
+        if not srt_files:
+            sys.exit(1)
+
+    @staticmethod
+    def cue_record(path, item):
+        return {
+            "path": path,
+            "index": item.index,
+            "start": str(item.start),
+            "end": str(item.end),
+            "text": item.text,
+        }
+
+    def grep(self):
+        """Print the matching cues of every file, exit with 1 if there are none."""
+        import json
+
+        from pysrt.grep import run_grep
+
+        if not self.arguments.fixed_strings:
+            try:
+                re.compile(self.arguments.pattern)
+            except re.error as error:
+                print(f"Invalid pattern: {error}", file=sys.stderr)
+                sys.exit(2)
+        records = run_grep(
+            self.arguments.pattern,
+            self.arguments.paths,
+            jobs=self.arguments.jobs,
+            processes=self.arguments.processes,
+            ignore_case=self.arguments.ignore_case,
+            fixed_strings=self.arguments.fixed_strings,
+            strip_tags=self.arguments.strip_tags,
+            join_lines=self.arguments.join_lines,
+            encoding=self.arguments.encoding,
+        )
+        matched = failed = False
+        for record in records:
+            path, matches = record["path"], record["matches"]
+            if "error" in record:
+                failed = True
+                print(f"{path}: {record['error']}", file=sys.stderr)
+                continue
+            matched = matched or bool(matches)
+            if self.arguments.count:
+                if self.arguments.json:
+                    print(json.dumps({"path": path, "count": len(matches)}, ensure_ascii=False))
+                else:
+                    print(f"{path}:{len(matches)}")
+            elif self.arguments.files_with_matches:
+                if matches:
+                    print(
+                        json.dumps({"path": path}, ensure_ascii=False)
+                        if self.arguments.json
+                        else path
+                    )
+            else:
+                for item in matches:
+                    if self.arguments.json:
+                        print(json.dumps(self.cue_record(path, item), ensure_ascii=False))
+                    else:
+                        text = " / ".join(item.text.splitlines())
+                        print(f"{path}:{item.index}:{item.start} --> {item.end}:{text}")
+        if failed:
+            sys.exit(2)
+        if not matched:
+            sys.exit(1)
+
+    def forward(self):
+        """
+        Send the command to the daemon listening on --daemon instead of
+        running it here. Return False if no daemon answers.
+        """
+        from pysrt.operations import OPERATIONS
+        from pysrt.server import send_request
+
+        if self.arguments.command not in OPERATIONS:
+            return False
+        _, argument_types = OPERATIONS[self.arguments.command]
+        request = {
+            "op": self.arguments.command,
+            "path": os.path.abspath(self.arguments.file),
+            "args": {name: getattr(self.arguments, name) for name in argument_types},
+            "in_place": self.arguments.in_place,
+            "output_encoding": self.arguments.output_encoding,
+        }
+        try:
+            response = send_request(self.arguments.daemon, request)
+        except OSError:
+            return False
+
+        if not response["ok"]:
+            print(response["error"], file=sys.stderr)
+            sys.exit(1)
+        if "errors" in response:
+            self.report_validation([SimpleNamespace(**error) for error in response["errors"]])
+        elif "content" in response:
+            self.output_file.write(response["content"])
+        return True
+
     @property
     def output_encoding(self):
         return self.arguments.output_encoding or self.input_file.encoding
@@ -282,9 +1280,10 @@ class SubRipShifter:
     @property
     def input_file(self):
         if not hasattr(self, "_source_file"):
-            encoding = self.detect_input_encoding()
             self._source_file = SubRipFile.open(
-                self.arguments.file, encoding=encoding, error_handling=SubRipFile.ERROR_LOG
+                self.arguments.file,
+                encoding=SubRipFile.AUTO_ENCODING,
+                error_handling=SubRipFile.ERROR_LOG,
             )
         return self._source_file
 
@@ -292,26 +1291,19 @@ class SubRipShifter:
     def output_file(self):
         if not hasattr(self, "_output_file"):
             if self.output_file_path:
-                self._output_file = codecs.open(
-                    self.output_file_path, "w+", encoding=self.output_encoding
+                self._output_file = open_file(
+                    self.output_file_path, "w", encoding=self.output_encoding, newline=""
                 )
             else:
                 self._output_file = sys.stdout
         return self._output_file
 
     def detect_input_encoding(self):
-        bom_encoding = SubRipFile._detect_encoding(self.arguments.file)
-        if bom_encoding != SubRipFile.DEFAULT_ENCODING:
-            return bom_encoding
-        with open(self.arguments.file, "rb") as f:
-            content = f.read()
-        detected_encoding = self.normalize_encoding(detect(content).get("encoding"))
-        return detected_encoding or bom_encoding
+        return detect_encoding(self.arguments.file, default=SubRipFile.DEFAULT_ENCODING)
 
     def normalize_encoding(self, encoding):
-        if not encoding:
-            return None
-        return encoding.lower().replace("-", "_")
+        """Kept for compatibility, see pysrt.encoding.normalize_encoding."""
+        return normalize_encoding(encoding)
 
 
 def main():
@@ -0,0 +1,141 @@
+"""Transparent access to compressed and archived subtitle files.
+
+gzip, bzip2 and xz files are recognized by their extension, or for files
+with neither a known compressed extension nor the .srt one, by their magic
+bytes. They are decompressed (or compressed) on the fly, by the standard
+library modules, which are only imported when needed.
+"""
+
+import fnmatch
+import io
+import os
+
+EXTENSIONS = {
+    ".gz": "gzip",
+    ".gzip": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".lzma": "xz",
+}
+MAGIC_BYTES = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+)
+LONGEST_MAGIC = max(len(magic) for magic, _ in MAGIC_BYTES)
+PLAIN_EXTENSION = ".srt"
+ARCHIVE_PATTERN = "*.srt"
+
+
+def compression_from_extension(path):
+    """compression_from_extension(path) -> "gzip", "bz2", "xz" or None"""
+    return EXTENSIONS.get(os.path.splitext(os.fspath(path))[1].lower())
+
+
+def strip_compression_extension(path):
+    """strip_compression_extension('movie.srt.gz') -> 'movie.srt'"""
+    if compression_from_extension(path):
+        return os.path.splitext(path)[0]
+    return path
+
+
+def detect_compression(path):
+    """
+    detect_compression(path) -> "gzip", "bz2", "xz" or None
+
+    Use the file extension, and the first bytes of the file when the
+    extension is not enough to tell.
+    """
+    compression = compression_from_extension(path)
+    if compression or os.fspath(path).lower().endswith(PLAIN_EXTENSION):
+        return compression
+    with open(path, "rb") as source_file:
+        first_bytes = source_file.read(LONGEST_MAGIC)
+    for magic, compression in MAGIC_BYTES:
+        if first_bytes.startswith(magic):
+            return compression
+    return None
+
+
+def open_binary(path, mode="rb", compression=None):
+    """
+    open_binary(path[, mode][, compression]) -> binary file object
+
+    Open `path` like open(path, mode), decompressing or compressing on the
+    fly. When reading, the compression is detected with
+    `detect_compression`; when writing, only the extension is used.
+    """
+    if compression is None:
+        if "r" in mode:
+            compression = detect_compression(path)
+        else:
+            compression = compression_from_extension(path)
+    if compression is None:
+        return open(path, mode)
+    if compression == "gzip":
+        import gzip
+
+        return gzip.open(path, mode)
+    if compression == "bz2":
+        import bz2
+
+        return bz2.open(path, mode)
+    if compression == "xz":
+        import lzma
+
+        return lzma.open(path, mode)
+    raise ValueError(f"unknown compression {compression!r}")
+
+
+def open_file(path, mode="r", encoding=None, newline=None, compression=None):
+    """
+    open_file(path[, mode][, encoding][, newline][, compression]) -> file object
+
+    Same as the open() builtin for text modes, through `open_binary`.
+    """
+    binary_mode = mode.replace("t", "").replace("b", "") + "b"
+    binary_file = open_binary(path, binary_mode, compression=compression)
+    if "b" in mode:
+        return binary_file
+    return io.TextIOWrapper(binary_file, encoding=encoding, newline=newline)
+
+
+def iter_archive(path, pattern=ARCHIVE_PATTERN, encoding=None, error_handling=None, cls=None):
+    """See SubRipFile.iter_archive."""
+    import zipfile
+
+    if cls is None:
+        from pysrt.srtfile import SubRipFile as cls
+    if error_handling is None:
+        error_handling = cls.ERROR_PASS
+
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and _matches(info.filename, pattern):
+                    with archive.open(info) as member:
+                        yield (
+                            info.filename,
+                            _read_member(cls, member, info.filename, encoding, error_handling),
+                        )
+        return
+
+    import tarfile
+
+    # Stream mode: members are decompressed in order, without seeking.
+    with tarfile.open(path, "r|*") as archive:
+        for info in archive:
+            if info.isfile() and _matches(info.name, pattern):
+                member = io.BytesIO(archive.extractfile(info).read())
+                yield info.name, _read_member(cls, member, info.name, encoding, error_handling)
+
+
+def _matches(name, pattern):
+    return fnmatch.fnmatch(name.rsplit("/", 1)[-1].lower(), pattern.lower())
+
+
+def _read_member(cls, binary_file, name, encoding, error_handling):
+    source_file, encoding = cls._decode_binary_file(binary_file, claimed_encoding=encoding)
+    new_file = cls(path=name, encoding=encoding)
+    new_file.read(source_file, error_handling=error_handling)
+    return new_file
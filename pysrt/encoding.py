@@ -0,0 +1,147 @@
+"""Input encoding detection."""
+
+import codecs
+import os
+from functools import lru_cache
+
+from pysrt.compression import open_binary
+
+BOMS = (
+    (codecs.BOM_UTF32_LE, "utf_32_le"),
+    (codecs.BOM_UTF32_BE, "utf_32_be"),
+    (codecs.BOM_UTF16_LE, "utf_16_le"),
+    (codecs.BOM_UTF16_BE, "utf_16_be"),
+    (codecs.BOM_UTF8, "utf_8"),
+)
+# Every BOM decodes to U+FEFF, no need to load the codecs to know it.
+CODECS_BOMS = {codec: "\ufeff" for bom, codec in BOMS}
+BIGGER_BOM = max(len(bom) for bom, encoding in BOMS)
+
+DEFAULT_ENCODING = "utf_8"
+CHUNK_SIZE = 64 * 1024
+SAMPLE_SIZE = 256 * 1024
+# chardet is not fed more once this confident in its guess.
+CONFIDENCE_THRESHOLD = 0.9
+CACHE_SIZE = 1024
+
+
+def detect_bom(first_bytes):
+    """
+    detect_bom(first_bytes) -> encoding name or None
+
+    Return the encoding announced by a byte order mark at the start of
+    `first_bytes`, if any.
+    """
+    for bom, encoding in BOMS:
+        if first_bytes.startswith(bom):
+            return encoding
+    return None
+
+
+def normalize_encoding(encoding):
+    if not encoding:
+        return None
+    return encoding.lower().replace("-", "_")
+
+
+def detect_encoding(
+    path, sample_size=SAMPLE_SIZE, default=DEFAULT_ENCODING, threshold=CONFIDENCE_THRESHOLD
+):
+    """
+    detect_encoding(path[, sample_size][, default][, threshold]) -> encoding name
+
+    Detection is done in three steps, cheapest first:
+      1. a byte order mark at the start of the file;
+      2. a strict incremental UTF-8 decoding of the whole file, read by
+         chunks so memory usage stays constant;
+      3. chardet's incremental detector, fed at most `sample_size` bytes
+         and stopped as soon as it is done or its confidence reaches
+         `threshold` (between 0 and 1, None to only stop when done).
+
+    Compressed files are decompressed on the fly, see pysrt.compression.
+
+    Results are cached by file identity (path, size and mtime), so opening
+    the same unmodified file again does not re-read it.
+    """
+    stat = os.stat(path)
+    return _detect_encoding(
+        os.path.abspath(path), stat.st_size, stat.st_mtime_ns, sample_size, default, threshold
+    )
+
+
+def detect_stream_encoding(
+    source_file, sample_size=SAMPLE_SIZE, default=DEFAULT_ENCODING, threshold=CONFIDENCE_THRESHOLD
+):
+    """
+    detect_stream_encoding(source_file[, sample_size][, default][, threshold])
+        -> encoding name
+
+    Same as `detect_encoding` for a seekable binary file object, such as a
+    decompressed stream or an archive member. The file is rewound after.
+    """
+    try:
+        encoding = detect_bom(source_file.read(BIGGER_BOM))
+        if encoding:
+            return encoding
+        source_file.seek(0)
+        if _is_utf8(source_file):
+            return DEFAULT_ENCODING
+        source_file.seek(0)
+        return _chardet_detect(source_file, sample_size, threshold) or default
+    finally:
+        source_file.seek(0)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _detect_encoding(path, size, mtime_ns, sample_size, default, threshold):
+    with open_binary(path) as source_file:
+        return detect_stream_encoding(source_file, sample_size, default, threshold)
+
+
+def _is_utf8(source_file):
+    decoder = codecs.getincrementaldecoder("utf_8")(errors="strict")
+    try:
+        for chunk in iter(lambda: source_file.read(CHUNK_SIZE), b""):
+            decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _chardet_detect(source_file, sample_size, threshold=CONFIDENCE_THRESHOLD):
+    import chardet
+
+    detector = chardet.UniversalDetector()
+    # chardet < 7 runs its probers as it is fed. Later versions only buffer
+    # the data and analyze it on close(), so the first chunk is analyzed on
+    # its own instead, once.
+    incremental = hasattr(detector, "charset_probers")
+    remaining = sample_size
+    first = True
+    while remaining > 0 and not detector.done:
+        chunk = source_file.read(min(CHUNK_SIZE, remaining))
+        if not chunk:
+            break
+        detector.feed(chunk)
+        remaining -= len(chunk)
+        if threshold is not None and remaining > 0:
+            if incremental:
+                if _prober_confidence(detector) >= threshold:
+                    break
+            elif first:
+                result = chardet.detect(chunk)
+                if result["confidence"] >= threshold:
+                    return normalize_encoding(result.get("encoding"))
+        first = False
+    detector.close()
+    return normalize_encoding(detector.result.get("encoding"))
+
+
+def _prober_confidence(detector):
+    return max((prober.get_confidence() for prober in detector.charset_probers), default=0.0)
+
+
+def clear_cache():
+    """Forget every cached detection result."""
+    _detect_encoding.cache_clear()
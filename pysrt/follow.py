@@ -0,0 +1,137 @@
+"""Incremental reading of growing SubRip files, like `tail -F`."""
+
+import os
+import time
+
+from pysrt.streaming import CHUNK_SIZE, BlockSplitter, LineSplitter, TextDecoder
+
+
+class SubRipFollower:
+    """
+    SubRipFollower(path[, encoding][, error_handling])
+
+    Follow a .srt file that is still being written, e.g. by a live
+    captioning encoder. Each `poll()` only reads the bytes appended since the
+    previous one and returns the cues they complete; the byte offset, the
+    partially read line and the partially read cue are kept in between.
+
+    A cue is complete once the blank line following it has been written.
+    If the file is truncated it is read again from the start. If it is
+    replaced (rotated), the rest of the old file is read before switching to
+    the new one.
+
+    `encoding` -> default to the one announced by a byte order mark, else
+        to utf-8.
+
+    Example:
+        >>> follower = SubRipFollower('live.srt')
+        >>> for sub in follower.follow(interval=0.1):
+        ...     packager.push(sub)
+    """
+
+    def __init__(self, path, encoding=None, error_handling=None, cls=None):
+        if cls is None:
+            from pysrt.srtfile import SubRipFile as cls
+        self.path = path
+        self.encoding = encoding
+        self.cls = cls
+        self.error_handling = cls.ERROR_PASS if error_handling is None else error_handling
+        self.offset = 0
+        self._file = None
+        self._identity = None
+        self._reset()
+
+    def poll(self):
+        """
+        poll() -> list of SubRipItem
+
+        Return the cues completed since the previous call.
+        """
+        items = []
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return items  # being rotated, the new file will show up later
+
+        identity = (stat.st_dev, stat.st_ino)
+        if self._file is not None and identity != self._identity:
+            items += self._read()
+            items += self._flush()
+            self.close()
+        if self._file is None:
+            try:
+                self._file = open(self.path, "rb")
+            except FileNotFoundError:
+                return items
+            stat = os.fstat(self._file.fileno())
+            self._identity = (stat.st_dev, stat.st_ino)
+            self._reset()
+        elif stat.st_size < self.offset:
+            self._file.seek(0)
+            self._reset()
+
+        items += self._read()
+        return items
+
+    def follow(self, interval=0.25, idle_timeout=None):
+        """
+        follow([interval][, idle_timeout])
+
+        Yield cues as they are completed, polling every `interval` seconds.
+        Stop after `idle_timeout` seconds without new cues, or never if None.
+        """
+        last_activity = time.monotonic()
+        try:
+            while True:
+                items = self.poll()
+                if items:
+                    yield from items
+                    last_activity = time.monotonic()
+                elif idle_timeout is not None and time.monotonic() - last_activity >= idle_timeout:
+                    return
+                else:
+                    time.sleep(interval)
+        finally:
+            self.close()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._identity = None
+
+    def _reset(self):
+        self.offset = 0
+        self._decoder = TextDecoder(self.encoding)
+        self._lines = LineSplitter()
+        self._blocks = BlockSplitter()
+
+    def _read(self):
+        items = []
+        while True:
+            data = self._file.read(CHUNK_SIZE)
+            if not data:
+                return items
+            self.offset += len(data)
+            lines = self._lines.feed(self._decoder.decode(data))
+            items += self._parse_blocks([self._blocks.feed(line) for line in lines])
+
+    def _flush(self):
+        lines = self._lines.feed(self._decoder.decode(b"", final=True)) + self._lines.close()
+        blocks = [self._blocks.feed(line) for line in lines] + [self._blocks.close()]
+        return self._parse_blocks(blocks)
+
+    def _parse_blocks(self, blocks):
+        items = []
+        for block in blocks:
+            if block:
+                item = self.cls._parse_block(block, self.error_handling)
+                if item is not None:
+                    items.append(item)
+        return items
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
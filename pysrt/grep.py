@@ -0,0 +1,155 @@
+"""Regular expression search over the cues of many files, without an index."""
+
+import functools
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from pysrt.batch import find_files
+from pysrt.compression import open_binary
+from pysrt.encoding import BIGGER_BOM, detect_bom, detect_stream_encoding
+from pysrt.srtfile import SubRipFile
+from pysrt.streaming import CHUNK_SIZE, iter_chunks, iter_lines
+
+REGEX_CHARACTERS = frozenset(".^$*+?{}[]\\|()")
+
+
+def is_literal(pattern):
+    """True if `pattern` matches itself only, as a regular expression."""
+    return not REGEX_CHARACTERS.intersection(pattern)
+
+
+def compile_pattern(pattern, ignore_case=False, fixed_strings=False):
+    """
+    compile_pattern(pattern[, ignore_case][, fixed_strings]) -> compiled regex
+
+    ^ and $ match at the start and end of each line of the cue text.
+    """
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    return re.compile(re.escape(pattern) if fixed_strings else pattern, flags)
+
+
+def grep_file(
+    path,
+    pattern,
+    ignore_case=False,
+    fixed_strings=False,
+    strip_tags=False,
+    join_lines=False,
+    encoding=None,
+):
+    """
+    grep_file(path, pattern[, ignore_case][, fixed_strings][, strip_tags]
+              [, join_lines][, encoding]) -> record
+
+    Search `pattern` in the text of each cue of `path`. The record holds the
+    matching SubRipItems in "matches", or the error in "error".
+
+    strip_tags -> bool: match the text without tags such as <i>.
+    join_lines -> bool: match the lines of each cue joined by spaces, so a
+        phrase broken across lines is found.
+    encoding -> str: default to the BOM, then UTF-8; chardet is only used
+        for files which are not valid UTF-8.
+
+    Files are read by chunks, in constant memory. Literal patterns are first
+    looked for in the raw bytes of the file, and files which cannot match
+    are skipped without being decoded or parsed ("skipped" is then True).
+    """
+    record = {"path": path, "matches": [], "skipped": False}
+    try:
+        with open_binary(path) as binary_file:
+            file_encoding = encoding or detect_bom(binary_file.read(BIGGER_BOM))
+            binary_file.seek(0)
+            needle = _needle(
+                pattern, file_encoding, ignore_case, fixed_strings, strip_tags, join_lines
+            )
+            if needle is not None:
+                if not _contains(binary_file, needle, ignore_case):
+                    record["skipped"] = True
+                    return record
+                binary_file.seek(0)
+
+            regex = compile_pattern(pattern, ignore_case, fixed_strings)
+            if file_encoding is None:
+                try:
+                    items = _search(binary_file, "utf_8", "strict", regex, strip_tags, join_lines)
+                except UnicodeDecodeError:
+                    binary_file.seek(0)
+                    file_encoding = detect_stream_encoding(binary_file, default="latin_1")
+                    items = _search(
+                        binary_file, file_encoding, "replace", regex, strip_tags, join_lines
+                    )
+            else:
+                items = _search(binary_file, file_encoding, "strict", regex, strip_tags, join_lines)
+            record["matches"] = items
+    except Exception as error:
+        record["error"] = f"{type(error).__name__}: {error}"
+    return record
+
+
+def _search(binary_file, encoding, errors, regex, strip_tags, join_lines):
+    matches = []
+    lines = iter_lines(iter_chunks(binary_file, CHUNK_SIZE), encoding, errors)
+    for item in SubRipFile.stream(lines):
+        cue_text = item.text_without_tags if strip_tags else item.text
+        if join_lines:
+            cue_text = " ".join(cue_text.splitlines())
+        if regex.search(cue_text):
+            matches.append(item)
+    return matches
+
+
+def _needle(pattern, encoding, ignore_case, fixed_strings, strip_tags, join_lines):
+    """Bytes any matching file contains, or None if the raw bytes cannot tell."""
+    if not (fixed_strings or is_literal(pattern)) or strip_tags or not pattern:
+        return None
+    if join_lines and any(character.isspace() for character in pattern):
+        return None
+    if encoding is None:
+        # Without a BOM the encoding is only known after decoding, but ASCII
+        # is encoded the same way by UTF-8 and the usual 8-bit encodings.
+        if not pattern.isascii():
+            return None
+        encoding = "ascii"
+    if ignore_case:
+        if not pattern.isascii() or "a".encode(encoding) != b"a":
+            return None
+        return pattern.lower().encode(encoding)
+    try:
+        return pattern.encode(encoding)
+    except (UnicodeEncodeError, LookupError):
+        return None
+
+
+def _contains(binary_file, needle, ignore_case):
+    # Chunks overlap by len(needle) - 1 bytes, so a needle split between two
+    # chunks is still found.
+    overlap = len(needle) - 1
+    tail = b""
+    for chunk in iter_chunks(binary_file, CHUNK_SIZE):
+        window = tail + (chunk.lower() if ignore_case else chunk)
+        if needle in window:
+            return True
+        tail = window[len(window) - overlap :] if overlap else b""
+    return False
+
+
+def run_grep(pattern, paths, jobs=None, processes=False, **options):
+    """
+    run_grep(pattern, paths[, jobs][, processes], **options) -> iterator of records
+
+    Run `grep_file` on every file found in `paths` (files, directories or
+    glob patterns, see pysrt.batch.find_files), `jobs` files at a time.
+    Records come in the order of the files. `options` are passed to
+    `grep_file`.
+
+    processes -> bool: use a process pool instead of a thread pool, for
+        many files on many cores.
+    """
+    files = [path for path, _ in find_files(paths)]
+    search = functools.partial(grep_file, pattern=pattern, **options)
+    if jobs == 1:
+        yield from map(search, files)
+        return
+    executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with executor_class(max_workers=jobs) as executor:
+        yield from executor.map(search, files, chunksize=16 if processes else 1)
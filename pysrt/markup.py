@@ -0,0 +1,140 @@
+"""
+Markup of subtitle texts.
+
+SubRip texts carry HTML-like tags (<i>, <b>, <u>, <font color="...">) and
+style overrides such as {\\an8}. `tokenize` splits a text once into runs of
+text and tags, and Markup derives the plain text from those tokens.
+SubRipItem caches the Markup of its text (see SubRipItem.markup), so the
+consumers of the plain text do not scan the same string again.
+"""
+
+import re
+from collections import namedtuple
+
+TEXT = "text"
+OPEN = "open"
+CLOSE = "close"
+STANDALONE = "standalone"  # {\an8}, <br/>: nothing to close
+RE_MARKUP = re.compile(r"<(/?)\s*([^\s>/]*)[^>]*?(/?)>|\{\\[^}]*\}")
+
+Token = namedtuple("Token", ("kind", "text", "name"))
+Token.__doc__ = """
+Token(kind, text, name)
+
+kind -> TEXT, OPEN, CLOSE or STANDALONE.
+text -> str: the source text of the token.
+name -> str: lower case tag name, "b" for <b> and </b>, "" for text.
+"""
+
+
+def tokenize(text):
+    """tokenize(text) -> list of Token, joining back to `text`"""
+    tokens = []
+    position = 0
+    for match in RE_MARKUP.finditer(text):
+        if match.start() > position:
+            tokens.append(Token(TEXT, text[position : match.start()], ""))
+        closing, name, self_closing = match.groups()
+        if name is None or self_closing:
+            tokens.append(Token(STANDALONE, match.group(), (name or "").lower()))
+        else:
+            tokens.append(Token(CLOSE if closing else OPEN, match.group(), name.lower()))
+        position = match.end()
+    if position < len(text):
+        tokens.append(Token(TEXT, text[position:], ""))
+    return tokens
+
+
+def join_text(tokens, separator=""):
+    """join_text(tokens[, separator]) -> text of `tokens`, tags replaced by `separator`"""
+    return "".join(token.text if token.kind == TEXT else separator for token in tokens)
+
+
+def strip_tags(text, separator=""):
+    """
+    strip_tags(text[, separator]) -> `text` without its tags
+
+    A `separator` such as " " keeps words apart across tags, as in
+    "police<br>car".
+    """
+    return join_text(tokenize(text), separator)
+
+
+class Markup:
+    """
+    Markup(text)
+
+    Tokens of `text`, parsed once, with the plain text derived from them.
+
+    tokens -> list of Token.
+    plain_text -> str: the text without tags.
+    visible_length -> int: characters of the plain text, line breaks
+        excluded.
+
+    Example:
+        >>> markup = Markup("<i>Hello <b>world</b></i>")
+        >>> markup.plain_text
+        'Hello world'
+        >>> markup.slice(6)
+        '<i><b>world</b></i>'
+    """
+
+    __slots__ = ("tokens", "plain_text", "visible_length")
+
+    def __init__(self, text):
+        self.tokens = tokenize(text)
+        self.plain_text = join_text(self.tokens)
+        self.visible_length = len(self.plain_text) - self.plain_text.count("\n")
+
+    def __str__(self):
+        return "".join(token.text for token in self.tokens)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({str(self)!r})"
+
+    def slice(self, start=None, stop=None):
+        """
+        slice([start][, stop]) -> str
+
+        Text with the tags of the characters from `start` to `stop` of the
+        plain text. Tags open at `start` are opened again and tags still
+        open at `stop` are closed, so the result is well formed on its own.
+        Standalone tags such as {\\an8} before `stop` are kept.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self.plain_text))
+        stop = max(start, stop)
+        pieces = []
+        prefix = []  # (order, token) of the tags in effect at `start`
+        stack = []  # (order, token, offset) of the open tags
+        offset = 0
+        for order, token in enumerate(self.tokens):
+            if offset > stop:
+                break
+            if token.kind == TEXT:
+                pieces.append(token.text[max(start - offset, 0) : max(stop - offset, 0)])
+                offset += len(token.text)
+            elif token.kind == OPEN:
+                stack.append((order, token, offset))
+                if start <= offset < stop:
+                    pieces.append(token.text)
+            elif token.kind == CLOSE:
+                opened = next(
+                    (entry for entry in reversed(stack) if entry[1].name == token.name), None
+                )
+                if opened is None:
+                    if start < offset <= stop:
+                        pieces.append(token.text)
+                    continue
+                stack.remove(opened)
+                if opened[2] < start < offset:
+                    prefix.append(opened[:2])
+                if start <= opened[2] < stop or opened[2] < start < offset:
+                    pieces.append(token.text)
+            elif offset < start:
+                prefix.append((order, token))
+            elif offset < stop:
+                pieces.append(token.text)
+        prefix.extend(entry[:2] for entry in stack if entry[2] < start)
+        prefix.sort(key=lambda entry: entry[0])
+        suffix = [f"</{token.name}>" for _, token, opened in reversed(stack) if opened < stop]
+        return "".join([token.text for _, token in prefix] + pieces + suffix)
@@ -0,0 +1,117 @@
+"""Run `srt` file commands from code, shared by serve, batch and watch."""
+
+import argparse
+import io
+
+from pysrt.commands import SubRipShifter
+from pysrt.srtfile import SubRipFile
+
+
+def _time(value):
+    if isinstance(value, str):
+        return SubRipShifter().parse_time(value)
+    return int(value)
+
+
+def _times(values):
+    return [_time(value) for value in values]
+
+
+# op -> (SubRipShifter method, {argument name: type})
+OPERATIONS = {
+    "shift": ("shift", {"time_offset": _time}),
+    "rate": ("rate", {"initial": float, "final": float}),
+    "split": ("split", {"limits": _times}),
+    "break": ("break_lines", {"length": int, "max_lines": int}),
+    "validate": ("validate_file", {}),
+    "fix-overlaps": ("fix_overlaps_action", {"buffer": int}),
+}
+DEFAULT_ARGUMENTS = {"buffer": 20, "max_lines": 0}
+
+
+def open_file(path):
+    """Open `path` the way the srt command does."""
+    return SubRipFile.open(
+        path, encoding=SubRipFile.AUTO_ENCODING, error_handling=SubRipFile.ERROR_LOG
+    )
+
+
+def run_operation(
+    op,
+    arguments=None,
+    path=None,
+    content=None,
+    in_place=False,
+    output_encoding=None,
+    output_path=None,
+    opener=open_file,
+):
+    """
+    run_operation(op[, arguments][, path][, content][, in_place]
+                  [, output_encoding][, output_path][, opener]) -> dict
+
+    Run the `srt` command `op` on the file at `path`, or on the SubRip text
+    `content`, through the same SubRipShifter method as the command line.
+
+    arguments -> dict: the command arguments, named as the attributes of the
+        command line namespace. Time arguments accept milliseconds or the
+        command line form ("1m12s").
+    in_place -> bool: same as `srt -i`, the file is backed up first.
+    output_path -> str: write the result there instead of returning it.
+    opener -> callable: used to open `path`, e.g. ParseCache.open.
+
+    Return {"errors": [...]} for validate, {"paths": [...]} for split, {}
+    when the result was written to a file and {"content": str} otherwise.
+    Raise ValueError on invalid requests.
+    """
+    if op not in OPERATIONS:
+        raise ValueError(f"unknown operation {op!r}")
+    method, argument_types = OPERATIONS[op]
+    if (path is None) == (content is None):
+        raise ValueError("expected either a path or a content")
+    if path is None and (in_place or op == "split"):
+        raise ValueError(f"{'in place edits' if in_place else op} need a path")
+
+    values = dict(DEFAULT_ARGUMENTS)
+    values.update(arguments or {})
+    missing = [name for name in argument_types if name not in values]
+    if missing:
+        raise ValueError(f"{op} needs the arguments: {', '.join(missing)}")
+    shifter = SubRipShifter()
+    shifter.arguments = argparse.Namespace(
+        file=path,
+        in_place=in_place,
+        output_encoding=output_encoding,
+        **{name: type_(values[name]) for name, type_ in argument_types.items()},
+    )
+    if content is None:
+        shifter._source_file = opener(path)
+    else:
+        shifter._source_file = SubRipFile.from_string(content, error_handling=SubRipFile.ERROR_LOG)
+
+    if op == "validate":
+        errors = shifter.input_file.validate()
+        return {
+            "errors": [
+                {"position": e.position, "error_type": e.error_type, "message": e.message}
+                for e in errors
+            ]
+        }
+
+    if in_place:
+        shifter.create_backup()
+    elif output_path:
+        shifter.output_file_path = output_path
+    else:
+        shifter._output_file = io.StringIO()
+    try:
+        result = getattr(shifter, method)()
+    finally:
+        if shifter.output_file_path and hasattr(shifter, "_output_file"):
+            shifter._output_file.close()
+
+    if op == "split":
+        return {"paths": result}
+    if shifter.output_file_path:
+        return {}
+    return {"content": shifter._output_file.getvalue()}
@@ -0,0 +1,108 @@
+"""Chunk-parallel parsing of large SubRip files."""
+
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from pysrt.srtexc import Error
+from pysrt.srtitem import SubRipItem
+
+MIN_CHUNK_SIZE = 1024 * 1024
+CHUNKS_PER_JOB = 4
+
+# A line break followed by a whitespace only line. A lone "\r" is never
+# followed by "\n" so that "\r\n" is not mistaken for two line breaks.
+RE_BLANK_LINE = re.compile(r"(?:\r\n|\n|\r(?!\n))[^\S\r\n]*(?:\r\n|\n|\r(?!\n))")
+
+
+def read_parallel(srt_file, text, error_handling=None, jobs=None, chunk_size=None):
+    """
+    read_parallel(srt_file, text[, error_handling][, jobs][, chunk_size])
+
+    Parallel equivalent of `srt_file.read()` for an already decoded `text`.
+
+    `text` is cut at blank lines into chunks of about `chunk_size`
+    characters, which are parsed in a pool of `jobs` processes (default to
+    the number of CPUs) and appended to `srt_file` in order. Items, eol
+    and error reports, including their line numbers, are the same as with
+    the serial parser.
+    """
+    if error_handling is None:
+        error_handling = srt_file.ERROR_PASS
+    jobs = jobs or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(MIN_CHUNK_SIZE, len(text) // (jobs * CHUNKS_PER_JOB) + 1)
+
+    first_line = io.StringIO(text, newline="").readline()
+    srt_file.eol = srt_file._guess_eol([first_line]) if first_line else os.linesep
+
+    chunks, first_lines = split_chunks(text, chunk_size)
+    if len(chunks) < 2 or jobs < 2:
+        results = map(parse_chunk, chunks, first_lines)
+        _collect(srt_file, results, error_handling)
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as executor:
+            _collect(srt_file, executor.map(parse_chunk, chunks, first_lines), error_handling)
+    return srt_file
+
+
+def split_chunks(text, chunk_size):
+    """
+    split_chunks(text, chunk_size) -> (chunks, first line numbers)
+
+    Cut `text` right after blank lines, so that no cue spans two chunks.
+    """
+    chunks = []
+    first_lines = []
+    line_number = 0
+    start = 0
+    while start < len(text):
+        match = RE_BLANK_LINE.search(text, start + chunk_size)
+        end = match.end() if match else len(text)
+        chunk = text[start:end]
+        chunks.append(chunk)
+        first_lines.append(line_number)
+        line_number += chunk.count("\n") + chunk.count("\r") - chunk.count("\r\n")
+        start = end
+    return chunks, first_lines
+
+
+def parse_chunk(text, first_line=0):
+    """
+    parse_chunk(text[, first_line]) -> (rows, errors)
+
+    Parse one chunk in a worker. Items are returned as
+    (index, start, end, text, position) rows of plain values, with times in
+    milliseconds, errors as (global line number, error, number of rows
+    before it) triples.
+    """
+    from pysrt.srtfile import SubRipFile
+
+    rows = []
+    errors = []
+    for index, source in SubRipFile._iter_blocks(io.StringIO(text, newline="")):
+        try:
+            item = SubRipItem.from_lines(source)
+        except Error as error:
+            error.args += ("".join(source),)
+            errors.append((first_line + index, error, len(rows)))
+        else:
+            rows.append(
+                (item.index, item.start.ordinal, item.end.ordinal, item.text, item.position)
+            )
+    return rows, errors
+
+
+def _collect(srt_file, results, error_handling):
+    # The values were already checked by the workers: skip the constructor.
+    from_values = SubRipItem.from_values
+    for rows, errors in results:
+        done = 0
+        # Items before an error are added first, so that with ERROR_RAISE
+        # `srt_file` holds the same items as after the serial parser.
+        for index, error, position in errors:
+            srt_file.extend([from_values(*row) for row in rows[done:position]])
+            done = position
+            srt_file._handle_error(error, error_handling, index)
+        srt_file.extend([from_values(*row) for row in rows[done:]])
@@ -0,0 +1,150 @@
+"""In-memory full-text index over the cues of a SubRipFile."""
+
+import re
+import unicodedata
+from bisect import bisect_left
+from heapq import merge
+
+from pysrt.markup import join_text, strip_tags
+
+RE_TOKEN = re.compile(r"\w+")
+PREFIX_MARK = "*"
+
+
+def normalize(token):
+    """normalize(token) -> case folded `token` without accents"""
+    decomposed = unicodedata.normalize("NFKD", token.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text):
+    """tokenize(text) -> list of normalized words of `text`, tags excluded"""
+    return [normalize(token) for token in RE_TOKEN.findall(strip_tags(text, " "))]
+
+
+class SubRipIndex:
+    """
+    SubRipIndex(srt_file)
+
+    Inverted index of the words of each cue, built once so that queries do
+    not scan the whole track. Words are taken from the text without tags,
+    case folded and stripped of accents, so "Eté" matches "été" and "ETE".
+
+    Words are numbered across the whole track, so phrases are found even
+    when they run over several cues.
+
+    Queries:
+      - a word: "police"
+      - a prefix: "polic*"
+      - a phrase, whose last word may be a prefix: "stop right there"
+
+    The index keeps references to the items of `srt_file`; it does not see
+    later additions or text changes, build a new one then.
+
+    Example:
+        >>> index = SubRipIndex(subs)
+        >>> for sub in index.search("right there"):
+        ...     print(sub.start, sub.end, sub.text)
+    """
+
+    def __init__(self, srt_file):
+        self.items = list(srt_file)
+        self.cue_positions = []
+        postings = {}
+        normalized = {}
+        position = 0
+        for cue_position, item in enumerate(self.items):
+            # Tags separate words: "police<br>car" is two words.
+            for token in RE_TOKEN.findall(join_text(item.markup.tokens, " ")):
+                term = normalized.get(token)
+                if term is None:
+                    term = normalized[token] = normalize(token)
+                postings.setdefault(term, []).append(position)
+                self.cue_positions.append(cue_position)
+                position += 1
+        self.postings = postings
+        self.terms = sorted(postings)
+
+    def __len__(self):
+        """Number of indexed words."""
+        return len(self.cue_positions)
+
+    def search(self, query):
+        """
+        search(query) -> list of SubRipItem
+
+        Cues containing a match of `query`, in track order. A phrase running
+        over several cues returns all of them.
+        """
+        cue_positions = set()
+        for first, last in self.find(query):
+            cue_positions.update(range(first, last + 1))
+        return [self.items[position] for position in sorted(cue_positions)]
+
+    def find(self, query):
+        """
+        find(query) -> list of (first cue position, last cue position)
+
+        One entry per match of `query`, in track order.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        prefix = query.rstrip().endswith(PREFIX_MARK)
+        positions = [self._term_positions(word) for word in words[:-1]]
+        if prefix:
+            positions.append(self._prefix_positions(words[-1]))
+        else:
+            positions.append(self._term_positions(words[-1]))
+
+        last_offset = len(words) - 1
+        return [
+            (self.cue_positions[start], self.cue_positions[start + last_offset])
+            for start in self._phrase_starts(positions)
+        ]
+
+    def term(self, word):
+        """term(word) -> list of SubRipItem containing `word`"""
+        return self._items_at(self._term_positions(normalize(word)))
+
+    def prefix(self, prefix):
+        """prefix(prefix) -> list of SubRipItem containing a word starting with `prefix`"""
+        return self._items_at(self._prefix_positions(normalize(prefix)))
+
+    def _term_positions(self, term):
+        return self.postings.get(term, [])
+
+    def _prefix_positions(self, prefix):
+        lists = []
+        for term_position in range(bisect_left(self.terms, prefix), len(self.terms)):
+            term = self.terms[term_position]
+            if not term.startswith(prefix):
+                break
+            lists.append(self.postings[term])
+        if len(lists) == 1:
+            return lists[0]
+        return list(merge(*lists))
+
+    @staticmethod
+    def _phrase_starts(positions):
+        if len(positions) == 1:
+            return positions[0]
+        # Walk the rarest word and look the others up by bisection.
+        pivot = min(range(len(positions)), key=lambda offset: len(positions[offset]))
+        starts = []
+        for position in positions[pivot]:
+            start = position - pivot
+            for offset, word_positions in enumerate(positions):
+                if offset == pivot:
+                    continue
+                expected = start + offset
+                found = bisect_left(word_positions, expected)
+                if found == len(word_positions) or word_positions[found] != expected:
+                    break
+            else:
+                starts.append(start)
+        return starts
+
+    def _items_at(self, positions):
+        cue_positions = sorted({self.cue_positions[position] for position in positions})
+        return [self.items[position] for position in cue_positions]
@@ -0,0 +1,185 @@
+"""Compact binary serialization of SubRipFile instances.
+
+Layout (version 2), all integers are unsigned LEB128 varints and signed
+values are zigzag encoded:
+
+    magic "PSRT" | version byte
+    encoding string | eol string (empty for unset)
+    string table: count, then (byte length, utf-8 bytes) for each string
+    cue count, then for each cue:
+        start delta from the previous cue start (signed)
+        duration (signed)
+        index: (delta from previous index + 1) * 2 for ints, 1 for None,
+               (string reference + 1) * 2 + 1 otherwise
+        text string reference
+        position string reference
+
+Repeated texts and positions are only stored once in the string table.
+"""
+
+from pysrt.srtitem import SubRipItem
+from pysrt.srttime import SubRipTime
+
+MAGIC = b"PSRT"
+VERSION = 2
+
+
+def dumps(srt_file):
+    """
+    dumps(srt_file) -> bytes
+
+    Serialize items, eol and encoding of `srt_file`. The path is not stored.
+    """
+    strings = {}
+    body = bytearray()
+    write = _write_varint
+
+    def intern(string):
+        reference = strings.get(string)
+        if reference is None:
+            reference = strings[string] = len(strings)
+        return reference
+
+    write(body, len(srt_file))
+    previous_start = 0
+    previous_index = 0
+    for item in srt_file:
+        start = item.start.ordinal
+        write(body, _zigzag(start - previous_start))
+        write(body, _zigzag(item.end.ordinal - start))
+        previous_start = start
+
+        index = item.index
+        if isinstance(index, int):
+            write(body, _zigzag(index - previous_index - 1) << 1)
+            previous_index = index
+        elif index is None:
+            write(body, 1)
+        else:
+            write(body, intern(str(index)) + 1 << 1 | 1)
+        write(body, intern(item.text))
+        write(body, intern(item.position))
+
+    header = bytearray(MAGIC)
+    header.append(VERSION)
+    _write_string(header, srt_file.encoding or "")
+    _write_string(header, srt_file._eol or "")
+    write(header, len(strings))
+    for string in strings:
+        _write_string(header, string)
+    return bytes(header + body)
+
+
+def loads(data, cls=None, path=None):
+    """
+    loads(data[, cls][, path]) -> SubRipFile
+
+    Raise ValueError if `data` is not a supported serialized track.
+    """
+    if cls is None:
+        from pysrt.srtfile import SubRipFile as cls
+
+    data = bytes(data)
+    if data[: len(MAGIC)] != MAGIC:
+        raise ValueError("Not a serialized SubRip track")
+    version = data[len(MAGIC)]
+    if version != VERSION:
+        raise ValueError(f"Unsupported serialization version: {version}")
+
+    try:
+        return _loads(data, len(MAGIC) + 1, cls, path)
+    except (IndexError, UnicodeDecodeError) as error:
+        raise ValueError("Truncated or corrupted serialized track") from error
+
+
+def _loads(data, offset, cls, path):
+    read = _read_varint
+    encoding, offset = _read_string(data, offset)
+    eol, offset = _read_string(data, offset)
+
+    string_count, offset = read(data, offset)
+    strings = []
+    for _ in range(string_count):
+        string, offset = _read_string(data, offset)
+        strings.append(string)
+
+    count, offset = read(data, offset)
+    items = []
+    start = 0
+    index = 0
+    from_ordinal = SubRipTime.from_ordinal
+    for _ in range(count):
+        delta, offset = read(data, offset)
+        start += _unzigzag(delta)
+        duration, offset = read(data, offset)
+        end = start + _unzigzag(duration)
+
+        index_code, offset = read(data, offset)
+        if index_code == 1:
+            item_index = None
+        elif index_code & 1:
+            item_index = strings[(index_code >> 1) - 1]
+        else:
+            index += _unzigzag(index_code >> 1) + 1
+            item_index = index
+
+        text, offset = read(data, offset)
+        position, offset = read(data, offset)
+        items.append(
+            SubRipItem(
+                item_index,
+                from_ordinal(start),
+                from_ordinal(end),
+                strings[text],
+                strings[position],
+            )
+        )
+
+    if offset != len(data):
+        raise ValueError("Trailing data after serialized track")
+    return cls(items, eol=eol or None, path=path, encoding=encoding)
+
+
+def _zigzag(value):
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _unzigzag(value):
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def _write_varint(buffer, value):
+    while value > 0x7F:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data, offset):
+    byte = data[offset]
+    offset += 1
+    if byte < 0x80:
+        return byte, offset
+    value = byte & 0x7F
+    shift = 7
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _write_string(buffer, string):
+    encoded = string.encode("utf-8", "surrogatepass")
+    _write_varint(buffer, len(encoded))
+    buffer += encoded
+
+
+def _read_string(data, offset):
+    length, offset = _read_varint(data, offset)
+    end = offset + length
+    if end > len(data):
+        raise IndexError("string out of bounds")
+    return data[offset:end].decode("utf-8", "surrogatepass"), end
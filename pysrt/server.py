@@ -0,0 +1,206 @@
+"""Long-running `srt serve` daemon speaking JSON lines.
+
+Each request is a JSON object on its own line:
+
+    {"id": 1, "op": "shift", "path": "movie.srt", "args": {"time_offset": "2s"}}
+
+`op` is one of the `srt` file commands (shift, rate, split, break, validate,
+fix-overlaps) and `args` holds their arguments, named as the attributes of
+the command line namespace. Time arguments accept either milliseconds or the
+command line form ("1m12s"). The subtitles are read from `path`, or from
+`content` for inline SubRip text. Optional fields are `in_place` and
+`output_encoding`, with the same meaning as `srt -i` and `srt -e`.
+
+Each response carries the request `id` and either `"ok": true` and the
+result (`content`, `errors` for validate, `paths` for split, nothing for
+in place edits) or `"ok": false` and an `error` message. Requests are run
+concurrently, so responses on a connection may come out of order.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from pysrt.operations import open_file, run_operation
+from pysrt.srtfile import SubRipFile
+
+
+class SubRipServer:
+    """
+    SubRipServer([workers][, cache])
+
+    Run `srt` commands for many files from a single process, so the cost of
+    starting Python and importing pysrt is only paid once.
+
+    workers -> int: maximum number of requests processed concurrently.
+        Default to ThreadPoolExecutor's default.
+    cache -> pysrt.cache.ParseCache: shared by every request, so files
+        processed again are not parsed again.
+
+    Example:
+        >>> server = SubRipServer(cache=ParseCache('/var/cache/pysrt'))
+        >>> server.serve_unix('/tmp/srt.sock')
+    """
+
+    def __init__(self, workers=None, cache=None):
+        self.cache = cache
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+    def handle(self, request):
+        """
+        handle(request) -> response
+
+        Run a single decoded request. Failures are reported in the response
+        rather than raised.
+        """
+        try:
+            response = self.execute(request)
+        except Exception as error:
+            response = {"ok": False, "error": f"{type(error).__name__}: {error}"}
+        response["id"] = request.get("id")
+        return response
+
+    def execute(self, request):
+        response = run_operation(
+            request.get("op"),
+            arguments=request.get("args"),
+            path=request.get("path"),
+            content=request.get("content"),
+            in_place=bool(request.get("in_place")),
+            output_encoding=request.get("output_encoding"),
+            opener=self.open,
+        )
+        response["ok"] = True
+        return response
+
+    def open(self, path):
+        if self.cache is not None:
+            return self.cache.open(
+                path, encoding=SubRipFile.AUTO_ENCODING, error_handling=SubRipFile.ERROR_LOG
+            )
+        return open_file(path)
+
+    def serve_lines(self, lines, write):
+        """
+        serve_lines(lines, write)
+
+        Submit each request of `lines` to the worker pool and `write` each
+        response line as soon as it is ready. Return once every request has
+        been answered.
+        """
+        lock = threading.Lock()
+        pending = set()
+
+        def respond(response):
+            line = json.dumps(response, ensure_ascii=False) + "\n"
+            with lock:
+                try:
+                    write(line)
+                except OSError:
+                    pass  # the client went away
+
+        def answer(request):
+            # Written by the task itself, so that waiting for the futures
+            # waits for the responses too.
+            respond(self.handle(request))
+
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("a request must be a JSON object")
+            except ValueError as error:
+                respond({"ok": False, "error": f"invalid request: {error}", "id": None})
+                continue
+            pending = {future for future in pending if not future.done()}
+            pending.add(self.executor.submit(answer, request))
+        wait(pending)
+
+    def serve_stdio(self, input_file=None, output_file=None):
+        """Serve requests read from stdin until it is closed."""
+        input_file = input_file or sys.stdin
+        output_file = output_file or sys.stdout
+
+        def write(line):
+            output_file.write(line)
+            output_file.flush()
+
+        self.serve_lines(input_file, write)
+
+    def listen(self, path):
+        """
+        listen(path) -> socketserver.ThreadingUnixStreamServer
+
+        Bind the Unix socket `path`, replacing a stale one left by a server
+        that did not exit cleanly.
+        """
+        if os.path.exists(path):
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                    probe.connect(path)
+            except OSError:
+                os.unlink(path)
+            else:
+                raise OSError(f"a server is already listening on {path}")
+        # Only the owner may connect: requests can edit files in place.
+        umask = os.umask(0o177)
+        try:
+            server = _UnixServer(path, _RequestHandler)
+        finally:
+            os.umask(umask)
+        server.subrip_server = self
+        return server
+
+    def serve_unix(self, path):
+        """Serve requests on the Unix socket `path` until interrupted."""
+        with self.listen(path) as server:
+            try:
+                server.serve_forever()
+            finally:
+                os.unlink(path)
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        def write(line):
+            self.wfile.write(line.encode("utf-8"))
+
+        self.server.subrip_server.serve_lines(self.rfile, write)
+
+
+def send_request(path, request, timeout=None):
+    """
+    send_request(path, request[, timeout]) -> response
+
+    Send a single request to the server listening on the Unix socket `path`
+    and wait for its response.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(path)
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        client.shutdown(socket.SHUT_WR)
+        with client.makefile("rb") as response_file:
+            line = response_file.readline()
+    if not line:
+        raise ConnectionError(f"{path} closed the connection without answering")
+    return json.loads(line)
@@ -0,0 +1,204 @@
+"""Zero-copy transport of subtitle tracks through shared memory.
+
+A published track is a single shared memory block laid out as:
+
+    header: magic "PSHM", version, cue count, string count, blob size
+    starts, ends, indexes: one native int64 column each
+    string offsets: int64 column of (string count + 1) entries
+    blob: utf-8 encoded strings
+
+Strings are, in order: encoding, eol, then text, position and index for
+each cue. The index string is empty when the index is an integer stored in
+the `indexes` column, or None (NO_INDEX in the column).
+
+Workers attach to the block by name and read columns through read-only
+memoryviews, without copying or unpickling anything.
+"""
+
+import struct
+import sys
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+
+from pysrt.srtitem import SubRipItem
+from pysrt.srttime import SubRipTime
+
+MAGIC = b"PSHM"
+VERSION = 1
+HEADER = struct.Struct("=4sBxxxQQQ")
+ITEMSIZE = 8
+STRINGS_PER_CUE = 3
+NON_INT_INDEX = -(2**63)
+NO_INDEX = NON_INT_INDEX + 1
+
+
+class SharedTrack:
+    """
+    SharedTrack(shm[, owner])
+
+    A track stored in a multiprocessing.shared_memory block. Use `publish`
+    to create one and `attach` to access it from another process.
+
+    starts, ends, indexes -> read-only int64 memoryviews, one entry per cue.
+
+    Example:
+        >>> with SharedTrack.publish(subs) as track:
+        ...     pool.map(analyze, [track.name] * 8)
+
+        >>> def analyze(name):
+        ...     with SharedTrack.attach(name) as track:
+        ...         return max(e - s for s, e in zip(track.starts, track.ends))
+    """
+
+    def __init__(self, shm, owner=False):
+        self.shm = shm
+        self.owner = owner
+        buffer = shm.buf.toreadonly()
+        magic, version, count, string_count, blob_size = HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError("Not a shared SubRip track")
+        if version != VERSION:
+            raise ValueError(f"Unsupported shared track version: {version}")
+
+        offset = HEADER.size
+        columns = []
+        for length in (count, count, count, string_count + 1):
+            end = offset + length * ITEMSIZE
+            columns.append(buffer[offset:end].cast("q"))
+            offset = end
+        self.starts, self.ends, self.indexes, self._string_offsets = columns
+        self._blob = buffer[offset : offset + blob_size]
+        self._views = [*columns, self._blob, buffer]
+
+    @classmethod
+    def publish(cls, srt_file, name=None):
+        """
+        publish(srt_file[, name]) -> SharedTrack
+
+        Copy `srt_file` into a new shared memory block. The caller owns the
+        block and must `unlink()` it once workers are done, which leaving a
+        `with` block does automatically.
+        """
+        starts = array("q")
+        ends = array("q")
+        indexes = array("q")
+        strings = [srt_file.encoding or "", srt_file._eol or ""]
+        for item in srt_file:
+            starts.append(item.start.ordinal)
+            ends.append(item.end.ordinal)
+            if isinstance(item.index, int):
+                indexes.append(item.index)
+                index_string = ""
+            elif item.index is None:
+                indexes.append(NO_INDEX)
+                index_string = ""
+            else:
+                indexes.append(NON_INT_INDEX)
+                index_string = str(item.index)
+            strings += (item.text, item.position, index_string)
+
+        encoded = [string.encode("utf-8", "surrogatepass") for string in strings]
+        string_offsets = array("q", [0])
+        for string in encoded:
+            string_offsets.append(string_offsets[-1] + len(string))
+        blob = b"".join(encoded)
+
+        header = HEADER.pack(MAGIC, VERSION, len(starts), len(strings), len(blob))
+        parts = [header, starts, ends, indexes, string_offsets, blob]
+        size = sum(len(memoryview(part).cast("B")) for part in parts)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+        offset = 0
+        for part in parts:
+            part_bytes = memoryview(part).cast("B")
+            shm.buf[offset : offset + len(part_bytes)] = part_bytes
+            offset += len(part_bytes)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """
+        attach(name) -> SharedTrack
+
+        Map an already published track. The view is read-only and attaching
+        never unlinks the block, even when the worker process exits.
+        """
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            # Before 3.13 attaching registers the block with this process'
+            # resource tracker, which would unlink it when the worker exits.
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        return cls(shm)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def encoding(self):
+        return self._string(0)
+
+    @property
+    def eol(self):
+        return self._string(1) or None
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("shared track index out of range")
+        base = 2 + position * STRINGS_PER_CUE
+        index = self.indexes[position]
+        if index == NON_INT_INDEX:
+            index = self._string(base + 2)
+        elif index == NO_INDEX:
+            index = None
+        return SubRipItem(
+            index,
+            SubRipTime.from_ordinal(self.starts[position]),
+            SubRipTime.from_ordinal(self.ends[position]),
+            self._string(base),
+            self._string(base + 1),
+        )
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+    def text(self, position):
+        """Return the text of cue at `position` without building an item."""
+        return self._string(2 + position * STRINGS_PER_CUE)
+
+    def to_srt_file(self, cls=None, path=None):
+        """Materialize a regular, mutable SubRipFile copy of the track."""
+        if cls is None:
+            from pysrt.srtfile import SubRipFile as cls
+        return cls(list(self), eol=self.eol, path=path, encoding=self.encoding)
+
+    def close(self):
+        """Release this process' mapping. The block itself stays alive."""
+        for view in self._views:
+            view.release()
+        self._views = []
+        self.shm.close()
+
+    def unlink(self):
+        """Destroy the block. Should only be called by its owner."""
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    def _string(self, number):
+        start = self._string_offsets[number]
+        end = self._string_offsets[number + 1]
+        return str(self._blob[start:end], "utf-8", "surrogatepass")
@@ -1,24 +1,27 @@
 """SubRip file handling."""
 
-import codecs
+import io
 import os
 import sys
 from collections import UserList
-from copy import copy
+from copy import copy, deepcopy
 from itertools import chain
 
+from pysrt.compression import open_binary, open_file
+from pysrt.encoding import (
+    BIGGER_BOM,
+    CODECS_BOMS,
+    detect_bom,
+    detect_encoding,
+    detect_stream_encoding,
+)
 from pysrt.srtexc import Error
 from pysrt.srtitem import SubRipItem
+from pysrt.srttime import SubRipTime
+from pysrt.streaming import BlockSplitter, iter_chunks, iter_lines
 
-BOMS = (
-    (codecs.BOM_UTF32_LE, "utf_32_le"),
-    (codecs.BOM_UTF32_BE, "utf_32_be"),
-    (codecs.BOM_UTF16_LE, "utf_16_le"),
-    (codecs.BOM_UTF16_BE, "utf_16_be"),
-    (codecs.BOM_UTF8, "utf_8"),
-)
-CODECS_BOMS = {codec: str(bom, codec) for bom, codec in BOMS}
-BIGGER_BOM = max(len(bom) for bom, encoding in BOMS)
+# Attributes of a SubRipItem fully kept by the binary format.
+_ITEM_ATTRIBUTES = vars(SubRipItem()).keys()
 
 
 class SubRipFile(UserList):
@@ -42,6 +45,7 @@ class SubRipFile(UserList):
     ERROR_RAISE = 2
 
     DEFAULT_ENCODING = "utf_8"
+    AUTO_ENCODING = "auto"
 
     def __init__(self, items=None, eol=None, path=None, encoding="utf-8"):
         UserList.__init__(self, items or [])
@@ -184,22 +188,206 @@ class SubRipFile(UserList):
         )
         return self
 
+    def break_lines(self, max_chars=42, max_lines=2):
+        """
+        Lay the text of each subtitle out again in balanced lines.
+
+        Tags take no width and existing line breaks are dropped, except
+        before dialogue dashes. See pysrt.linebreak.break_text.
+
+        Args:
+            max_chars: Maximum number of characters per line (default 42)
+            max_lines: Lines per subtitle; longer texts get longer lines
+                rather than more lines (default 2, 0 for no limit)
+
+        Returns:
+            self (for method chaining)
+
+        Example:
+            >>> subs.break_lines(max_chars=37).save("wrapped.srt")
+        """
+        from pysrt.linebreak import break_text
+
+        for item in self:
+            item.text = break_text(item.text, max_chars, max_lines)
+        return self
+
+    def retime_for_cps(self, max_cps=17, min_gap_ms=80, min_duration_ms=833, max_duration_ms=7000):
+        """
+        Lengthen subtitles read too fast, using the gaps and neighbours' spare time.
+
+        Args:
+            max_cps: Maximum reading speed in characters per second (default 17)
+            min_gap_ms: Minimum gap between subtitles (default 80ms)
+            min_duration_ms: Minimum subtitle duration (default 833ms)
+            max_duration_ms: Maximum subtitle duration (default 7000ms)
+
+        Returns:
+            List of UnsatisfiedCue for the subtitles still too fast or too short
+
+        Example:
+            >>> for cue in subs.retime_for_cps(max_cps=15):
+            ...     print(f"#{cue.index}: {cue.characters_per_second} cps")
+        """
+        from pysrt.timing import retime_for_cps
+
+        return retime_for_cps(
+            self,
+            max_cps=max_cps,
+            min_gap_ms=min_gap_ms,
+            min_duration_ms=min_duration_ms,
+            max_duration_ms=max_duration_ms,
+        )
+
+    def remap(self, anchors, drop=False):
+        """
+        Move subtitles along a piecewise-linear mapping through anchor points.
+
+        Unlike shift, each segment between two anchors gets its own offset
+        and ratio. Two anchors with the same target time mark a removed
+        segment, whose cues are clipped or dropped.
+
+        Args:
+            anchors: Iterable of (source_time, target_time) pairs, in any
+                format SubRipTime.coerce accepts
+            drop: Drop the cues overlapping a removed segment instead of
+                clipping them (default False)
+
+        Returns:
+            List of the removed SubRipItems
+
+        Example:
+            >>> # 2 minutes of ads were cut out at 10:00, and the last reel drifts
+            >>> subs.remap([("00:10:00,000", "00:10:00,000"),
+            ...             ("00:12:00,000", "00:10:00,000"),
+            ...             ("01:30:00,000", "01:28:01,500")])
+        """
+        from pysrt.timing import remap_subtitles
+
+        return remap_subtitles(self, anchors, drop=drop)
+
+    def snap_to_shot_changes(self, shot_changes, window_ms=500, min_gap_ms=80, min_duration_ms=833):
+        """
+        Snap subtitle starts and ends to the nearest shot change.
+
+        Args:
+            shot_changes: Sorted shot change times, in any format
+                SubRipTime.coerce accepts
+            window_ms: Largest move of a start or end (default 500ms)
+            min_gap_ms: Minimum gap between subtitles (default 80ms)
+            min_duration_ms: Minimum subtitle duration (default 833ms)
+
+        Returns:
+            List of ShotChangeAdjustment, one per subtitle that moved
+
+        Example:
+            >>> from pysrt.timing import read_shot_changes
+            >>> for adjustment in subs.snap_to_shot_changes(read_shot_changes("shots.txt")):
+            ...     print(adjustment.index, adjustment.start_shift_ms, adjustment.end_shift_ms)
+        """
+        from pysrt.timing import snap_to_shot_changes
+
+        return snap_to_shot_changes(
+            self,
+            shot_changes,
+            window_ms=window_ms,
+            min_gap_ms=min_gap_ms,
+            min_duration_ms=min_duration_ms,
+        )
+
+    def search_index(self):
+        """
+        search_index() -> pysrt.search.SubRipIndex
+
+        Build a full-text index of the cues, for fast word, prefix and
+        phrase queries.
+
+        Example:
+            >>> index = subs.search_index()
+            >>> [sub.start for sub in index.search("right there")]
+        """
+        from pysrt.search import SubRipIndex
+
+        return SubRipIndex(self)
+
     @property
     def text(self):
         return "\n".join(i.text for i in self)
 
     @classmethod
-    def open(cls, path="", encoding=None, error_handling=ERROR_PASS):
+    def open(
+        cls,
+        path="",
+        encoding=None,
+        error_handling=ERROR_PASS,
+        cache=None,
+        jobs=1,
+        start=None,
+        end=None,
+        assume_sorted=True,
+        rebase=False,
+    ):
         """
-        open([path, [encoding]])
+        open([path, [encoding]][, cache][, jobs][, start][, end][, assume_sorted][, rebase])
 
         If you do not provide any encoding, it can be detected if the file
         contain a bit order mark, unless it is set to utf-8 as default.
+
+        gzip, bzip2 and xz compressed files are decompressed on the fly, see
+        pysrt.compression.
+
+        With encoding="auto" the encoding is guessed: BOM first, then a strict
+        UTF-8 decoding, then chardet over a bounded sample of the file.
+
+        `cache` -> a pysrt.cache.ParseCache instance or a directory path. When
+            given, unchanged files are reloaded from it instead of re-parsed.
+        `jobs` -> number of processes used to parse the file. None means one
+            per CPU. See pysrt.parallel, only worth it on very large files.
+        `start`, `end` -> only keep the subtitles visible between these
+            times (coercible to SubRipTime), like
+            `slice(ends_after=start, starts_before=end)`. Only the timestamps
+            of the subtitles before the window are parsed, and reading stops
+            at the first one starting after `end` unless `assume_sorted` is
+            False.
+        `rebase` -> shift the kept subtitles by -start and renumber them,
+            as `srt split` does for each part.
         """
-        source_file, encoding = cls._open_unicode_file(path, claimed_encoding=encoding)
-        new_file = cls(path=path, encoding=encoding)
-        new_file.read(source_file, error_handling=error_handling)
-        source_file.close()
+        windowed = start is not None or end is not None
+        if cache is not None:
+            from pysrt.cache import ParseCache
+
+            if not isinstance(cache, ParseCache):
+                cache = ParseCache(cache)
+            new_file = cache.open(
+                path, encoding=encoding, error_handling=error_handling, jobs=jobs, cls=cls
+            )
+        else:
+            source_file, encoding = cls._open_unicode_file(path, claimed_encoding=encoding)
+            new_file = cls(path=path, encoding=encoding)
+            if jobs == 1:
+                new_file.read(
+                    source_file,
+                    error_handling=error_handling,
+                    start=start,
+                    end=end,
+                    assume_sorted=assume_sorted,
+                )
+                windowed = False
+            else:
+                from pysrt.parallel import read_parallel
+
+                read_parallel(
+                    new_file, source_file.read(), error_handling=error_handling, jobs=jobs
+                )
+            source_file.close()
+
+        if windowed:
+            window = cls._window_ordinals(start, end)
+            new_file.data = [item for item in new_file if cls._in_window(item, *window)]
+        if rebase:
+            if start is not None:
+                new_file.shift(milliseconds=-SubRipTime.coerce(start).ordinal)
+            new_file.clean_indexes()
         return new_file
 
     @classmethod
@@ -215,15 +403,77 @@ class SubRipFile(UserList):
         new_file.read(source.splitlines(True), error_handling=error_handling)
         return new_file
 
-    def read(self, source_file, error_handling=ERROR_PASS):
+    @classmethod
+    def from_bytes(cls, data, path=None):
+        """
+        from_bytes(data[, path]) -> SubRipFile
+
+        Load a SubRipFile serialized with `to_bytes()`. Much faster than
+        parsing the equivalent .srt text.
+
+        Raise ValueError if `data` is not a supported serialized track.
+        """
+        from pysrt.serialization import loads
+
+        return loads(data, cls=cls, path=path)
+
+    def to_bytes(self):
         """
-        read(source_file, [error_handling])
+        to_bytes() -> bytes
+
+        Serialize items, eol and encoding into a compact, versioned binary
+        form. See `pysrt.serialization` for the layout.
+        """
+        from pysrt.serialization import dumps
+
+        return dumps(self)
+
+    def to_shared_memory(self, name=None):
+        """
+        to_shared_memory([name]) -> pysrt.sharedmem.SharedTrack
+
+        Publish timing columns and texts into a shared memory block that
+        worker processes can map with `SharedTrack.attach(name)` without
+        copying or unpickling. The caller must `unlink()` it when done.
+        """
+        from pysrt.sharedmem import SharedTrack
+
+        return SharedTrack.publish(self, name=name)
+
+    def __reduce_ex__(self, protocol):
+        # Pickle through the binary format rather than item by item, unless
+        # it would lose item subclasses or extra item attributes.
+        if not all(
+            type(item) is SubRipItem and item.__dict__.keys() == _ITEM_ATTRIBUTES
+            for item in self.data
+        ):
+            return super().__reduce_ex__(protocol)
+        state = {
+            key: value
+            for key, value in self.__dict__.items()
+            if key not in ("data", "_eol", "path", "encoding")
+        }
+        return (type(self).from_bytes, (self.to_bytes(), self.path), state or None)
+
+    def __deepcopy__(self, memo):
+        # Always item by item: copies are expected to keep everything.
+        result = type(self).__new__(type(self))
+        memo[id(self)] = result
+        for key, value in self.__dict__.items():
+            result.__dict__[key] = deepcopy(value, memo)
+        return result
+
+    def read(self, source_file, error_handling=ERROR_PASS, **window):
+        """
+        read(source_file, [error_handling][, start][, end][, assume_sorted])
 
         This method parse subtitles contained in `source_file` and append them
         to the current instance.
 
         `source_file` -> Any iterable that yield unicode strings, like a file
             opened with `codecs.open()` or an array of unicode.
+
+        See `stream` for the window arguments.
         """
         if not (hasattr(source_file, "tell") and hasattr(source_file, "seek")):
             source_iter = iter(source_file)
@@ -236,19 +486,26 @@ class SubRipFile(UserList):
             source_file = chain([first_line], source_iter)
         else:
             self.eol = self._guess_eol(source_file)
-        self.extend(self.stream(source_file, error_handling=error_handling))
+        self.extend(self.stream(source_file, error_handling=error_handling, **window))
         return self
 
     @classmethod
-    def stream(cls, source_file, error_handling=ERROR_PASS):
+    def stream(
+        cls, source_file, error_handling=ERROR_PASS, start=None, end=None, assume_sorted=True
+    ):
         """
-        stream(source_file, [error_handling])
+        stream(source_file, [error_handling][, start][, end][, assume_sorted])
 
         This method yield SubRipItem instances a soon as they have been parsed
         without storing them. It is a kind of SAX parser for .srt files.
 
         `source_file` -> Any iterable that yield unicode strings, like a file
             opened with `codecs.open()` or an array of unicode.
+        `start`, `end` -> only yield the items visible between these times.
+            Items ending before `start` are skipped after parsing their
+            timestamps only. Unless `assume_sorted` is False, the source is
+            considered sorted by start time and reading stops at the first
+            item starting after `end`.
 
         Example:
             >>> import pysrt
@@ -258,19 +515,192 @@ class SubRipFile(UserList):
             ...     sub.text += "\\nHello !"
             ...     print(str(sub))
         """
-        string_buffer = []
-        for index, line in enumerate(chain(source_file, "\n")):
-            if line.strip():
-                string_buffer.append(line)
-            else:
-                source = string_buffer
-                string_buffer = []
-                if source and all(source):
-                    try:
-                        yield SubRipItem.from_lines(source)
-                    except Error as error:
-                        error.args += ("".join(source),)
-                        cls._handle_error(error, error_handling, index)
+        blocks = cls._iter_blocks(source_file)
+        if start is None and end is None:
+            for block in blocks:
+                item = cls._parse_block(block, error_handling)
+                if item is not None:
+                    yield item
+            return
+
+        window = cls._window_ordinals(start, end)
+        for block in cls._iter_window(blocks, window, assume_sorted):
+            item = cls._parse_block(block, error_handling)
+            # Blocks whose timestamps could not be peeked are checked here.
+            if item is not None and cls._in_window(item, *window):
+                yield item
+
+    @classmethod
+    def _iter_window(cls, blocks, window, assume_sorted):
+        start, end = window
+        for block in blocks:
+            try:
+                item_start, item_end = SubRipItem.ordinals_from_lines(block[1])
+            except Error:
+                yield block  # let _parse_block report it
+                continue
+            if item_start >= end:
+                if assume_sorted:
+                    return
+                continue
+            if item_end > start:
+                yield block
+
+    @staticmethod
+    def _window_ordinals(start, end):
+        start = float("-inf") if start is None else SubRipTime.coerce(start).ordinal
+        end = float("inf") if end is None else SubRipTime.coerce(end).ordinal
+        return start, end
+
+    @staticmethod
+    def _in_window(item, start, end):
+        return item.end.ordinal > start and item.start.ordinal < end
+
+    @classmethod
+    def _parse_block(cls, block, error_handling):
+        index, source = block
+        try:
+            return SubRipItem.from_lines(source)
+        except Error as error:
+            error.args += ("".join(source),)
+            cls._handle_error(error, error_handling, index)
+        return None
+
+    @classmethod
+    def stream_bytes(cls, source, encoding=None, error_handling=ERROR_PASS):
+        """
+        stream_bytes(source, [encoding], [error_handling])
+
+        Like `stream`, but for undecoded input such as sockets, pipes or
+        downloads. The input is decoded incrementally and items are yielded
+        as soon as they have been parsed, in constant memory.
+
+        `source` -> a binary file-like object or any iterable of bytes.
+        `encoding` -> default to the one announced by a byte order mark at
+            the start of `source`, else to utf-8.
+
+        Example:
+            >>> import sys
+            >>> for sub in pysrt.stream_bytes(sys.stdin.buffer):
+            ...     print(sub.text)
+        """
+        return cls.stream(iter_lines(iter_chunks(source), encoding), error_handling)
+
+    @classmethod
+    def iter_archive(cls, path, pattern="*.srt", encoding=None, error_handling=ERROR_PASS):
+        """
+        iter_archive(path[, pattern][, encoding][, error_handling])
+            -> iterator of (member name, SubRipFile)
+
+        Parse the members of a zip or tar (possibly compressed) archive whose
+        file name matches `pattern`, without extracting them to disk. Each
+        member's encoding is detected as `open` does.
+
+        Example:
+            >>> for name, subs in pysrt.iter_archive('dump.tar.xz'):
+            ...     print(name, len(subs))
+        """
+        from pysrt.compression import iter_archive
+
+        return iter_archive(
+            path, pattern, encoding=encoding, error_handling=error_handling, cls=cls
+        )
+
+    @classmethod
+    def follow(
+        cls, path, encoding=None, error_handling=ERROR_PASS, interval=0.25, idle_timeout=None
+    ):
+        """
+        follow(path, [encoding], [error_handling][, interval][, idle_timeout])
+
+        Follow mode of `stream` for files that are still being written: yield
+        the cues already in `path`, then each new cue as soon as it has been
+        completely appended. Only new bytes are read at each poll, truncated
+        and rotated files are handled. See pysrt.follow.SubRipFollower.
+
+        Example:
+            >>> for sub in pysrt.SubRipFile.follow('live.srt', interval=0.1):
+            ...     print(sub.text)
+        """
+        from pysrt.follow import SubRipFollower
+
+        follower = SubRipFollower(path, encoding=encoding, error_handling=error_handling, cls=cls)
+        return follower.follow(interval=interval, idle_timeout=idle_timeout)
+
+    @classmethod
+    def _iter_blocks(cls, source_file):
+        """
+        Yield (line number, lines) for each blank line separated block of
+        `source_file`, the line number being the one of the closing blank line.
+        """
+        splitter = BlockSplitter()
+        feed = splitter.feed
+        for line in source_file:
+            block = feed(line)
+            if block:
+                yield block
+        block = splitter.close()
+        if block:
+            yield block
+
+    @classmethod
+    async def aopen(cls, path="", encoding=None, error_handling=ERROR_PASS):
+        """
+        aopen([path, [encoding]]) -> SubRipFile
+
+        Asyncio version of `open`. The file is read and decoded by chunks in
+        the default executor and parsed incrementally, yielding to the event
+        loop between chunks.
+        """
+        from pysrt.aio import aopen
+
+        return await aopen(cls, path, encoding=encoding, error_handling=error_handling)
+
+    @classmethod
+    def astream(cls, source, encoding=None, error_handling=ERROR_PASS):
+        """
+        astream(source, [encoding], [error_handling])
+
+        Async generator counterpart of `stream`, yielding SubRipItem instances
+        as soon as they have been parsed.
+
+        `source` -> an asyncio.StreamReader, or any async iterable of bytes
+            or str chunks. Bytes are decoded incrementally with `encoding`,
+            sniffed from the byte order mark if not given.
+
+        Example:
+            >>> reader, writer = await asyncio.open_connection(host, port)
+            >>> async for sub in SubRipFile.astream(reader):
+            ...     print(sub.text)
+        """
+        from pysrt.aio import astream
+
+        return astream(cls, source, encoding=encoding, error_handling=error_handling)
+
+    async def asave(self, path=None, encoding=None, eol=None):
+        """
+        asave([path][, encoding][, eol])
+
+        Asyncio version of `save`. Writes happen in the default executor.
+        """
+        from pysrt.aio import asave
+
+        await asave(self, path=path, encoding=encoding, eol=eol)
+
+    async def awrite_into(self, output_file, eol=None, encoding=None):
+        """
+        awrite_into(output_file [, eol][, encoding])
+
+        Asyncio version of `write_into`.
+
+        `output_file` -> an asyncio.StreamWriter, which is written encoded
+            bytes (with `encoding`, default to the file's one) and drained
+            after each chunk, or any object with a `write()` coroutine
+            accepting str.
+        """
+        from pysrt.aio import awrite_into
+
+        await awrite_into(self, output_file, eol=eol, encoding=encoding)
 
     def save(self, path=None, encoding=None, eol=None):
         """
@@ -279,11 +709,13 @@ class SubRipFile(UserList):
         Use initial path if no other provided.
         Use initial encoding if no other provided.
         Use initial eol if no other provided.
+
+        Paths ending with .gz, .bz2 or .xz are compressed accordingly.
         """
         path = path or self.path
         encoding = encoding or self.encoding
 
-        with open(path, "w", encoding=encoding) as save_file:
+        with open_file(path, "w", encoding=encoding) as save_file:
             self.write_into(save_file, eol=eol)
 
     def write_into(self, output_file, eol=None):
@@ -295,19 +727,27 @@ class SubRipFile(UserList):
         `output_file` -> Any instance that respond to `write()`, typically a
         file object
         """
+        for string in self._iter_output(eol):
+            output_file.write(string)
+
+    def _iter_output(self, eol=None):
         output_eol = eol or self.eol
 
         for item in self:
-            string_repr = str(item)
-            if output_eol != "\n":
-                string_repr = string_repr.replace("\n", output_eol)
-            output_file.write(string_repr)
-            # Only add trailing eol if it's not already present.
-            # It was kept in the SubRipItem's text before but it really
-            # belongs here. Existing applications might give us subtitles
-            # which already contain a trailing eol though.
-            if not string_repr.endswith(2 * output_eol):
-                output_file.write(output_eol)
+            yield self._serialize_item(item, output_eol)
+
+    @staticmethod
+    def _serialize_item(item, eol):
+        string_repr = str(item)
+        if eol != "\n":
+            string_repr = string_repr.replace("\n", eol)
+        # Only add trailing eol if it's not already present.
+        # It was kept in the SubRipItem's text before but it really
+        # belongs here. Existing applications might give us subtitles
+        # which already contain a trailing eol though.
+        if not string_repr.endswith(2 * eol):
+            string_repr += eol
+        return string_repr
 
     @classmethod
     def _guess_eol(cls, string_iterable):
@@ -334,22 +774,32 @@ class SubRipFile(UserList):
 
     @classmethod
     def _detect_encoding(cls, path):
-        file_descriptor = open(path, "rb")
-        first_chars = file_descriptor.read(BIGGER_BOM)
-        file_descriptor.close()
-
-        for bom, encoding in BOMS:
-            if first_chars.startswith(bom):
-                return encoding
+        with open_binary(path) as file_descriptor:
+            first_chars = file_descriptor.read(BIGGER_BOM)
 
-        # TODO: maybe a chardet integration
-        return cls.DEFAULT_ENCODING
+        return detect_bom(first_chars) or cls.DEFAULT_ENCODING
 
     @classmethod
     def _open_unicode_file(cls, path, claimed_encoding=None):
-        encoding = claimed_encoding or cls._detect_encoding(path)
+        if claimed_encoding == cls.AUTO_ENCODING:
+            claimed_encoding = detect_encoding(path, default=cls.DEFAULT_ENCODING)
+        return cls._decode_binary_file(open_binary(path), claimed_encoding)
+
+    @classmethod
+    def _decode_binary_file(cls, binary_file, claimed_encoding=None):
+        if claimed_encoding == cls.AUTO_ENCODING:
+            encoding = detect_stream_encoding(binary_file, default=cls.DEFAULT_ENCODING)
+        elif claimed_encoding:
+            encoding = claimed_encoding
+        else:
+            encoding = detect_bom(binary_file.read(BIGGER_BOM)) or cls.DEFAULT_ENCODING
+            binary_file.seek(0)
         # Use newline="" to preserve original line endings for EOL detection
-        source_file = open(path, encoding=encoding, newline="")
+        try:
+            source_file = io.TextIOWrapper(binary_file, encoding=encoding, newline="")
+        except LookupError:
+            binary_file.close()
+            raise
 
         # get rid of BOM if any
         possible_bom = CODECS_BOMS.get(encoding, None)
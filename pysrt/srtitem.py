@@ -1,8 +1,7 @@
 """SubRip's subtitle parser."""
 
-import re
-
 from pysrt.comparablemixin import ComparableMixin
+from pysrt.markup import Markup
 from pysrt.srtexc import InvalidItem
 from pysrt.srttime import SubRipTime
 
@@ -35,14 +34,32 @@ class SubRipItem(ComparableMixin):
     def duration(self):
         return self.end - self.start
 
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        self._text = value
+        self._markup = None
+
+    @property
+    def markup(self):
+        """
+        pysrt.markup.Markup of the text, parsed on first use and cached
+        until the text is set again.
+        """
+        if self._markup is None:
+            self._markup = Markup(self._text)
+        return self._markup
+
     @property
     def text_without_tags(self):
-        RE_TAG = re.compile(r"<[^>]*?>")
-        return RE_TAG.sub("", self.text)
+        return self.markup.plain_text
 
     @property
     def characters_per_second(self):
-        characters_count = len(self.text_without_tags.replace("\n", ""))
+        characters_count = self.markup.visible_length
         try:
             return characters_count / (self.duration.ordinal / 1000.0)
         except ZeroDivisionError:
@@ -65,6 +82,24 @@ class SubRipItem(ComparableMixin):
         self.start.shift(*args, **kwargs)
         self.end.shift(*args, **kwargs)
 
+    @classmethod
+    def from_values(cls, index, start, end, text, position):
+        """
+        from_values(index, start, end, text, position) -> SubRipItem
+
+        Fast path of the constructor for values already checked, e.g. items
+        parsed elsewhere: `start` and `end` are int milliseconds, `text` and
+        `position` str, and `index` is kept as it is. Keep in sync with
+        __init__.
+        """
+        item = cls.__new__(cls)
+        item.index = index
+        item.start = SubRipTime.from_int_ordinal(start)
+        item.end = SubRipTime.from_int_ordinal(end)
+        item.position = position
+        item.text = text
+        return item
+
     @classmethod
     def from_string(cls, source):
         return cls.from_lines(source.splitlines(True))
@@ -81,6 +116,20 @@ class SubRipItem(ComparableMixin):
         body = "\n".join(lines[1:])
         return cls(index, start, end, body, position)
 
+    @classmethod
+    def ordinals_from_lines(cls, lines):
+        """
+        ordinals_from_lines(lines) -> (start, end) in milliseconds
+
+        Parse only the timestamps of the item `from_lines` would return,
+        leaving the text alone.
+        """
+        if len(lines) < 2:
+            raise InvalidItem()
+        timing_line = lines[0] if cls.TIMESTAMP_SEPARATOR in lines[0] else lines[1]
+        start, end, _ = cls.split_timestamps(timing_line.rstrip())
+        return SubRipTime.ordinal_from_string(start), SubRipTime.ordinal_from_string(end)
+
     @classmethod
     def split_timestamps(cls, line):
         timestamps = line.split(cls.TIMESTAMP_SEPARATOR)
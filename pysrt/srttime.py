@@ -138,16 +138,41 @@ class SubRipTime(ComparableMixin):
         """
         return cls(milliseconds=int(ordinal))
 
+    @classmethod
+    def from_int_ordinal(cls, ordinal):
+        """
+        int -> SubRipTime, as from_ordinal but for an `ordinal` already known
+        to be an int: the constructor is skipped, for bulk loading. Keep in
+        sync with __init__.
+        """
+        time = cls.__new__(cls)
+        time.ordinal = ordinal
+        return time
+
     @classmethod
     def from_string(cls, source):
         """
         str/unicode(HH:MM:SS,mmm) -> SubRipTime corresponding to serial
         raise InvalidTimeString
         """
+        return cls.from_ordinal(cls.ordinal_from_string(source))
+
+    @classmethod
+    def ordinal_from_string(cls, source):
+        """
+        str/unicode(HH:MM:SS,mmm) -> total count of milliseconds
+        raise InvalidTimeString
+        """
         items = cls.RE_TIME_SEP.split(source)
         if len(items) != 4:
             raise InvalidTimeString
-        return cls(*(cls.parse_int(i) for i in items))
+        hours, minutes, seconds, milliseconds = (cls.parse_int(i) for i in items)
+        return (
+            hours * cls.HOURS_RATIO
+            + minutes * cls.MINUTES_RATIO
+            + seconds * cls.SECONDS_RATIO
+            + milliseconds
+        )
 
     @classmethod
     def parse_int(cls, digits):
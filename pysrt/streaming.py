@@ -0,0 +1,126 @@
+"""Incremental building blocks for parsing SubRip sources chunk by chunk."""
+
+import codecs
+import io
+
+from pysrt.encoding import BIGGER_BOM, DEFAULT_ENCODING, detect_bom
+
+BOM_CHARACTER = "\ufeff"
+CHUNK_SIZE = 64 * 1024
+
+
+class LineSplitter:
+    """
+    Split text fed by arbitrary chunks into lines, exactly like iterating
+    over a file opened with newline="": lines end with "\\n", "\\r\\n" or "\\r"
+    and keep their line ending.
+    """
+
+    def __init__(self):
+        self._pending = ""
+
+    def feed(self, text):
+        """feed(text) -> list of the lines completed by `text`"""
+        text = self._pending + text
+        if not text:
+            return []
+        lines = io.StringIO(text, newline="").readlines()
+        # A trailing "\r" may be the first half of a "\r\n" split across chunks.
+        last_line = lines[-1]
+        if last_line.endswith("\n"):
+            self._pending = ""
+        else:
+            self._pending = lines.pop()
+        return lines
+
+    def close(self):
+        """close() -> list of the remaining, unterminated lines"""
+        pending, self._pending = self._pending, ""
+        return [pending] if pending else []
+
+
+class BlockSplitter:
+    """
+    Push counterpart of SubRipFile._iter_blocks: feed it lines one at a time
+    and it returns (line number, lines) each time a block is completed.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.line_number = 0
+
+    def feed(self, line):
+        index = self.line_number
+        self.line_number += 1
+        if line.strip():
+            self.lines.append(line)
+            return None
+        source = self.lines
+        self.lines = []
+        return (index, source) if source else None
+
+    def close(self):
+        """close() -> the last, unterminated block if any"""
+        block = self.feed("\n")
+        self.line_number -= 1
+        return block
+
+
+class TextDecoder:
+    """
+    TextDecoder([encoding][, errors])
+
+    Incremental decoder dropping the byte order mark, as
+    SubRipFile._open_unicode_file does for files.
+
+    Without `encoding`, it is sniffed from the byte order mark of the first
+    bytes and default to utf-8.
+    """
+
+    def __init__(self, encoding=None, errors="strict"):
+        self.encoding = encoding
+        self.errors = errors
+        self._decoder = None
+        self._head = b""
+        self._started = False
+        if encoding:
+            self._decoder = codecs.getincrementaldecoder(encoding)(errors)
+
+    def decode(self, data, final=False):
+        if self._decoder is None:
+            self._head += data
+            if len(self._head) < BIGGER_BOM and not final:
+                return ""
+            self.encoding = detect_bom(self._head) or DEFAULT_ENCODING
+            self._decoder = codecs.getincrementaldecoder(self.encoding)(self.errors)
+            data, self._head = self._head, b""
+
+        text = self._decoder.decode(data, final)
+        if not self._started and (text or final):
+            self._started = True
+            if text.startswith(BOM_CHARACTER):
+                text = text[len(BOM_CHARACTER) :]
+        return text
+
+
+def iter_chunks(source, chunk_size=CHUNK_SIZE):
+    """
+    Yield bytes chunks from a binary file-like object (anything with a
+    `read()` method) or from an iterable of bytes.
+    """
+    if hasattr(source, "read"):
+        return iter(lambda: source.read(chunk_size), b"")
+    return iter(source)
+
+
+def iter_lines(chunks, encoding=None, errors="strict"):
+    """
+    Decode an iterable of bytes chunks incrementally and yield lines as
+    soon as they are completed, in constant memory.
+    """
+    decoder = TextDecoder(encoding, errors)
+    splitter = LineSplitter()
+    for chunk in chunks:
+        yield from splitter.feed(decoder.decode(chunk))
+    yield from splitter.feed(decoder.decode(b"", final=True))
+    yield from splitter.close()
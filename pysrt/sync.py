@@ -0,0 +1,382 @@
+"""
+Automatic synchronization of a subtitle track against a reference.
+
+Both tracks are turned into speech activity signals: bins of `resolution`
+milliseconds holding the fraction of their duration covered by a cue. The
+offset between the two signals is the lag maximizing their cross
+correlation, computed with FFTs in O(n log n). The target is also scaled by
+the usual frame rate conversion ratios, the best correlating ratio is kept.
+
+That coarse estimate is then refined to the millisecond, and corrected for
+drift, by a robust linear regression over anchors: cue boundaries of the
+target matched to the nearest ones of the reference.
+
+NumPy is used for the FFTs when installed, otherwise a pure Python FFT
+over coarser bins.
+"""
+
+import cmath
+import math
+from bisect import bisect_left
+from statistics import median
+from typing import NamedTuple
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional accelerator
+    numpy = None
+
+RESOLUTION = 100
+# Without NumPy, bins are made coarser to keep FFTs below this size; the
+# regression over anchors brings the precision back to the millisecond.
+PURE_PYTHON_FFT_SIZE = 1 << 14
+MAX_OFFSET = 5 * 60 * 1000
+FRAME_RATES = (23.976, 24, 25)
+# Every conversion between two usual frame rates, and no conversion first.
+RATIOS = (1.0,) + tuple(
+    final / initial for initial in FRAME_RATES for final in FRAME_RATES if final != initial
+)
+MIN_ANCHORS = 4
+MAX_RATIO_CORRECTION = 0.005
+MIN_RESIDUAL_THRESHOLD = 10
+MAD_SCALE = 1.4826
+
+
+class SyncResult(NamedTuple):
+    """
+    Transform mapping a target time `t` to `t * ratio + offset` milliseconds
+    on the reference.
+
+    score -> normalized cross correlation of the two speech signals, 1.0
+        for identical signals.
+    anchors -> number of cue boundaries used by the regression, 0 when the
+        coarse estimate was kept.
+    """
+
+    ratio: float
+    offset: int
+    score: float
+    anchors: int
+
+    @property
+    def shift_arguments(self):
+        """Keyword arguments for SubRipFile.shift()."""
+        return {"ratio": self.ratio, "milliseconds": self.offset}
+
+    def apply(self, srt_file):
+        """apply(srt_file) -> srt_file, shifted in place"""
+        srt_file.shift(**self.shift_arguments)
+        return srt_file
+
+
+def synchronize(
+    reference, target, ratios=RATIOS, resolution=None, max_offset=MAX_OFFSET, refine=True
+):
+    """
+    synchronize(reference, target[, ratios][, resolution][, max_offset][, refine])
+        -> SyncResult
+
+    Estimate the transform bringing `target` in sync with `reference`, both
+    SubRipFile instances (or any iterable of SubRipItem).
+
+    ratios -> drift ratios tried, default to no drift and every frame rate
+        conversion between 23.976, 24 and 25 fps.
+    resolution -> bin size of the speech signals in milliseconds, default
+        to RESOLUTION, or coarser without NumPy for long tracks.
+    max_offset -> largest offset searched in milliseconds, either way.
+    refine -> bool: refine the estimate by regression over matched cues.
+
+    Example:
+        >>> result = synchronize(pysrt.open('reference.srt'), subs)
+        >>> subs.shift(**result.shift_arguments)
+    """
+    reference_intervals = intervals(reference)
+    target_intervals = intervals(target)
+    if not reference_intervals or not target_intervals:
+        raise ValueError("cannot synchronize an empty track")
+    if resolution is None:
+        resolution = default_resolution(
+            max(end for _, end in reference_intervals),
+            max(end for _, end in target_intervals),
+            ratios,
+            max_offset,
+        )
+
+    ratio, offset, score = estimate_offset(
+        reference_intervals, target_intervals, ratios, resolution, max_offset
+    )
+    anchors = 0
+    if refine:
+        fit = fit_anchors(
+            reference_intervals, target_intervals, ratio, offset, tolerance=4 * resolution
+        )
+        if fit is not None and abs(fit[0] / ratio - 1) <= MAX_RATIO_CORRECTION:
+            ratio, offset, anchors = fit
+    return SyncResult(ratio, round(offset), score, anchors)
+
+
+def default_resolution(reference_end, target_end, ratios, max_offset, step=RESOLUTION):
+    """
+    default_resolution(reference_end, target_end, ratios, max_offset[, step])
+        -> bin size in milliseconds
+
+    RESOLUTION, or without NumPy the smallest multiple of `step` keeping
+    the FFTs below PURE_PYTHON_FFT_SIZE.
+    """
+    if numpy is not None:
+        return max(RESOLUTION // step, 1) * step
+    span = max(reference_end, target_end * max(ratios))
+    span += span if max_offset is None else max_offset
+    steps = math.ceil(span / (PURE_PYTHON_FFT_SIZE - 2) / step)
+    return max(max(RESOLUTION // step, 1), steps) * step
+
+
+def intervals(srt_file):
+    """intervals(srt_file) -> sorted list of (start, end) in milliseconds, empty cues excluded"""
+    return sorted(
+        (item.start.ordinal, item.end.ordinal)
+        for item in srt_file
+        if item.end.ordinal > item.start.ordinal
+    )
+
+
+def speech_signal(spans, resolution=RESOLUTION, ratio=1.0, length=None):
+    """
+    speech_signal(spans[, resolution][, ratio][, length]) -> list of float
+
+    Fraction of each `resolution` ms bin covered by the (start, end) `spans`
+    once scaled by `ratio`.
+    """
+    if length is None:
+        length = math.ceil(max(end for _, end in spans) * ratio / resolution) + 1
+    signal = [0.0] * length
+    for start, end in spans:
+        start = max(0.0, start * ratio / resolution)
+        end = min(float(length), end * ratio / resolution)
+        if end <= start:
+            continue
+        first, last = int(start), int(end)
+        if first == last:
+            signal[first] += end - start
+            continue
+        signal[first] += first + 1 - start
+        if last > first + 1:
+            signal[first + 1 : last] = [value + 1.0 for value in signal[first + 1 : last]]
+        if last < length:
+            signal[last] += end - last
+    return signal
+
+
+def estimate_offset(
+    reference_intervals, target_intervals, ratios=RATIOS, resolution=RESOLUTION, max_offset=None
+):
+    """
+    estimate_offset(reference_intervals, target_intervals[, ratios][, resolution]
+                    [, max_offset]) -> (ratio, offset in ms, score)
+
+    Best correlating ratio and offset, to `resolution` precision (improved
+    by parabolic interpolation of the correlation peak).
+    """
+    reference = speech_signal(reference_intervals, resolution)
+    return align_signal(reference, target_intervals, ratios, resolution, max_offset)
+
+
+def align_signal(
+    reference, target_intervals, ratios=RATIOS, resolution=RESOLUTION, max_offset=None
+):
+    """
+    align_signal(reference, target_intervals[, ratios][, resolution][, max_offset])
+        -> (ratio, offset in ms, score)
+
+    Same as `estimate_offset`, against any activity signal sampled every
+    `resolution` milliseconds, such as an audio envelope.
+    """
+    targets = [speech_signal(target_intervals, resolution, ratio) for ratio in ratios]
+    longest = max(len(reference), *(len(target) for target in targets))
+    max_lag = longest if max_offset is None else min(longest, max_offset // resolution + 1)
+    size = 1 << (longest + max_lag - 1).bit_length()
+
+    correlations = cross_correlations(reference, targets, size)
+    reference_energy = math.sqrt(sum(value * value for value in reference))
+    best = None
+    for ratio, target, correlation in zip(ratios, targets, correlations):
+        lag, peak = _peak(correlation, max_lag)
+        norm = reference_energy * math.sqrt(sum(value * value for value in target))
+        score = peak / norm if norm else 0.0
+        if best is None or score > best[2]:
+            best = (ratio, lag * resolution, score)
+    return best
+
+
+def cross_correlations(reference, targets, size):
+    """
+    cross_correlations(reference, targets, size) -> list of correlations
+
+    For each target, c[lag] = sum(target[n] * reference[n + lag]), circular
+    over `size` (a power of two) so negative lags are at the end.
+    """
+    if numpy is not None:
+        reference_spectrum = numpy.fft.rfft(reference, size)
+        return [
+            numpy.fft.irfft(reference_spectrum * numpy.fft.rfft(target, size).conj(), size)
+            for target in targets
+        ]
+    spectra = _real_spectra([reference] + list(targets), size)
+    reference_spectrum = spectra[0]
+    products = [
+        [r * t.conjugate() for r, t in zip(reference_spectrum, spectrum)]
+        for spectrum in spectra[1:]
+    ]
+    return _inverse_real(products)
+
+
+def fit_anchors(reference_intervals, target_intervals, ratio, offset, tolerance):
+    """
+    fit_anchors(reference_intervals, target_intervals, ratio, offset, tolerance)
+        -> (ratio, offset, anchors) or None
+
+    Match each target cue boundary, mapped by the estimate, to the nearest
+    reference boundary of the same kind within `tolerance` ms, and fit a
+    line through the matches, discarding outliers.
+    """
+    xs = []
+    ys = []
+    for boundary in (0, 1):
+        reference_times = sorted(interval[boundary] for interval in reference_intervals)
+        for interval in target_intervals:
+            time = interval[boundary]
+            mapped = time * ratio + offset
+            nearest = _nearest(reference_times, mapped)
+            if abs(nearest - mapped) <= tolerance:
+                xs.append(time)
+                ys.append(nearest)
+    if len(xs) < MIN_ANCHORS:
+        return None
+    return robust_linear_fit(xs, ys)
+
+
+def robust_linear_fit(xs, ys, iterations=10):
+    """
+    robust_linear_fit(xs, ys[, iterations]) -> (slope, intercept, inliers)
+
+    Least squares fit of y = slope * x + intercept, repeated on the points
+    whose residual is within 3 (scaled) median absolute deviations.
+    """
+    points = list(zip(xs, ys))
+    kept = points
+    slope, intercept = _least_squares(kept)
+    for _ in range(iterations):
+        residuals = [abs(y - (slope * x + intercept)) for x, y in points]
+        threshold = max(3 * MAD_SCALE * median(residuals), MIN_RESIDUAL_THRESHOLD)
+        inliers = [point for point, residual in zip(points, residuals) if residual <= threshold]
+        if len(inliers) < 2 or inliers == kept:
+            break
+        kept = inliers
+        slope, intercept = _least_squares(kept)
+    return slope, intercept, len(kept)
+
+
+def _least_squares(points):
+    count = len(points)
+    mean_x = sum(x for x, _ in points) / count
+    mean_y = sum(y for _, y in points) / count
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if not variance:
+        return 1.0, mean_y - mean_x
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+    return slope, mean_y - slope * mean_x
+
+
+def _nearest(values, value):
+    position = bisect_left(values, value)
+    candidates = values[max(0, position - 1) : position + 1]
+    return min(candidates, key=lambda candidate: abs(candidate - value))
+
+
+def _peak(correlation, max_lag):
+    size = len(correlation)
+    best_lag, best_value = 0, correlation[0]
+    for lag in range(-max_lag, max_lag + 1):
+        value = correlation[lag % size]
+        if value > best_value:
+            best_lag, best_value = lag, value
+    # Parabolic interpolation between the neighbours of the peak.
+    before = correlation[(best_lag - 1) % size]
+    after = correlation[(best_lag + 1) % size]
+    curvature = before - 2 * best_value + after
+    if curvature < 0:
+        return best_lag + 0.5 * (before - after) / curvature, best_value
+    return best_lag, best_value
+
+
+def fft(values, inverse=False):
+    """
+    fft(values[, inverse]) -> list of complex
+
+    Iterative radix-2 FFT, len(values) must be a power of two. Butterflies
+    are applied a whole stage at a time through list slices.
+    """
+    size = len(values)
+    bits = size.bit_length() - 1
+    order = [0] * size
+    for index in range(1, size):
+        order[index] = (order[index >> 1] >> 1) | ((index & 1) << (bits - 1))
+    result = [values[index] for index in order]
+
+    sign = 2j if inverse else -2j
+    span = 2
+    while span <= size:
+        half = span // 2
+        twiddles = [cmath.exp(sign * cmath.pi * k / span) for k in range(half)]
+        if half < size // span:
+            # Few butterflies per block, many blocks: go through strides.
+            for k, twiddle in enumerate(twiddles):
+                even = result[k::span]
+                odd = [twiddle * value for value in result[k + half :: span]]
+                result[k::span] = [e + o for e, o in zip(even, odd)]
+                result[k + half :: span] = [e - o for e, o in zip(even, odd)]
+        else:
+            for start in range(0, size, span):
+                middle, stop = start + half, start + span
+                even = result[start:middle]
+                odd = [twiddle * value for twiddle, value in zip(twiddles, result[middle:stop])]
+                result[start:middle] = [e + o for e, o in zip(even, odd)]
+                result[middle:stop] = [e - o for e, o in zip(even, odd)]
+        span *= 2
+    if inverse:
+        result = [value / size for value in result]
+    return result
+
+
+def _real_spectra(signals, size):
+    # Two real signals per complex FFT: a + ib, separated by symmetry.
+    spectra = []
+    for first in range(0, len(signals), 2):
+        a = signals[first]
+        b = signals[first + 1] if first + 1 < len(signals) else []
+        packed = [complex(x, y) for x, y in zip(_pad(a, size), _pad(b, size))]
+        spectrum = fft(packed)
+        mirrored = [spectrum[-k % size].conjugate() for k in range(size)]
+        spectra.append([(z + m) / 2 for z, m in zip(spectrum, mirrored)])
+        if first + 1 < len(signals):
+            spectra.append([(z - m) / 2j for z, m in zip(spectrum, mirrored)])
+    return spectra
+
+
+def _inverse_real(spectra):
+    # The inverses are real: two per complex FFT, as real and imaginary parts.
+    results = []
+    for first in range(0, len(spectra), 2):
+        a = spectra[first]
+        if first + 1 < len(spectra):
+            b = spectra[first + 1]
+            signal = fft([x + 1j * y for x, y in zip(a, b)], inverse=True)
+            results.append([value.real for value in signal])
+            results.append([value.imag for value in signal])
+        else:
+            results.append([value.real for value in fft(a, inverse=True)])
+    return results
+
+
+def _pad(signal, size):
+    return list(signal[:size]) + [0.0] * (size - len(signal))
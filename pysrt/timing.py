@@ -1,8 +1,33 @@
 """Subtitle timing utilities."""
 
+import math
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+
 from pysrt.srttime import SubRipTime
 
 
+@dataclass
+class ShotChangeAdjustment:
+    """Move of the start and end of a subtitle snapped to shot changes."""
+
+    position: int
+    index: int
+    start_shift_ms: int
+    end_shift_ms: int
+
+
+@dataclass
+class UnsatisfiedCue:
+    """Subtitle still read too fast, or shorter than the minimum, after retiming."""
+
+    position: int
+    index: int
+    characters_per_second: float
+    missing_ms: int
+
+
 def calculate_optimal_duration_ms(text, words_per_second=2.5):
     """
     Calculate optimal duration in milliseconds based on word count.
@@ -81,3 +106,244 @@ def fix_overlapping_subtitles(
             current.end = SubRipTime.from_ordinal(new_end_ordinal)
 
     return subs
+
+
+def parse_timestamp(value):
+    """
+    Coerce a timestamp to SubRipTime, reading digit-only strings as milliseconds.
+
+    Args:
+        value: Anything SubRipTime.coerce accepts, e.g. "00:01:02,500" or 62500
+
+    Returns:
+        SubRipTime instance
+    """
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    return SubRipTime.coerce(value)
+
+
+def remap_subtitles(subs, anchors, drop=False):
+    """
+    Move subtitles along the piecewise-linear mapping through anchor points.
+
+    Between two anchors, times are interpolated linearly; before the first
+    anchor and after the last one, they keep the offset of that anchor. Two
+    anchors with the same target time mark a removed segment (an ad break,
+    a cut scene): cues partly in it are clipped to the material that is
+    kept, cues entirely in it are dropped. Each time is placed with a
+    binary search over the anchors, so remapping n cues on k anchors costs
+    O(n log k).
+
+    Args:
+        subs: SubRipFile instance to remap in place
+        anchors: Iterable of (source_time, target_time) pairs, in any format
+            SubRipTime.coerce accepts
+        drop: Drop the cues overlapping a removed segment instead of
+            clipping them (default False)
+
+    Returns:
+        List of the removed SubRipItems
+
+    Raises:
+        ValueError: No anchor, two anchors for the same source time, or
+            target times going backwards
+    """
+    points = sorted(
+        (SubRipTime.coerce(source).ordinal, SubRipTime.coerce(target).ordinal)
+        for source, target in anchors
+    )
+    if not points:
+        raise ValueError("at least one anchor is required")
+    sources = [source for source, _ in points]
+    targets = [target for _, target in points]
+    # Segment i runs from anchor i - 1 to anchor i; the first and the last
+    # ones extend the offset of the nearest anchor.
+    slopes = [1.0]
+    for i in range(1, len(points)):
+        if sources[i] == sources[i - 1]:
+            raise ValueError(f"two anchors for {SubRipTime.from_ordinal(sources[i])}")
+        if targets[i] < targets[i - 1]:
+            raise ValueError(f"anchor {SubRipTime.from_ordinal(sources[i])} goes back in time")
+        slopes.append((targets[i] - targets[i - 1]) / (sources[i] - sources[i - 1]))
+    slopes.append(1.0)
+    removed_before = list(accumulate((slope == 0 for slope in slopes), initial=0))
+
+    def convert(ordinal, segment):
+        base = max(segment - 1, 0)
+        return round(targets[base] + (ordinal - sources[base]) * slopes[segment])
+
+    kept = []
+    removed = []
+    for item in subs:
+        start, end = item.start.ordinal, item.end.ordinal
+        # A cue starting where a removed segment ends, or ending where one
+        # starts, does not overlap it.
+        first = bisect_right(sources, start)
+        last = max(bisect_left(sources, end), first) if end > start else first
+        new_start, new_end = convert(start, first), convert(end, last)
+        if removed_before[last + 1] > removed_before[first] and (drop or new_end <= new_start):
+            removed.append(item)
+            continue
+        item.start = SubRipTime.from_ordinal(new_start)
+        item.end = SubRipTime.from_ordinal(new_end)
+        kept.append(item)
+    subs.data = kept
+    return removed
+
+
+def read_shot_changes(path):
+    """
+    Read shot change timestamps from a text file.
+
+    Args:
+        path: File with one timestamp per line, in any format parse_timestamp
+            accepts; blank lines and lines starting with # are ignored
+
+    Returns:
+        Sorted list of the shot changes in milliseconds
+    """
+    with open(path, encoding="utf-8") as shot_file:
+        return sorted(
+            parse_timestamp(line).ordinal
+            for line in shot_file
+            if line.strip() and not line.lstrip().startswith("#")
+        )
+
+
+def snap_to_shot_changes(subs, shot_changes, window_ms=500, min_gap_ms=80, min_duration_ms=833):
+    """
+    Snap subtitle starts and ends to the nearest shot change.
+
+    A start or end moves to the nearest shot change within window_ms, found
+    by binary search, so n subtitles are snapped to m shot changes in
+    O(n log m). A snap is skipped when it would leave less than min_gap_ms
+    from the neighbouring subtitles; an end that would crowd the next
+    subtitle ends min_gap_ms before the shot change instead. Snaps never
+    make a subtitle shorter than min_duration_ms (or than it already was).
+
+    Args:
+        subs: SubRipFile instance, sorted by start time, to snap in place
+        shot_changes: Sorted shot change times, in any format
+            SubRipTime.coerce accepts
+        window_ms: Largest move of a start or end (default 500ms)
+        min_gap_ms: Minimum gap between subtitles (default 80ms, 2 frames)
+        min_duration_ms: Minimum subtitle duration (default 833ms)
+
+    Returns:
+        List of ShotChangeAdjustment, one per subtitle that moved
+    """
+    shots = [SubRipTime.coerce(shot).ordinal for shot in shot_changes]
+
+    def nearest(ordinal):
+        position = bisect_left(shots, ordinal)
+        candidates = shots[max(position - 1, 0) : position + 1]
+        shot = min(candidates, key=lambda candidate: abs(candidate - ordinal), default=None)
+        return shot if shot is not None and abs(shot - ordinal) <= window_ms else None
+
+    adjustments = []
+    previous_end = None
+    for position, item in enumerate(subs):
+        start, end = item.start.ordinal, item.end.ordinal
+        next_start = subs[position + 1].start.ordinal if position + 1 < len(subs) else None
+        min_duration = min(min_duration_ms, end - start)
+
+        new_start = nearest(start)
+        if new_start is None or (
+            previous_end is not None and new_start < previous_end + min_gap_ms
+        ):
+            new_start = start
+        new_end = nearest(end)
+        if new_end is not None and next_start is not None and new_end > next_start - min_gap_ms:
+            # The next subtitle is likely to start on that shot change.
+            new_end -= min_gap_ms
+            if new_end > next_start - min_gap_ms:
+                new_end = None
+        if new_end is None:
+            new_end = end
+        if new_end - new_start < min_duration:
+            new_end = end
+        if new_end - new_start < min_duration:
+            new_start = start
+
+        if (new_start, new_end) != (start, end):
+            item.start = SubRipTime.from_ordinal(new_start)
+            item.end = SubRipTime.from_ordinal(new_end)
+            adjustments.append(
+                ShotChangeAdjustment(position, item.index, new_start - start, new_end - end)
+            )
+        previous_end = new_end
+    return adjustments
+
+
+def retime_for_cps(subs, max_cps=17, min_gap_ms=80, min_duration_ms=833, max_duration_ms=7000):
+    """
+    Lengthen subtitles read too fast, using the gaps and neighbours' spare time.
+
+    Each subtitle needs its characters (tags and line breaks excluded) at
+    max_cps, within min_duration_ms and max_duration_ms. A forward pass
+    extends ends into the gap that follows, then delays the next start
+    while the next subtitle keeps its own required duration. A backward
+    pass moves starts earlier into the gap before, then ends the previous
+    subtitle earlier within its spare time. Subtitles only get shorter to
+    fit max_duration_ms or to lend time above their own required duration.
+    Gaps are not made smaller than min_gap_ms, and gaps already smaller are
+    kept as they are.
+
+    Args:
+        subs: SubRipFile instance, sorted by start time, to retime in place
+        max_cps: Maximum reading speed in characters per second (default 17)
+        min_gap_ms: Minimum gap between subtitles (default 80ms)
+        min_duration_ms: Minimum subtitle duration (default 833ms)
+        max_duration_ms: Maximum subtitle duration (default 7000ms)
+
+    Returns:
+        List of UnsatisfiedCue for the subtitles still too fast or too short
+    """
+    count = len(subs)
+    starts = [item.start.ordinal for item in subs]
+    ends = [item.end.ordinal for item in subs]
+    characters = [item.markup.visible_length for item in subs]
+    needed = [math.ceil(chars * 1000 / max_cps) for chars in characters]
+    required = [min(max(need, min_duration_ms), max_duration_ms) for need in needed]
+
+    for i in range(count):
+        ends[i] = min(ends[i], starts[i] + max_duration_ms)
+        target = starts[i] + required[i]
+        if ends[i] >= target:
+            continue
+        if i + 1 == count:
+            ends[i] = target
+            continue
+        ends[i] = max(ends[i], min(target, starts[i + 1] - min_gap_ms))
+        spare = ends[i + 1] - starts[i + 1] - required[i + 1]
+        borrowed = min(target - ends[i], max(spare, 0))
+        if borrowed > 0 and ends[i] >= starts[i + 1] - min_gap_ms:
+            ends[i] += borrowed
+            starts[i + 1] += borrowed
+
+    for i in range(count - 1, -1, -1):
+        missing = required[i] - (ends[i] - starts[i])
+        if missing <= 0:
+            continue
+        earliest = ends[i - 1] + min_gap_ms if i else 0
+        moved = min(missing, max(starts[i] - earliest, 0))
+        starts[i] -= moved
+        missing -= moved
+        if missing > 0 and i and starts[i] <= earliest:
+            spare = ends[i - 1] - starts[i - 1] - required[i - 1]
+            borrowed = min(missing, max(spare, 0))
+            ends[i - 1] -= borrowed
+            starts[i] -= borrowed
+
+    unsatisfied = []
+    for position, item in enumerate(subs):
+        if (starts[position], ends[position]) != (item.start.ordinal, item.end.ordinal):
+            item.start = SubRipTime.from_ordinal(starts[position])
+            item.end = SubRipTime.from_ordinal(ends[position])
+        duration = ends[position] - starts[position]
+        missing = max(needed[position], min_duration_ms) - duration
+        if missing > 0:
+            cps = characters[position] * 1000 / duration if duration > 0 else math.inf
+            unsatisfied.append(UnsatisfiedCue(position, item.index, round(cps, 2), missing))
+    return unsatisfied
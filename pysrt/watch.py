@@ -0,0 +1,370 @@
+"""Reprocess subtitle files of a directory as they are added or changed."""
+
+import hashlib
+import json
+import os
+import select
+import struct
+import sys
+import tempfile
+import time
+
+from pysrt.batch import is_subtitle_file, process_file
+
+STATE_FILE = ".srt-watch.json"
+READ_SIZE = 64 * 1024
+
+# From <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class PollingMonitor:
+    """
+    Fallback monitor: every `wait()` asks for a full rescan, which costs a
+    stat() per file of the directory but never reads unchanged files.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def wait(self, timeout):
+        """wait(timeout) -> None, meaning every file has to be checked"""
+        time.sleep(timeout)
+        return None
+
+    def close(self):
+        pass
+
+
+class InotifyMonitor:
+    """
+    Linux monitor using inotify through ctypes: `wait()` only returns the
+    paths that were written, created, moved or deleted, so the cost follows
+    the churn instead of the size of the directory.
+
+    Raise OSError if inotify is not available.
+    """
+
+    def __init__(self, directory):
+        import ctypes
+        import ctypes.util
+
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._get_errno = ctypes.get_errno
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(self._get_errno(), "inotify_init1 failed")
+        self.directories = {}
+        self.add_tree(directory)
+
+    def add_tree(self, directory):
+        """add_tree(directory) -> list of the files already in it"""
+        files = []
+        for root, _dirs, names in os.walk(directory):
+            wd = self._add_watch(self.fd, os.fsencode(root), WATCH_MASK)
+            if wd < 0:
+                raise OSError(self._get_errno(), f"cannot watch {root}")
+            self.directories[wd] = root
+            files += [os.path.join(root, name) for name in names]
+        return files
+
+    def wait(self, timeout):
+        """
+        wait(timeout) -> set of changed paths, or None after an event queue
+        overflow, meaning every file has to be checked
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        paths = set()
+        if not ready:
+            return paths
+        data = b""
+        while True:
+            try:
+                data += os.read(self.fd, READ_SIZE)
+            except BlockingIOError:
+                break
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                return None
+            if mask & IN_IGNORED:
+                self.directories.pop(wd, None)
+                continue
+            directory = self.directories.get(wd)
+            if directory is None:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files may have been written before the watch was added.
+                    paths.update(self.add_tree(path))
+            else:
+                paths.add(path)
+        return paths
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class SubRipWatcher:
+    """
+    SubRipWatcher(directory, operations[, state_path][, debounce][, interval]
+                  [, output_dir][, output_encoding][, report][, polling])
+
+    Run `operations`, a list of (op, arguments) as accepted by
+    pysrt.batch.run_batch, on every .srt file of `directory` that is new or
+    changed, then keep watching it.
+
+    Files are only processed once they have not changed for `debounce`
+    seconds, so files still being written are not read half done. The size,
+    mtime and SHA-256 of processed files are kept in the JSON `state_path`
+    (default: .srt-watch.json in `directory`) so that after a restart only
+    new or changed files are processed again, and so that the files edited
+    in place by the operations themselves are not processed twice.
+
+    inotify is used on Linux, polling every `interval` seconds elsewhere or
+    if `polling` is true.
+
+    Example:
+        >>> watcher = SubRipWatcher('drop/', [('fix-overlaps', {}), ('validate', {})])
+        >>> watcher.watch()
+    """
+
+    def __init__(
+        self,
+        directory,
+        operations,
+        state_path=None,
+        debounce=1.0,
+        interval=1.0,
+        output_dir=None,
+        output_encoding=None,
+        report=None,
+        polling=False,
+    ):
+        self.directory = directory
+        self.operations = list(operations)
+        self.state_path = state_path or os.path.join(directory, STATE_FILE)
+        self.debounce = debounce
+        self.interval = interval
+        self.output_dir = output_dir
+        self.output_encoding = output_encoding
+        self.report = report
+        self.polling = polling
+        self.state = self.load_state()
+        self.pending = {}
+        self.monitor = None
+        self._stopped = False
+
+    def load_state(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as state_file:
+                return json.load(state_file)
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self):
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as state_file:
+            json.dump(self.state, state_file)
+        os.replace(temp_path, self.state_path)
+
+    def iter_files(self):
+        for root, dirs, names in os.walk(self.directory):
+            dirs[:] = sorted(d for d in dirs if not self._in_output_dir(os.path.join(root, d)))
+            for name in sorted(names):
+                path = os.path.join(root, name)
+                if self.is_watched(path):
+                    yield path
+
+    def is_watched(self, path):
+        return is_subtitle_file(path) and not self._in_output_dir(path)
+
+    def _in_output_dir(self, path):
+        if not self.output_dir:
+            return False
+        output_dir = os.path.abspath(self.output_dir)
+        path = os.path.abspath(path)
+        return path == output_dir or path.startswith(output_dir + os.sep)
+
+    def run_once(self):
+        """
+        run_once() -> list of processed paths
+
+        Process every new or changed file right away, without debouncing.
+        Useful from cron or to catch up before watching.
+        """
+        processed = []
+        for path in self.iter_files():
+            signature = self._signature(path)
+            if signature is not None and signature != self._known_signature(path):
+                if self.process(path):
+                    processed.append(path)
+        self._forget_missing()
+        return processed
+
+    def watch(self):
+        """Process files as they change, until stop() or KeyboardInterrupt."""
+        self.monitor = None
+        if not self.polling:
+            try:
+                self.monitor = InotifyMonitor(self.directory)
+            except (OSError, AttributeError):
+                pass
+        if self.monitor is None:
+            self.monitor = PollingMonitor(self.directory)
+        try:
+            self._note(self.iter_files(), since=float("-inf"))
+            self._forget_missing()
+            while not self._stopped:
+                self._process_ready()
+                timeout = min(self.interval, self.debounce) if self.pending else self.interval
+                paths = self.monitor.wait(timeout)
+                self._note(self.iter_files() if paths is None else paths)
+        finally:
+            self.monitor.close()
+
+    def stop(self):
+        self._stopped = True
+
+    def process(self, path):
+        """
+        process(path) -> bool
+
+        Run the operations on `path` unless its content is the one already
+        processed. Return True if it was processed.
+        """
+        try:
+            digest = self._digest(path)
+        except OSError:
+            return False
+        if self.state.get(self._key(path), {}).get("sha256") == digest:
+            self._remember(path, digest)
+            return False
+
+        current = path
+        for op, arguments in self.operations:
+            output_path = None
+            if self.output_dir and op != "validate":
+                relative_path = os.path.relpath(path, self.directory)
+                output_path = os.path.join(self.output_dir, relative_path)
+            record = process_file(
+                op,
+                arguments,
+                current,
+                # split leaves its input alone: no backup to make.
+                in_place=output_path is None and op not in ("validate", "split"),
+                output_encoding=self.output_encoding,
+                output_path=output_path,
+            )
+            record["op"] = op
+            if self.report:
+                self.report(record)
+            if not record["ok"]:
+                break
+            # Parts written next to the file are not new files to split again.
+            for part in record.get("paths", ()):
+                if self.is_watched(part):
+                    self._remember(part)
+            if output_path and op != "split":
+                current = output_path
+        # Remember the content as left by in place operations, not as found.
+        self._remember(path)
+        return True
+
+    def _note(self, paths, since=None):
+        now = time.monotonic() if since is None else since
+        for path in paths:
+            if not self.is_watched(path):
+                continue
+            signature = self._signature(path)
+            if signature is None:
+                self.pending.pop(path, None)
+                if self.state.pop(self._key(path), None) is not None:
+                    self.save_state()
+                continue
+            previous = self.pending.get(path)
+            if previous is None:
+                if signature != self._known_signature(path):
+                    self.pending[path] = (signature, now)
+            elif previous[0] != signature:
+                self.pending[path] = (signature, time.monotonic())
+
+    def _process_ready(self):
+        now = time.monotonic()
+        for path, (signature, since) in list(self.pending.items()):
+            if now - since < self.debounce:
+                continue
+            current = self._signature(path)
+            if current != signature:
+                if current is None:
+                    del self.pending[path]
+                else:
+                    self.pending[path] = (current, now)
+                continue
+            del self.pending[path]
+            self.process(path)
+
+    def _remember(self, path, digest=None):
+        try:
+            stat = os.stat(path)
+            if digest is None:
+                digest = self._digest(path)
+        except OSError:
+            return
+        self.state[self._key(path)] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+        }
+        self.save_state()
+
+    def _forget_missing(self):
+        missing = [
+            key for key in self.state if not os.path.exists(os.path.join(self.directory, key))
+        ]
+        for key in missing:
+            del self.state[key]
+        if missing:
+            self.save_state()
+
+    def _key(self, path):
+        return os.path.relpath(path, self.directory)
+
+    def _known_signature(self, path):
+        entry = self.state.get(self._key(path))
+        return entry and (entry["mtime_ns"], entry["size"])
+
+    @staticmethod
+    def _signature(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _digest(path):
+        with open(path, "rb") as source_file:
+            return hashlib.file_digest(source_file, "sha256").hexdigest()
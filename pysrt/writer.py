@@ -0,0 +1,106 @@
+"""Append-only writer for live subtitles."""
+
+import os
+from collections import deque
+
+from pysrt.srtfile import SubRipFile
+from pysrt.srttime import SubRipTime
+from pysrt.timing import fix_overlapping_subtitles
+
+
+class SubRipWriter:
+    """
+    SubRipWriter(output[, eol][, encoding][, window_ms][, fix_overlaps])
+
+    Write cues one at a time as they arrive, instead of keeping a whole
+    SubRipFile in memory and rewriting it with `save()`. Indexes are
+    assigned incrementally and each cue is flushed once written. The output
+    is the same as `SubRipFile(items, eol=eol).write_into(...)` would give.
+
+    output -> str: path of the file to create, or a text file object.
+    eol -> str: end of line character. Default to os.linesep.
+    encoding -> str: encoding used when `output` is a path. Default to utf-8.
+    window_ms -> int: if set, cues ending less than `window_ms` before the
+        start of the latest one are kept in `recent`. Older cues are only
+        on disk.
+    fix_overlaps -> bool: hold each cue until the next one arrives, and
+        trim its end the way SubRipFile.fix_overlaps would. Extra keyword
+        arguments are passed to pysrt.timing.fix_overlapping_subtitles.
+
+    Example:
+        >>> with SubRipWriter('live.srt', window_ms=30000) as writer:
+        ...     for sub in captions:
+        ...         writer.append(sub)
+    """
+
+    def __init__(
+        self,
+        output,
+        eol=None,
+        encoding="utf-8",
+        window_ms=None,
+        fix_overlaps=False,
+        **overlap_options,
+    ):
+        if isinstance(output, (str, os.PathLike)):
+            self.output_file = open(output, "w", encoding=encoding)
+            self._owns_file = True
+        else:
+            self.output_file = output
+            self._owns_file = False
+        self.eol = eol or os.linesep
+        self.encoding = encoding
+        self.window_ms = window_ms
+        self.fix_overlaps = fix_overlaps
+        self.overlap_options = overlap_options
+        self.count = 0
+        self.recent = deque()
+        self._pending = None
+
+    def append(self, item):
+        """
+        append(item)
+
+        Assign the next index to `item` and write it, or hold it until the
+        next cue when fixing overlaps.
+        """
+        self.count += 1
+        item.index = self.count
+
+        if self.window_ms is not None:
+            self.recent.append(item)
+            horizon = item.start - SubRipTime.from_ordinal(self.window_ms)
+            while self.recent and self.recent[0].end < horizon:
+                self.recent.popleft()
+
+        if not self.fix_overlaps:
+            self._write(item)
+            return
+        if self._pending is not None:
+            fix_overlapping_subtitles([self._pending, item], **self.overlap_options)
+            self._write(self._pending)
+        self._pending = item
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def close(self):
+        """Write the cue held for overlap fixing, if any, and close."""
+        if self._pending is not None:
+            self._write(self._pending)
+            self._pending = None
+        if self._owns_file:
+            self.output_file.close()
+        else:
+            self.output_file.flush()
+
+    def _write(self, item):
+        self.output_file.write(SubRipFile._serialize_item(item, self.eol))
+        self.output_file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""Tests for the asyncio API."""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+
+import pysrt
+from pysrt import SubRipFile
+
+FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+STATIC_PATH = os.path.join(FILE_PATH, "tests", "static")
+
+
+async def chunked(data, size):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+class FakeStreamWriter:
+    def __init__(self):
+        self.data = bytearray()
+        self.drains = 0
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        self.drains += 1
+
+
+class TestAOpen(unittest.IsolatedAsyncioTestCase):
+    async def assertSameAsOpen(self, name, **kwargs):
+        path = os.path.join(STATIC_PATH, name)
+        expected = pysrt.open(path, **kwargs)
+        srt_file = await SubRipFile.aopen(path, **kwargs)
+        self.assertEqual(srt_file.encoding, expected.encoding)
+        self.assertEqual(srt_file.eol, expected.eol)
+        self.assertEqual([str(i) for i in srt_file], [str(i) for i in expected])
+
+    async def test_utf8(self):
+        await self.assertSameAsOpen("utf-8.srt")
+
+    async def test_windows1252(self):
+        await self.assertSameAsOpen("windows-1252.srt", encoding="windows-1252")
+        await self.assertSameAsOpen("windows-1252.srt", encoding="auto")
+
+    async def test_bom(self):
+        for name in ("bom-utf-8.srt", "bom-utf-16-be.srt", "bom-utf-32-le.srt"):
+            await self.assertSameAsOpen(name)
+
+    async def test_empty_file(self):
+        srt_file = await SubRipFile.aopen("/dev/null")
+        self.assertEqual(len(srt_file), 0)
+
+    async def test_error_handling(self):
+        with self.assertRaises(pysrt.Error):
+            await SubRipFile.aopen(
+                os.path.join(STATIC_PATH, "invalid.srt"), error_handling=SubRipFile.ERROR_RAISE
+            )
+
+
+class TestAStream(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        with open(os.path.join(STATIC_PATH, "windows-1252.srt"), "rb") as srt_file:
+            self.data = srt_file.read()
+        self.expected = [
+            str(i)
+            for i in pysrt.open(
+                os.path.join(STATIC_PATH, "windows-1252.srt"), encoding="windows-1252"
+            )
+        ]
+
+    async def test_async_iterable(self):
+        for size in (1, 7, 4096):
+            source = chunked(self.data, size)
+            items = [str(i) async for i in SubRipFile.astream(source, encoding="windows-1252")]
+            self.assertEqual(items, self.expected)
+
+    async def test_stream_reader(self):
+        reader = asyncio.StreamReader()
+        reader.feed_data(self.data)
+        reader.feed_eof()
+        items = [str(i) async for i in SubRipFile.astream(reader, encoding="windows-1252")]
+        self.assertEqual(items, self.expected)
+
+    async def test_multibyte_characters_split_across_chunks(self):
+        source = chunked("1\n00:00:01,000 --> 00:00:02,000\nÉté\n".encode("utf-16-le"), 3)
+        items = [i async for i in SubRipFile.astream(source, encoding="utf_16_le")]
+        self.assertEqual(items[0].text, "Été")
+
+
+class TestASave(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file = pysrt.open(
+            os.path.join(STATIC_PATH, "windows-1252.srt"), encoding="windows-1252"
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    async def test_asave(self):
+        path = os.path.join(self.temp_dir, "out.srt")
+        await self.file.asave(path, encoding="utf-8", eol="\n")
+        with open(path, "rb") as saved, open(os.path.join(STATIC_PATH, "utf-8.srt"), "rb") as ref:
+            self.assertEqual(saved.read(), ref.read())
+
+    async def test_awrite_into_stream_writer(self):
+        writer = FakeStreamWriter()
+        await self.file.awrite_into(writer, encoding="utf-16")
+        path = os.path.join(self.temp_dir, "out.srt")
+        self.file.save(path, encoding="utf-16")
+        with open(path, "rb") as saved:
+            self.assertEqual(bytes(writer.data), saved.read())
+        self.assertGreater(writer.drains, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
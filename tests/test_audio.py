@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""Tests for the synchronization against audio."""
+
+import contextlib
+import io
+import os
+import random
+import shutil
+import struct
+import tempfile
+import unittest
+import wave
+
+from pysrt import SubRipFile
+from pysrt.audio import align_to_audio, read_envelope, voice_activity
+from pysrt.commands import SubRipShifter
+
+FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SOURCE = os.path.join(FILE_PATH, "tests", "static", "utf-8.srt")
+RATE = 8000
+UNIT_MS = 10
+
+
+def write_wav(path, srt_file, width=2, channels=1, rate=RATE):
+    """Loud noise during the cues of `srt_file`, faint noise elsewhere."""
+    generator = random.Random(0)
+    peak = 2 ** (8 * width - 1) - 1
+    formats = {1: "B", 2: "h", 4: "i"}
+    unit = rate * UNIT_MS // 1000
+
+    def noise(amplitude):
+        values = [generator.randint(-amplitude, amplitude) for _ in range(unit * channels)]
+        if width == 1:
+            values = [value + 128 for value in values]
+        if width == 3:
+            return b"".join(value.to_bytes(3, "little", signed=True) for value in values)
+        return struct.pack(f"<{len(values)}{formats[width]}", *values)
+
+    loud = [noise(peak // 3) for _ in range(5)]
+    quiet = [noise(peak // 100) for _ in range(5)]
+    speech = bytearray(srt_file[-1].end.ordinal // UNIT_MS + 500)
+    for item in srt_file:
+        first, last = item.start.ordinal // UNIT_MS, item.end.ordinal // UNIT_MS
+        speech[first:last] = b"\x01" * (last - first)
+    with wave.open(path, "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(width)
+        wav_file.setframerate(rate)
+        wav_file.writeframes(
+            b"".join((loud if value else quiet)[i % 5] for i, value in enumerate(speech))
+        )
+
+
+class TestAudio(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.reference = SubRipFile.open(SOURCE).slice(ends_before={"minutes": 4})
+        self.wav = os.path.join(self.temp_dir, "movie.wav")
+        write_wav(self.wav, self.reference)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def out_of_sync(self, ratio, milliseconds):
+        target = SubRipFile(SubRipFile.open(SOURCE).slice(ends_before={"minutes": 4}))
+        target.shift(milliseconds=-milliseconds)
+        target.shift(ratio=1 / ratio)
+        return target
+
+    def test_read_envelope(self):
+        envelope = read_envelope(self.wav, frame_ms=20)
+        duration = self.reference[-1].end.ordinal + 500 * UNIT_MS
+        self.assertEqual(len(envelope), duration // 20)
+        activity = voice_activity(envelope)
+        middle = self.reference[10]
+        self.assertEqual(activity[(middle.start.ordinal + middle.end.ordinal) // 40], 1.0)
+        self.assertEqual(activity[-1], 0.0)
+
+    def test_sample_formats(self):
+        expected = voice_activity(read_envelope(self.wav))
+        for width, channels in ((1, 1), (3, 1), (4, 1), (2, 2)):
+            path = os.path.join(self.temp_dir, f"{width}-{channels}.wav")
+            write_wav(path, self.reference, width=width, channels=channels)
+            activity = voice_activity(read_envelope(path))
+            self.assertEqual(len(activity), len(expected))
+            differences = sum(a != b for a, b in zip(activity, expected))
+            self.assertLess(differences, len(expected) // 100, (width, channels))
+
+    def test_voice_activity(self):
+        self.assertEqual(voice_activity([]), [])
+        self.assertEqual(voice_activity([10.0, 60.0, 12.0, 58.0]), [0.0, 1.0, 0.0, 1.0])
+
+    def test_offset(self):
+        result = align_to_audio(self.out_of_sync(1.0, 2300), self.wav, window=30000)
+        self.assertAlmostEqual(result.ratio, 1.0, places=3)
+        self.assertLessEqual(abs(result.offset - 2300), 40)
+
+    def test_drift(self):
+        target = self.out_of_sync(25 / 23.976, -1200)
+        result = align_to_audio(target, self.wav, window=30000)
+        self.assertAlmostEqual(result.ratio, 25 / 23.976, places=3)
+        self.assertLessEqual(abs(result.offset + 1200), 60)
+        result.apply(target)
+        for item, expected in zip(target, self.reference):
+            self.assertLessEqual(abs(item.start.ordinal - expected.start.ordinal), 80)
+
+    def test_not_a_wav_file(self):
+        with self.assertRaises(ValueError):
+            align_to_audio(self.reference, SOURCE)
+
+    def test_command(self):
+        path = os.path.join(self.temp_dir, "movie.srt")
+        self.out_of_sync(1.0, -1500).save(path)
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            SubRipShifter().run(["-i", "sync", self.wav, path])
+        self.assertIn("Offset -15", stderr.getvalue())
+        synced = SubRipFile.open(path)
+        self.assertLessEqual(abs(synced[5].start.ordinal - self.reference[5].start.ordinal), 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""Tests for batch processing."""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from pysrt import SubRipFile
+from pysrt.batch import find_files, run_batch
+from pysrt.commands import SubRipShifter
+
+FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SOURCE = os.path.join(FILE_PATH, "tests", "static", "utf-8.srt")
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.season = os.path.join(self.temp_dir, "season1")
+        os.makedirs(os.path.join(self.season, "extras"))
+        self.paths = [
+            os.path.join(self.season, "e01.srt"),
+            os.path.join(self.season, "e02.srt"),
+            os.path.join(self.season, "extras", "e03.srt"),
+        ]
+        for path in self.paths:
+            shutil.copy(SOURCE, path)
+        with open(os.path.join(self.season, "notes.txt"), "w") as notes:
+            notes.write("not a subtitle")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_find_files(self):
+        pattern = os.path.join(self.temp_dir, "**", "e0*.srt")
+        self.assertEqual([path for path, _ in find_files([self.season])], self.paths)
+        self.assertEqual(
+            find_files([self.season, pattern, self.paths[0]]),
+            [
+                (self.paths[0], "e01.srt"),
+                (self.paths[1], "e02.srt"),
+                (self.paths[2], os.path.join("extras", "e03.srt")),
+            ],
+        )
+
+    def test_glob_keeps_directories(self):
+        pattern = os.path.join(self.temp_dir, "season1", "**", "e0*.srt")
+        self.assertEqual(
+            [relative_path for _, relative_path in find_files([pattern])],
+            ["e01.srt", "e02.srt", os.path.join("extras", "e03.srt")],
+        )
+
+    def test_output_collisions(self):
+        shutil.copy(SOURCE, os.path.join(self.season, "extras", "e01.srt"))
+        output_dir = os.path.join(self.temp_dir, "out")
+        paths = [self.paths[0], os.path.join(self.season, "extras", "e01.srt")]
+        with self.assertRaises(ValueError):
+            run_batch("shift", paths, {"time_offset": 1000}, output_dir=output_dir)
+        self.assertFalse(os.path.exists(output_dir))
+        pattern = os.path.join(self.season, "**", "e01.srt")
+        summary = run_batch("shift", [pattern], {"time_offset": 1000}, output_dir=output_dir)
+        self.assertEqual(summary["succeeded"], 2)
+        self.assertTrue(os.path.exists(os.path.join(output_dir, "extras", "e01.srt")))
+
+    def test_split_output_dir(self):
+        output_dir = os.path.join(self.temp_dir, "out")
+        records = []
+        run_batch(
+            "split", [self.season], {"limits": ["1m"]}, output_dir=output_dir, report=records.append
+        )
+        record = next(record for record in records if record["path"] == self.paths[2])
+        expected = [os.path.join(output_dir, "extras", f"e03.{part}.srt") for part in (1, 2)]
+        self.assertEqual(record["paths"], expected)
+        self.assertNotIn("output", record)
+        self.assertTrue(all(os.path.exists(path) for path in expected))
+        self.assertEqual(sorted(os.listdir(os.path.join(self.season, "extras"))), ["e03.srt"])
+
+    def test_in_place(self):
+        records = []
+        summary = run_batch(
+            "shift",
+            [self.season],
+            {"time_offset": "1s"},
+            jobs=2,
+            in_place=True,
+            report=records.append,
+        )
+        self.assertEqual(summary["files"], 3)
+        self.assertEqual(summary["succeeded"], 3)
+        self.assertEqual(records[-1], summary)
+        self.assertEqual({record["path"] for record in records[:-1]}, set(self.paths))
+        for path in self.paths:
+            self.assertTrue(os.path.exists(path + ".bak"))
+            self.assertEqual(SubRipFile.open(path)[0].start.ordinal, 2000)
+
+    def test_output_dir(self):
+        output_dir = os.path.join(self.temp_dir, "out")
+        run_batch("rate", [self.season], {"initial": 25, "final": 50}, output_dir=output_dir)
+        output_path = os.path.join(output_dir, "extras", "e03.srt")
+        self.assertEqual(SubRipFile.open(output_path)[0].end.ordinal, 8000)
+        self.assertEqual(SubRipFile.open(self.paths[2])[0].end.ordinal, 4000)
+
+    def test_processes(self):
+        summary = run_batch("validate", [self.season], jobs=2, processes=True)
+        self.assertEqual(summary["succeeded"], 3)
+        self.assertEqual(summary["invalid"], 3)
+
+    def test_error_isolation(self):
+        with open(self.paths[1], "wb") as broken:
+            broken.write(b"\xff\xfe\x00")  # utf-16 BOM followed by half a character
+        records = []
+        summary = run_batch(
+            "shift", [self.season], {"time_offset": 1000}, in_place=True, report=records.append
+        )
+        self.assertEqual((summary["succeeded"], summary["failed"]), (2, 1))
+        failure = next(record for record in records if not record.get("ok", True))
+        self.assertEqual(failure["path"], self.paths[1])
+        self.assertIn("error", failure)
+
+    def test_requires_destination(self):
+        with self.assertRaises(ValueError):
+            run_batch("shift", [self.season], {"time_offset": 1000})
+
+    def test_command(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            SubRipShifter().run(["-i", "batch", "-j", "2", "shift", "-1s", self.season])
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(records[-1]["event"], "summary")
+        self.assertEqual(records[-1]["succeeded"], 3)
+        self.assertEqual(SubRipFile.open(self.paths[0])[0].start.ordinal, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
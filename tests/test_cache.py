@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""Tests for the on-disk parse cache."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pysrt
+from pysrt import SubRipFile
+from pysrt.cache import ParseCache
+
+FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, "cache")
+        self.path = os.path.join(self.temp_dir, "movie.srt")
+        shutil.copy(os.path.join(FILE_PATH, "tests", "static", "windows-1252.srt"), self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _entries(self):
+        return [name for name in os.listdir(self.cache_dir) if name.endswith(ParseCache.SUFFIX)]
+
+    def test_round_trip(self):
+        original = pysrt.open(self.path, encoding="windows-1252", cache=self.cache_dir)
+        self.assertEqual(len(self._entries()), 1)
+        with mock.patch.object(SubRipFile, "read", side_effect=AssertionError("re-parsed")):
+            cached = pysrt.open(self.path, encoding="windows-1252", cache=self.cache_dir)
+        self.assertEqual(cached.encoding, "windows-1252")
+        self.assertEqual(cached.eol, "\r\n")
+        self.assertEqual(cached.path, self.path)
+        self.assertEqual([str(i) for i in cached], [str(i) for i in original])
+
+    def test_encoding_is_part_of_key(self):
+        cache = ParseCache(self.cache_dir)
+        pysrt.open(self.path, encoding="windows-1252", cache=cache)
+        pysrt.open(self.path, encoding="latin-1", cache=cache)
+        self.assertEqual(len(self._entries()), 2)
+
+    def test_modified_file_is_reparsed(self):
+        cache = ParseCache(self.cache_dir)
+        pysrt.open(self.path, encoding="windows-1252", cache=cache)
+        with open(self.path, "ab") as srt_file:
+            srt_file.write(b"\r\n9999\r\n01:00:00,000 --> 01:00:01,000\r\nBye\r\n")
+        srt_file = pysrt.open(self.path, encoding="windows-1252", cache=cache)
+        self.assertEqual(srt_file[-1].text, "Bye")
+        self.assertEqual(len(self._entries()), 2)
+
+    def test_corrupted_entry_is_a_miss(self):
+        cache = ParseCache(self.cache_dir)
+        pysrt.open(self.path, encoding="windows-1252", cache=cache)
+        for name in self._entries():
+            with open(os.path.join(self.cache_dir, name), "wb") as entry:
+                entry.write(b"garbage")
+        self.assertEqual(len(pysrt.open(self.path, encoding="windows-1252", cache=cache)), 1332)
+
+    def test_lru_eviction(self):
+        cache = ParseCache(self.cache_dir, max_size=1)
+        pysrt.open(self.path, encoding="windows-1252", cache=cache)
+        self.assertEqual(self._entries(), [])
+
+        cache = ParseCache(self.cache_dir)
+        pysrt.open(self.path, encoding="windows-1252", cache=cache)
+        pysrt.open(self.path, encoding="latin-1", cache=cache)
+        recent_entry = cache.key(self.path, "windows-1252") + ParseCache.SUFFIX
+        old_entry = cache.key(self.path, "latin-1") + ParseCache.SUFFIX
+        os.utime(os.path.join(self.cache_dir, old_entry), (0, 0))
+        cache.evict(target_size=os.path.getsize(os.path.join(self.cache_dir, recent_entry)))
+        self.assertEqual(self._entries(), [recent_entry])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+"""Tests for the SQLite catalog."""
+
+import contextlib
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from pysrt import SubRipFile, SubRipItem
+from pysrt.catalog import SubRipCatalog
+from pysrt.commands import SubRipShifter
+
+FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+STATIC = os.path.join(FILE_PATH, "tests", "static")
+SOURCE = os.path.join(STATIC, "utf-8.srt")
+
+
+class TestSubRipCatalog(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.library = os.path.join(self.temp_dir, "library")
+        os.makedirs(os.path.join(self.library, "Show X"))
+        os.makedirs(os.path.join(self.library, "Show Y"))
+        self.show_x = os.path.join(self.library, "Show X", "e01.srt")
+        shutil.copy(SOURCE, self.show_x)
+        self.show_y = os.path.join(self.library, "Show Y", "e01.srt.gz")
+        with open(SOURCE, "rb") as source, gzip.open(self.show_y, "wb") as compressed:
+            compressed.write(source.read())
+        self.database = os.path.join(self.temp_dir, "library.db")
+        self.catalog = SubRipCatalog(self.database)
+        self.reference = SubRipFile.open(SOURCE)
+
+    def tearDown(self):
+        self.catalog.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_ingest_and_open(self):
+        summary = self.catalog.ingest([self.library])
+        self.assertEqual((summary["files"], summary["added"]), (2, 2))
+        srt_file = self.catalog.open(self.show_x)
+        self.assertEqual(srt_file, self.reference)
+        self.assertEqual([item.text for item in srt_file], [item.text for item in self.reference])
+        self.assertEqual(srt_file.eol, self.reference.eol)
+        self.assertEqual(srt_file.encoding, self.reference.encoding)
+        self.assertEqual([info["cue_count"] for info in self.catalog.files()], [1332, 1332])
+        self.assertRaises(KeyError, self.catalog.open, "missing.srt")
+
+    def test_incremental_ingest(self):
+        records = []
+        self.catalog.ingest([self.library])
+        self.catalog.ingest([self.library], report=records.append)
+        self.assertEqual([record["status"] for record in records[:-1]], ["unchanged"] * 2)
+
+        os.utime(self.show_x, ns=(0, 0))  # touched, but same content
+        self.assertEqual(self.catalog.ingest([self.library])["unchanged"], 2)
+
+        shifted = SubRipFile.open(self.show_x)
+        shifted.shift(seconds=1)
+        shifted.save(self.show_x)
+        summary = self.catalog.ingest([self.library])
+        self.assertEqual((summary["updated"], summary["unchanged"]), (1, 1))
+        self.assertEqual(self.catalog.open(self.show_x)[0].start.seconds, 2)
+        self.assertEqual(len(self.catalog.query("evenements", path="*/Show X/*")[0]), 2)
+
+        self.assertEqual(self.catalog.ingest([self.library], force=True)["updated"], 2)
+
+    def test_failures_are_reported(self):
+        broken = os.path.join(self.library, "broken.srt")
+        with open(broken, "wb") as broken_file:
+            broken_file.write(b"\xff\xfe\x00")
+        summary = self.catalog.ingest([broken], encoding="utf-8")
+        self.assertEqual(summary["failed"], 1)
+
+    def test_query(self):
+        self.catalog.ingest([self.library])
+        expected = [item for item in self.reference if "événements" in item.text.lower()]
+        results = self.catalog.query("Evenements")
+        self.assertEqual([srt_file.path for srt_file in results], [self.show_x, self.show_y])
+        self.assertEqual(list(results[0]), expected)
+        self.assertTrue(all(isinstance(item, SubRipItem) for item in results[0]))
+
+        results = self.catalog.query("evenem*", path="*/Show X/*", start={"seconds": 31})
+        expected = self.reference.search_index().search("evenem*")[1:]
+        self.assertEqual(list(results[0]), expected)
+        results = self.catalog.query(path="*/Show Y/*", start={"minutes": 1}, end={"minutes": 2})
+        self.assertEqual(
+            list(results[0]),
+            list(self.reference.slice(ends_after={"minutes": 1}, starts_before={"minutes": 2})),
+        )
+        self.assertEqual(len(self.catalog.query("qui ont existé")[0]), 1)
+        self.assertEqual(self.catalog.query("existé qui ont"), [])
+        results = self.catalog.query(match="evenements NOT noms")
+        self.assertEqual([[item.index for item in srt_file] for srt_file in results], [[1], [1]])
+        self.assertEqual(len(self.catalog.query(limit=5)[0]), 5)
+
+    def test_add_and_remove(self):
+        srt_file = SubRipFile(
+            items=[SubRipItem(1, 0, 1000, "<i>Police!</i>"), SubRipItem(2, 1000, 2000, "a<br>car")],
+            path="a.srt",
+        )
+        self.catalog.add(srt_file)
+        self.assertEqual(self.catalog.query("police")[0][0].text, "<i>Police!</i>")
+        self.assertEqual(self.catalog.query("i"), [])
+        self.assertEqual(self.catalog.query("car")[0][0].text, "a<br>car")
+        self.assertEqual(len(self.catalog.query("a<br/>car")[0]), 1)
+        self.assertTrue(self.catalog.remove("a.srt"))
+        self.assertFalse(self.catalog.remove("a.srt"))
+        self.assertEqual(self.catalog.query("police"), [])
+
+    def test_missing_index(self):
+        srt_file = SubRipFile(
+            items=[SubRipItem(None, 0, 1000, "Police!"), SubRipItem("A", 1000, 2000, "car")],
+            path="a.srt",
+        )
+        self.catalog.add(srt_file)
+        self.assertEqual([item.index for item in self.catalog.query()[0]], [None, "A"])
+        self.assertEqual(
+            self.catalog.connection.execute(
+                "SELECT count(*) FROM cues WHERE idx IS NULL"
+            ).fetchone(),
+            (1,),
+        )
+
+    def run_command(self, *args):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            try:
+                SubRipShifter().run(list(args))
+            except SystemExit as exit:
+                return exit.code, output.getvalue()
+        return 0, output.getvalue()
+
+    def test_commands(self):
+        self.catalog.close()
+        status, output = self.run_command("index", self.database, self.library)
+        self.assertEqual(status, 0)
+        self.assertEqual(json.loads(output.splitlines()[-1])["added"], 2)
+
+        status, output = self.run_command(
+            "query", self.database, "télé", "--path", "*/Show X/*", "--end", "1m10s"
+        )
+        self.assertEqual(status, 0)
+        self.assertEqual(output.splitlines()[0], f"==> {self.show_x} <==")
+        self.assertIn("00:00:59,272 --> 00:01:03,003", output)
+
+        status, output = self.run_command("query", self.database, "evenements", "--json")
+        self.assertEqual(len(output.splitlines()), 4)
+        self.assertEqual(json.loads(output.splitlines()[0])["start"], "00:00:27,074")
+
+        status, output = self.run_command("query", self.database, "zzzz")
+        self.assertEqual((status, output), (1, ""))
+        self.catalog = SubRipCatalog(self.database)
+
+
+if __name__ == "__main__":
+    unittest.main()
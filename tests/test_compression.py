@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+"""Tests for compressed and archived subtitle files."""
+
+import bz2
+import contextlib
+import gzip
+import io
+import lzma
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+import zipfile
+
+import pysrt
+from pysrt import SubRipFile
+from pysrt.commands import SubRipShifter
+from pysrt.compression import detect_compression, open_binary, strip_compression_extension
+
+FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+STATIC = os.path.join(FILE_PATH, "tests", "static")
+
+
+def read_static(name):
+    with open(os.path.join(STATIC, name), "rb") as static_file:
+        return static_file.read()
+
+
+class TestCompressedFiles(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.reference = SubRipFile.open(os.path.join(STATIC, "utf-8.srt"))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, name, data):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "wb") as output_file:
+            output_file.write(data)
+        return path
+
+    def test_detect_compression(self):
+        self.assertEqual(detect_compression("movie.srt.gz"), "gzip")
+        self.assertEqual(detect_compression("movie.SRT.XZ"), "xz")
+        self.assertEqual(detect_compression("movie.srt"), None)
+        path = self.write("download", bz2.compress(b"1\n"))
+        self.assertEqual(detect_compression(path), "bz2")
+        self.assertEqual(strip_compression_extension("movie.srt.bz2"), "movie.srt")
+
+    def test_open(self):
+        data = read_static("utf-8.srt")
+        for name, compress in (
+            ("movie.srt.gz", gzip.compress),
+            ("movie.srt.bz2", bz2.compress),
+            ("movie.srt.xz", lzma.compress),
+            ("movie.bin", gzip.compress),
+        ):
+            srt_file = SubRipFile.open(self.write(name, compress(data)))
+            self.assertEqual(srt_file, self.reference, name)
+            self.assertEqual(srt_file.eol, self.reference.eol)
+
+    def test_encoding_detection_on_decompressed_data(self):
+        path = self.write("bom.srt.gz", gzip.compress(read_static("bom-utf-16-le.srt")))
+        srt_file = SubRipFile.open(path)
+        self.assertEqual(srt_file.encoding, "utf_16_le")
+        self.assertFalse(srt_file[0].text.startswith("\ufeff"))
+
+        path = self.write("latin.srt.xz", lzma.compress(read_static("windows-1252.srt")))
+        srt_file = SubRipFile.open(path, encoding=SubRipFile.AUTO_ENCODING)
+        self.assertNotEqual(srt_file.encoding, "utf_8")
+        self.assertEqual(len(srt_file), 1332)
+
+    def test_save(self):
+        path = os.path.join(self.temp_dir, "saved.srt.gz")
+        self.reference.save(path)
+        with gzip.open(path, "rb") as saved_file:
+            self.assertEqual(saved_file.read(), read_static("utf-8.srt"))
+        self.assertEqual(SubRipFile.open(path), self.reference)
+
+    def test_command_in_place(self):
+        path = self.write("movie.srt.gz", gzip.compress(read_static("utf-8.srt")))
+        SubRipShifter().run(["-i", "shift", "1s", path])
+        self.assertEqual(detect_compression(path + ".bak"), "gzip")
+        with open_binary(path) as shifted_file:
+            self.assertEqual(next(SubRipFile.stream_bytes(shifted_file)).start.seconds, 2)
+
+    def test_command_split(self):
+        path = self.write("movie.srt.gz", gzip.compress(read_static("utf-8.srt")))
+        with contextlib.redirect_stdout(io.StringIO()):
+            SubRipShifter().run(["split", "1m", path])
+        parts = [os.path.join(self.temp_dir, f"movie.{part}.srt.gz") for part in (1, 2)]
+        self.assertEqual([detect_compression(part) for part in parts], ["gzip", "gzip"])
+        self.assertEqual(SubRipFile.open(parts[0])[0], self.reference[0])
+
+
+class TestArchives(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.members = {
+            "season1/e01.srt": read_static("utf-8.srt"),
+            "season1/e02.srt": read_static("bom-utf-16-be.srt"),
+            "season1/README.txt": b"not a subtitle",
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def check(self, path):
+        members = list(pysrt.iter_archive(path))
+        self.assertEqual([name for name, _ in members], ["season1/e01.srt", "season1/e02.srt"])
+        self.assertEqual([len(srt_file) for _, srt_file in members], [1332, 7])
+        self.assertEqual(members[1][1].encoding, "utf_16_be")
+        self.assertEqual(members[0][1].path, "season1/e01.srt")
+
+    def test_zip(self):
+        path = os.path.join(self.temp_dir, "dump.zip")
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for name, data in self.members.items():
+                archive.writestr(name, data)
+        self.check(path)
+
+    def test_compressed_tar(self):
+        for mode in ("w", "w:gz", "w:xz"):
+            path = os.path.join(self.temp_dir, "dump.tar")
+            with tarfile.open(path, mode) as archive:
+                for name, data in self.members.items():
+                    info = tarfile.TarInfo(name)
+                    info.size = len(data)
+                    archive.addfile(info, io.BytesIO(data))
+            self.check(path)
+
+    def test_pattern(self):
+        path = os.path.join(self.temp_dir, "dump.zip")
+        with zipfile.ZipFile(path, "w") as archive:
+            for name, data in self.members.items():
+                archive.writestr(name, data)
+        names = [name for name, _ in SubRipFile.iter_archive(path, pattern="*02.SRT")]
+        self.assertEqual(names, ["season1/e02.srt"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""Tests for input encoding detection."""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pysrt
+from pysrt import encoding
+from pysrt.commands import SubRipShifter
+
+FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestDetectEncoding(unittest.TestCase):
+    def setUp(self):
+        self.static_path = os.path.join(FILE_PATH, "tests", "static")
+        self.utf8_path = os.path.join(self.static_path, "utf-8.srt")
+        self.windows_path = os.path.join(self.static_path, "windows-1252.srt")
+        encoding.clear_cache()
+
+    def test_utf8_fast_path(self):
+        self.assertEqual(encoding.detect_encoding(self.utf8_path), "utf_8")
+
+    def test_bom(self):
+        path = os.path.join(self.static_path, "bom-utf-16-le.srt")
+        self.assertEqual(encoding.detect_encoding(path), "utf_16_le")
+
+    def test_chardet_fallback(self):
+        detected = encoding.detect_encoding(self.windows_path)
+        self.assertNotEqual(detected, "utf_8")
+        self.assertEqual(
+            open(self.windows_path, encoding=detected).read(),
+            open(self.windows_path, encoding="windows-1252").read(),
+        )
+
+    def test_chardet_threshold(self):
+        with open(self.windows_path, "rb") as windows_file:
+            data = windows_file.read()
+        self.assertGreater(len(data), encoding.CHUNK_SIZE)
+        source_file = io.BytesIO(data)
+        self.assertTrue(encoding._chardet_detect(source_file, len(data), threshold=0.0))
+        self.assertEqual(source_file.tell(), encoding.CHUNK_SIZE)
+        source_file = io.BytesIO(data)
+        detected = encoding._chardet_detect(source_file, len(data), threshold=1.0)
+        self.assertEqual(source_file.tell(), len(data))
+        self.assertEqual(encoding.detect_encoding(self.windows_path, threshold=0.0), detected)
+
+    def test_incremental_chardet_threshold(self):
+        class Prober:
+            def get_confidence(self):
+                return 0.95
+
+        class Detector:  # chardet < 7, whose probers run as they are fed
+            charset_probers = [Prober()]
+            done = False
+            result = {"encoding": "ISO-8859-1", "confidence": 0.95}
+
+            def feed(self, chunk):
+                pass
+
+            def close(self):
+                pass
+
+        source_file = io.BytesIO(b"\xe9" * encoding.CHUNK_SIZE * 3)
+        with mock.patch("chardet.UniversalDetector", Detector):
+            self.assertEqual(encoding._chardet_detect(source_file, 10**6, 0.9), "iso_8859_1")
+        self.assertEqual(source_file.tell(), encoding.CHUNK_SIZE)
+
+    def test_threshold_by_default(self):
+        with mock.patch.object(
+            encoding, "_chardet_detect", wraps=encoding._chardet_detect
+        ) as chardet_detect:
+            pysrt.SubRipFile.open(self.windows_path, encoding=pysrt.SubRipFile.AUTO_ENCODING)
+        self.assertEqual(chardet_detect.call_args.args[2], encoding.CONFIDENCE_THRESHOLD)
+
+    def test_command_normalize_encoding(self):
+        self.assertEqual(SubRipShifter().normalize_encoding("UTF-8"), "utf_8")
+
+    def test_cache_by_file_identity(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, "movie.srt")
+            shutil.copy(self.utf8_path, path)
+            encoding.detect_encoding(path)
+            encoding.detect_encoding(path)
+            self.assertEqual(encoding._detect_encoding.cache_info().hits, 1)
+
+            shutil.copy(self.windows_path, path)
+            os.utime(path, ns=(0, 0))
+            self.assertNotEqual(encoding.detect_encoding(path), "utf_8")
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+class TestOpenAuto(unittest.TestCase):
+    def setUp(self):
+        self.static_path = os.path.join(FILE_PATH, "tests", "static")
+
+    def test_utf8(self):
+        srt_file = pysrt.open(os.path.join(self.static_path, "utf-8.srt"), encoding="auto")
+        self.assertEqual(srt_file.encoding, "utf_8")
+        self.assertEqual(len(srt_file), 1332)
+
+    def test_windows1252(self):
+        path = os.path.join(self.static_path, "windows-1252.srt")
+        self.assertEqual(len(pysrt.open(path, encoding="auto")), 1332)
+
+    def test_bom(self):
+        srt_file = pysrt.open(os.path.join(self.static_path, "bom-utf-8.srt"), encoding="auto")
+        self.assertEqual(srt_file[0].index, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
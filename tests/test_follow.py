@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Tests for following growing files."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from pysrt import SubRipFile
+from pysrt.follow import SubRipFollower
+
+CUE = "{0}\n00:00:0{0},000 --> 00:00:0{0},500\nCue {0}\n\n"
+
+
+class TestSubRipFollower(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "live.srt")
+        self.write("", mode="w")
+        self.follower = SubRipFollower(self.path)
+
+    def tearDown(self):
+        self.follower.close()
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, text, mode="a"):
+        with open(self.path, mode, encoding="utf-8") as live_file:
+            live_file.write(text)
+
+    def texts(self):
+        return [item.text for item in self.follower.poll()]
+
+    def test_only_completed_cues(self):
+        self.write(CUE.format(1) + CUE.format(2)[:20])
+        self.assertEqual(self.texts(), ["Cue 1"])
+        self.assertEqual(self.texts(), [])
+        self.write(CUE.format(2)[20:])
+        self.assertEqual(self.texts(), ["Cue 2"])
+        self.assertEqual(self.follower.offset, os.path.getsize(self.path))
+
+    def test_multibyte_character_split_across_polls(self):
+        data = "1\n00:00:01,000 --> 00:00:02,000\nÉté\n\n".encode()
+        with open(self.path, "ab") as live_file:
+            live_file.write(data[:33])
+        self.assertEqual(self.texts(), [])
+        with open(self.path, "ab") as live_file:
+            live_file.write(data[33:])
+        self.assertEqual(self.texts(), ["Été"])
+
+    def test_truncation(self):
+        self.write(CUE.format(1) + CUE.format(2))
+        self.assertEqual(self.texts(), ["Cue 1", "Cue 2"])
+        self.write(CUE.format(3), mode="w")
+        self.assertEqual(self.texts(), ["Cue 3"])
+
+    def test_rotation(self):
+        self.write(CUE.format(1))
+        self.assertEqual(self.texts(), ["Cue 1"])
+        self.write(CUE.format(2).rstrip())
+        os.rename(self.path, self.path + ".1")
+        self.assertEqual(self.texts(), [])
+        self.write(CUE.format(3), mode="w")
+        self.assertEqual(self.texts(), ["Cue 2", "Cue 3"])
+
+    def test_follow(self):
+        self.write(CUE.format(1) + CUE.format(2))
+        items = SubRipFile.follow(self.path, interval=0.01, idle_timeout=0.05)
+        self.assertEqual([item.text for item in items], ["Cue 1", "Cue 2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""Tests for srt grep."""
+
+import contextlib
+import gzip
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from pysrt import SubRipFile
+from pysrt.commands import SubRipShifter
+from pysrt.grep import grep_file, is_literal, run_grep
+
+FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+STATIC = os.path.join(FILE_PATH, "tests", "static")
+SOURCE = os.path.join(STATIC, "utf-8.srt")
+
+
+class TestGrep(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.paths = [os.path.join(self.temp_dir, name) for name in ("a.srt", "b.srt.gz")]
+        shutil.copy(SOURCE, self.paths[0])
+        with open(SOURCE, "rb") as source, gzip.open(self.paths[1], "wb") as compressed:
+            compressed.write(source.read())
+        self.latin = os.path.join(self.temp_dir, "c.srt")
+        with open(os.path.join(STATIC, "windows-1252.srt"), "rb") as source:
+            with open(self.latin, "wb") as latin:
+                latin.write(source.read())
+        self.reference = SubRipFile.open(SOURCE)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_is_literal(self):
+        self.assertTrue(is_literal("Ron Burgundy!"))
+        self.assertFalse(is_literal("Ron|Burgundy"))
+
+    def test_grep_file(self):
+        expected = [item for item in self.reference if "télé" in item.text]
+        record = grep_file(self.paths[0], "télé")
+        self.assertEqual(record["matches"], expected)
+        self.assertFalse(record["skipped"])
+        expected = [item for item in self.reference if re.search(r"\bt.l.\b", item.text)]
+        self.assertEqual(grep_file(self.paths[1], r"\bt.l.\b")["matches"], expected)
+
+    def test_options(self):
+        self.assertEqual(len(grep_file(self.paths[0], "TÉLÉ", ignore_case=True)["matches"]), 6)
+        self.assertEqual(grep_file(self.paths[0], "^QUI ONT")["matches"][0].index, 1)
+        self.assertEqual(grep_file(self.paths[0], "ÉVÉNEMENTS QUI")["matches"], [])
+        record = grep_file(self.paths[0], "ÉVÉNEMENTS QUI", join_lines=True)
+        self.assertEqual([item.index for item in record["matches"]], [1])
+        self.assertEqual(len(grep_file(self.paths[0], "a.b", fixed_strings=True)["matches"]), 0)
+
+    def test_tags(self):
+        path = os.path.join(self.temp_dir, "tags.srt")
+        SubRipFile.from_string("1\n00:00:01,000 --> 00:00:02,000\n<i>Hel</i>lo\n").save(path)
+        self.assertEqual(grep_file(path, "Hello")["matches"], [])
+        self.assertEqual(len(grep_file(path, "Hello", strip_tags=True)["matches"]), 1)
+
+    def test_prefilter(self):
+        record = grep_file(self.paths[0], "Xylophone")
+        self.assertEqual((record["matches"], record["skipped"]), ([], True))
+        self.assertTrue(grep_file(self.paths[0], "burgundy", ignore_case=True)["matches"])
+        # The pre-filter must not skip files in other encodings.
+        self.assertTrue(grep_file(self.latin, "télé")["matches"])
+        self.assertTrue(grep_file(self.latin, "Burgundy")["matches"])
+        utf16 = os.path.join(STATIC, "bom-utf-16-be.srt")
+        text = SubRipFile.open(utf16)[0].text.split()[0]
+        self.assertTrue(grep_file(utf16, text)["matches"])
+
+    def test_small_chunks(self):
+        # Needles and characters split between chunks are still found.
+        expected = [
+            [item.index for item in grep_file(path, "Burgundy")["matches"]]
+            for path in (self.paths[0], self.latin)
+        ]
+        with mock.patch("pysrt.grep.CHUNK_SIZE", 5):
+            for path, indexes in zip((self.paths[0], self.latin), expected):
+                record = grep_file(path, "Burgundy")
+                self.assertEqual([item.index for item in record["matches"]], indexes)
+            record = grep_file(self.paths[0], "télé")
+            self.assertEqual(len(record["matches"]), 6)
+            self.assertTrue(grep_file(self.paths[0], "Xylophone")["skipped"])
+
+    def test_run_grep(self):
+        for jobs in (1, 2):
+            records = list(run_grep("télé", [self.temp_dir], jobs=jobs))
+            self.assertEqual([record["path"] for record in records], self.paths + [self.latin])
+            self.assertEqual([len(record["matches"]) for record in records], [6, 6, 6])
+
+    def test_errors_are_reported(self):
+        record = grep_file(self.latin, "t.l.", encoding="utf-8")
+        self.assertIn("UnicodeDecodeError", record["error"])
+
+    def run_command(self, *args):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            try:
+                SubRipShifter().run(list(args))
+            except SystemExit as exit:
+                return exit.code, output.getvalue()
+        return 0, output.getvalue()
+
+    def test_command(self):
+        status, output = self.run_command("grep", "-j", "2", "Burgundy à", self.paths[0])
+        self.assertEqual(status, 0)
+        self.assertEqual(
+            output,
+            f"{self.paths[0]}:56:00:04:22,776 --> 00:04:26,143:"
+            "Fermez vos gueules! / Y a Ron Burgundy à la télé!\n",
+        )
+
+        status, output = self.run_command("grep", "--json", "Burgundy à", self.paths[1])
+        record = json.loads(output)
+        self.assertEqual((record["index"], record["start"]), (56, "00:04:22,776"))
+
+        status, output = self.run_command("grep", "-c", "télé", self.temp_dir)
+        self.assertEqual(output.splitlines(), [f"{path}:6" for path in self.paths + [self.latin]])
+
+        status, output = self.run_command("grep", "-l", "--json", "télé", self.paths[0])
+        self.assertEqual(json.loads(output), {"path": self.paths[0]})
+
+        self.assertEqual(self.run_command("grep", "Xylophone", self.temp_dir), (1, ""))
+        self.assertEqual(self.run_command("grep", "(", self.temp_dir)[0], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""Tests for the line breaking of subtitle texts."""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from pysrt import SubRipFile, SubRipItem
+from pysrt.commands import SubRipShifter
+from pysrt.linebreak import break_penalty, break_text, words
+
+FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestWords(unittest.TestCase):
+    def test_tags_have_no_width(self):
+        self.assertEqual(
+            words('<i>Hello</i> <font color="red">world</font>'),
+            [("<i>Hello</i>", "Hello", False), ('<font color="red">world</font>', "world", False)],
+        )
+        self.assertEqual(words("{\\an8}Up"), [("{\\an8}Up", "Up", False)])
+
+    def test_lone_tags_and_dashes_stick_to_the_next_word(self):
+        self.assertEqual(words("<i> Hello"), [("<i> Hello", " Hello", False)])
+        self.assertEqual(words("- Hello"), [("- Hello", "- Hello", False)])
+
+    def test_dialogue_lines_are_forced(self):
+        self.assertEqual(
+            words("- Yes?\nNo.\n<i>- Maybe.</i>"),
+            [
+                ("- Yes?", "- Yes?", False),
+                ("No.", "No.", False),
+                ("<i>- Maybe.</i>", "- Maybe.", True),
+            ],
+        )
+
+    def test_break_penalty(self):
+        self.assertLess(break_penalty("end."), break_penalty("clause,"))
+        self.assertLess(break_penalty('said,"'), break_penalty("word"))
+
+
+class TestBreakText(unittest.TestCase):
+    def test_short_text_is_one_line(self):
+        self.assertEqual(break_text("Short\none.", 42), "Short one.")
+
+    def test_lines_are_balanced(self):
+        self.assertEqual(
+            break_text("This is a fairly long subtitle line that should be balanced nicely", 42),
+            "This is a fairly long subtitle\nline that should be balanced nicely",
+        )
+
+    def test_punctuation_is_preferred(self):
+        self.assertEqual(
+            break_text("We have to go now. They are coming back for us tonight", 42),
+            "We have to go now.\nThey are coming back for us tonight",
+        )
+
+    def test_tags_are_kept_whole(self):
+        text = '<font color="#ffffff">I told you, he never came back from the war.</font>'
+        self.assertEqual(
+            break_text(text, 32),
+            '<font color="#ffffff">I told you, he never\ncame back from the war.</font>',
+        )
+
+    def test_dialogue(self):
+        self.assertEqual(
+            break_text("- Are you coming? - No.\n- I am staying home.", 42),
+            "- Are you coming? - No.\n- I am staying home.",
+        )
+
+    def test_max_lines(self):
+        text = "one two three four five six seven eight nine ten eleven twelve"
+        lines = break_text(text, 20).splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(max(map(len, lines)), 33)
+        lines = break_text(text, 20, max_lines=0).splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(all(len(line) <= 20 for line in lines))
+
+    def test_long_words(self):
+        self.assertEqual(
+            break_text("Supercalifragilistic indeed", 10), "Supercalifragilistic\nindeed"
+        )
+        self.assertEqual(break_text("", 10), "")
+
+
+class TestBreakLines(unittest.TestCase):
+    def setUp(self):
+        self.subs = SubRipFile.open(os.path.join(FILE_PATH, "tests", "static", "utf-8.srt"))
+
+    def test_break_lines(self):
+        self.assertIs(self.subs.break_lines(32), self.subs)
+        for item in self.subs:
+            lines = item.text_without_tags.splitlines()
+            self.assertLessEqual(len(lines), 2)
+            if len(item.text_without_tags) <= 32 and not item.text.startswith("-"):
+                self.assertEqual(len(lines), 1)
+
+    def test_command(self):
+        path = os.path.join(tempfile.mkdtemp(), "break.srt")
+        text = "<i>I told you, he never came back from the war.</i>"
+        SubRipFile([SubRipItem(1, 0, 1000, text)]).save(path)
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            SubRipShifter().run(["break", "32", path])
+        self.assertIn("<i>I told you, he never\ncame back from the war.</i>", output.getvalue())
+
+    def test_command_max_lines(self):
+        path = os.path.join(tempfile.mkdtemp(), "break.srt")
+        text = "one two three four five six seven eight nine ten eleven twelve"
+        SubRipFile([SubRipItem(1, 0, 1000, text)]).save(path)
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        for arguments, line_count, longest in (([], 4, 17), (["--max-lines", "2"], 2, 33)):
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                SubRipShifter().run(["break", *arguments, "20", path])
+            lines = SubRipFile.from_string(output.getvalue())[0].text.splitlines()
+            self.assertEqual(len(lines), line_count)
+            self.assertEqual(max(map(len, lines)), longest)
+
+
+if __name__ == "__main__":
+    unittest.main()
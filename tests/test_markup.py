@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""Tests for the markup of subtitle texts."""
+
+import pickle
+import unittest
+
+from pysrt import SubRipItem
+from pysrt.markup import CLOSE, OPEN, STANDALONE, TEXT, Markup, Token, strip_tags, tokenize
+
+TEXT_WITH_TAGS = '{\\an8}<font color="#ff0000">Red</font> and <i>italic <b>bold</b></i><br/>\nend'
+
+
+class TestTokenize(unittest.TestCase):
+    def test_tokens(self):
+        self.assertEqual(
+            tokenize("<I>Hello</i> {\\an8}<br/>"),
+            [
+                Token(OPEN, "<I>", "i"),
+                Token(TEXT, "Hello", ""),
+                Token(CLOSE, "</i>", "i"),
+                Token(TEXT, " ", ""),
+                Token(STANDALONE, "{\\an8}", ""),
+                Token(STANDALONE, "<br/>", "br"),
+            ],
+        )
+
+    def test_round_trip(self):
+        self.assertEqual("".join(token.text for token in tokenize(TEXT_WITH_TAGS)), TEXT_WITH_TAGS)
+        self.assertEqual(tokenize(""), [])
+
+    def test_strip_tags(self):
+        self.assertEqual(strip_tags(TEXT_WITH_TAGS), "Red and italic bold\nend")
+        self.assertEqual(strip_tags("1 < 2 > 0"), "1  0")
+        self.assertEqual(strip_tags("police<br>car", " "), "police car")
+
+
+class TestMarkup(unittest.TestCase):
+    def setUp(self):
+        self.markup = Markup(TEXT_WITH_TAGS)
+
+    def test_plain_text(self):
+        self.assertEqual(self.markup.plain_text, "Red and italic bold\nend")
+        self.assertEqual(self.markup.visible_length, 22)
+        self.assertEqual(str(self.markup), TEXT_WITH_TAGS)
+
+    def test_slice(self):
+        self.assertEqual(self.markup.slice(0, 3), '{\\an8}<font color="#ff0000">Red</font>')
+        self.assertEqual(self.markup.slice(8, 17), "{\\an8}<i>italic <b>bo</b></i>")
+        self.assertEqual(self.markup.slice(15), "{\\an8}<i><b>bold</b></i><br/>\nend")
+        self.assertEqual(self.markup.slice(-3), "{\\an8}<br/>end")
+        self.assertEqual(self.markup.slice(), TEXT_WITH_TAGS)
+
+    def test_slice_unbalanced(self):
+        markup = Markup("<i>open</b> close</i> stray</u>")
+        self.assertEqual(markup.slice(0, 4), "<i>open</b></i>")
+        self.assertEqual(markup.slice(2), "<i>en</b> close</i> stray</u>")
+
+
+class TestItemMarkup(unittest.TestCase):
+    def test_cached_until_text_is_set(self):
+        item = SubRipItem(1, text="<i>Hello</i>")
+        markup = item.markup
+        self.assertIs(item.markup, markup)
+        self.assertEqual(item.text_without_tags, "Hello")
+        item.text = "{\\an8}Bye"
+        self.assertIsNot(item.markup, markup)
+        self.assertEqual(item.text_without_tags, "Bye")
+
+    def test_pickle(self):
+        item = SubRipItem(1, 0, 1000, text="<i>Hello</i>")
+        self.assertEqual(item.markup.plain_text, "Hello")
+        clone = pickle.loads(pickle.dumps(item))
+        self.assertEqual(clone.text_without_tags, "Hello")
+        self.assertEqual(str(clone), str(item))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""Tests for chunk-parallel parsing."""
+
+import contextlib
+import io
+import os
+import unittest
+
+import pysrt
+from pysrt import SubRipFile
+from pysrt.parallel import read_parallel, split_chunks
+
+FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def serial_parse(text, error_handling=SubRipFile.ERROR_PASS):
+    return SubRipFile().read(io.StringIO(text, newline=""), error_handling=error_handling)
+
+
+def parallel_parse(text, error_handling=SubRipFile.ERROR_PASS, jobs=2):
+    return read_parallel(
+        SubRipFile(), text, error_handling=error_handling, jobs=jobs, chunk_size=500
+    )
+
+
+class TestSplitChunks(unittest.TestCase):
+    def test_cut_after_blank_lines(self):
+        text = "1\r\n00:00:01,000 --> 00:00:02,000\r\nA\r\n \r\n2\r\n00:00:03,000 --> 00:00:04,000\r\nB\r\n"
+        chunks, first_lines = split_chunks(text, 1)
+        self.assertEqual("".join(chunks), text)
+        self.assertEqual(len(chunks), 2)
+        self.assertTrue(chunks[0].endswith("A\r\n \r\n"))
+        self.assertEqual(first_lines, [0, 4])
+
+    def test_crlf_is_one_line_break(self):
+        chunks, _ = split_chunks("1\r\nA\r\nB\r\n", 1)
+        self.assertEqual(chunks, ["1\r\nA\r\nB\r\n"])
+
+
+class TestReadParallel(unittest.TestCase):
+    def setUp(self):
+        self.static_path = os.path.join(FILE_PATH, "tests", "static")
+
+    def assertSameParse(self, text):
+        serial = serial_parse(text)
+        parallel = parallel_parse(text)
+        self.assertEqual(parallel.eol, serial.eol)
+        self.assertEqual([str(i) for i in parallel], [str(i) for i in serial])
+        self.assertEqual([i.index for i in parallel], [i.index for i in serial])
+        self.assertEqual(list(parallel), list(serial))
+
+    def test_static_files(self):
+        with open(os.path.join(self.static_path, "utf-8.srt"), encoding="utf-8", newline="") as f:
+            self.assertSameParse(f.read())
+        with open(
+            os.path.join(self.static_path, "windows-1252.srt"), encoding="windows-1252", newline=""
+        ) as f:
+            text = f.read()
+        self.assertSameParse(text)
+        self.assertSameParse(text.replace("\r\n", "\r"))
+
+    def test_missing_indexes(self):
+        text = "".join(
+            f"00:00:{second:02},000 --> 00:00:{second:02},500\n<i>Line {second}</i>\n\n"
+            for second in range(60)
+        )
+        self.assertSameParse(text)
+        self.assertIsNone(parallel_parse(text)[-1].index)
+
+    def test_error_line_numbers(self):
+        valid = "1\n00:00:01,000 --> 00:00:02,000\nHello\n\n" * 40
+        text = valid + "garbage\nmore garbage\n\n" + valid + "2\nbad --> time --> x\n"
+
+        def log_of(parse):
+            stderr = io.StringIO()
+            with contextlib.redirect_stderr(stderr):
+                parse(text, SubRipFile.ERROR_LOG)
+            return stderr.getvalue()
+
+        self.assertIn("line 162", log_of(serial_parse))
+        self.assertEqual(log_of(parallel_parse), log_of(serial_parse))
+
+        with self.assertRaises(pysrt.Error) as context:
+            parallel_parse(text, SubRipFile.ERROR_RAISE)
+        self.assertEqual(context.exception.args[0], 162)
+
+    def test_error_raise_keeps_items_before_the_error(self):
+        valid = "1\n00:00:01,000 --> 00:00:02,000\nHello\n\n" * 40
+        text = valid + "garbage\nmore garbage\n\n" + valid
+        serial = SubRipFile()
+        with self.assertRaises(pysrt.Error):
+            serial.read(io.StringIO(text, newline=""), error_handling=SubRipFile.ERROR_RAISE)
+        parallel = SubRipFile()
+        with self.assertRaises(pysrt.Error):
+            read_parallel(
+                parallel, text, error_handling=SubRipFile.ERROR_RAISE, jobs=2, chunk_size=500
+            )
+        self.assertEqual(len(serial), 40)
+        self.assertEqual([str(i) for i in parallel], [str(i) for i in serial])
+
+    def test_open_with_jobs(self):
+        path = os.path.join(self.static_path, "windows-1252.srt")
+        serial = pysrt.open(path, encoding="windows-1252")
+        parallel = pysrt.open(path, encoding="windows-1252", jobs=2)
+        self.assertEqual(parallel.eol, "\r\n")
+        self.assertEqual([str(i) for i in parallel], [str(i) for i in serial])
+        self.assertEqual([i.index for i in parallel], [i.index for i in serial])
+        self.assertEqual(list(parallel), list(serial))
+
+
+if __name__ == "__main__":
+    unittest.main()
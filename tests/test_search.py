@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Tests for the full-text index."""
+
+import os
+import unittest
+
+from pysrt import SubRipFile, SubRipItem
+from pysrt.search import SubRipIndex, normalize, tokenize
+
+FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestTokenize(unittest.TestCase):
+    def test_normalize(self):
+        self.assertEqual(normalize("ÉVÉNEMENTS"), "evenements")
+        self.assertEqual(normalize("Straße"), "strasse")
+
+    def test_tokenize(self):
+        self.assertEqual(
+            tokenize("<i>Il fut</i> un temps,\navant l'existence"),
+            ["il", "fut", "un", "temps", "avant", "l", "existence"],
+        )
+
+
+class TestSubRipIndex(unittest.TestCase):
+    def setUp(self):
+        self.file = SubRipFile.open(os.path.join(FILE_PATH, "tests", "static", "utf-8.srt"))
+        self.index = self.file.search_index()
+
+    def test_term(self):
+        items = self.index.search("Événements")
+        self.assertEqual([item.index for item in items[:2]], [1, 2])
+        self.assertTrue(all(isinstance(item, SubRipItem) for item in items))
+        self.assertEqual(items, self.index.term("evenements"))
+        self.assertEqual(self.index.search("zzzz"), [])
+        self.assertEqual(self.index.search("  "), [])
+
+    def test_matches_linear_scan(self):
+        expected = [item for item in self.file if "tele" in tokenize(item.text)]
+        self.assertTrue(expected)
+        self.assertEqual(self.index.search("TELE"), expected)
+
+    def test_prefix(self):
+        items = self.index.search("présent*")
+        self.assertIn(4, [item.index for item in items])
+        self.assertEqual(items, self.index.prefix("present"))
+        for item in items:
+            self.assertTrue(any(word.startswith("present") for word in tokenize(item.text)))
+
+    def test_phrase(self):
+        self.assertEqual([item.index for item in self.index.search("qui ont existé")], [1])
+        self.assertEqual([item.index for item in self.index.search("ont existé qui")], [])
+        self.assertEqual(self.index.find("qui ont existé"), [(1, 1)])
+
+    def test_phrase_across_cues(self):
+        # "... QUI ONT EXISTÉ." ends cue 1, "LES NOMS" starts cue 2.
+        self.assertEqual(self.index.find("existé les noms"), [(1, 2)])
+        self.assertEqual([item.index for item in self.index.search("existé les nom*")], [1, 2])
+
+    def test_tags_are_ignored(self):
+        srt_file = SubRipFile(
+            items=[SubRipItem(1, text="<i>Hello</i> <font color='red'>world</font>")]
+        )
+        index = SubRipIndex(srt_file)
+        self.assertEqual(len(index), 2)
+        self.assertEqual(len(index.search("hello world")), 1)
+        self.assertEqual(index.search("font"), [])
+
+    def test_tags_separate_words(self):
+        index = SubRipIndex(SubRipFile(items=[SubRipItem(1, text="police<br>car")]))
+        self.assertEqual(len(index.search("car")), 1)
+        self.assertEqual(len(index.search("police car")), 1)
+        self.assertEqual(tokenize("police<br/>car"), ["police", "car"])
+
+
+if __name__ == "__main__":
+    unittest.main()
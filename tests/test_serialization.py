@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""Tests for the binary serialization format."""
+
+import os
+import unittest
+
+import pysrt
+from pysrt import SubRipFile, SubRipItem, serialization
+
+FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestRoundTrip(unittest.TestCase):
+    def assertSameFile(self, first, second):
+        self.assertEqual(first.eol, second.eol)
+        self.assertEqual(first.encoding, second.encoding)
+        self.assertEqual(
+            [(i.index, i.start.ordinal, i.end.ordinal, i.text, i.position) for i in first],
+            [(i.index, i.start.ordinal, i.end.ordinal, i.text, i.position) for i in second],
+        )
+
+    def test_static_file(self):
+        path = os.path.join(FILE_PATH, "tests", "static", "windows-1252.srt")
+        srt_file = pysrt.open(path, encoding="windows-1252")
+        data = srt_file.to_bytes()
+        self.assertLess(len(data), os.path.getsize(path))
+        self.assertSameFile(SubRipFile.from_bytes(data), srt_file)
+
+    def test_edge_cases(self):
+        srt_file = SubRipFile(
+            [
+                SubRipItem(3, 5000, 4000, "Backwards", "X1:1 X2:2"),
+                SubRipItem("intro", 1000, 2000, "Repeated"),
+                SubRipItem(1, -500, 2**40, "Repeated"),
+                SubRipItem(1, 0, 0, "\udcff surrogate"),
+            ],
+            encoding="latin-1",
+        )
+        loaded = SubRipFile.from_bytes(srt_file.to_bytes(), path="movie.srt")
+        self.assertSameFile(loaded, srt_file)
+        self.assertEqual(loaded.path, "movie.srt")
+        self.assertIsNone(loaded._eol)
+
+    def test_missing_indexes(self):
+        srt_file = pysrt.from_string(
+            "00:00:01,000 --> 00:00:02,000\nHello\n\n00:00:03,000 --> 00:00:04,000\nNone\n"
+        )
+        self.assertEqual([item.index for item in srt_file], [None, None])
+        loaded = SubRipFile.from_bytes(srt_file.to_bytes())
+        self.assertSameFile(loaded, srt_file)
+        self.assertEqual([str(i) for i in loaded], [str(i) for i in srt_file])
+
+    def test_empty(self):
+        self.assertSameFile(SubRipFile.from_bytes(SubRipFile().to_bytes()), SubRipFile())
+
+
+class TestInvalidData(unittest.TestCase):
+    def setUp(self):
+        self.data = SubRipFile([SubRipItem(1, 0, 1000, "Hello")]).to_bytes()
+
+    def test_bad_magic(self):
+        self.assertRaises(ValueError, SubRipFile.from_bytes, b"NOPE" + self.data[4:])
+
+    def test_unsupported_version(self):
+        data = self.data[:4] + bytes([serialization.VERSION + 1]) + self.data[5:]
+        self.assertRaises(ValueError, SubRipFile.from_bytes, data)
+
+    def test_truncated(self):
+        for length in range(5, len(self.data)):
+            self.assertRaises(ValueError, SubRipFile.from_bytes, self.data[:length])
+
+
+if __name__ == "__main__":
+    unittest.main()
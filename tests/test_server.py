@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+"""Tests for the srt serve daemon."""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from pysrt import SubRipFile
+from pysrt.cache import ParseCache
+from pysrt.commands import SubRipShifter
+from pysrt.server import SubRipServer, send_request
+
+FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CONTENT = "1\n00:00:01,000 --> 00:00:02,000\nHello\n\n2\n00:00:03,000 --> 00:00:04,000\nWorld\n"
+
+
+class TestSubRipServer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "movie.srt")
+        shutil.copy(os.path.join(FILE_PATH, "tests", "static", "utf-8.srt"), self.path)
+        self.server = SubRipServer(
+            workers=2, cache=ParseCache(os.path.join(self.temp_dir, "cache"))
+        )
+
+    def tearDown(self):
+        self.server.close()
+        shutil.rmtree(self.temp_dir)
+
+    def run_command(self, *args):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            SubRipShifter().run(list(args))
+        return output.getvalue()
+
+    def test_same_output_as_command(self):
+        response = self.server.handle(
+            {"id": 7, "op": "shift", "path": self.path, "args": {"time_offset": "1m12s"}}
+        )
+        self.assertEqual(response["id"], 7)
+        self.assertTrue(response["ok"])
+        self.assertEqual(response["content"], self.run_command("shift", "1m12s", self.path))
+
+    def test_cached_file_is_not_altered(self):
+        request = {"op": "shift", "path": self.path, "args": {"time_offset": 1000}}
+        first = self.server.handle(request)
+        self.assertEqual(self.server.handle(request), first)
+
+    def test_inline_content(self):
+        content = CONTENT.replace("00:00:03,000", "00:00:01,500")
+        response = self.server.handle({"op": "fix-overlaps", "content": content})
+        expected = SubRipFile.from_string(content)
+        expected.fix_overlaps(buffer_ms=20)
+        output = io.StringIO()
+        expected.write_into(output)
+        self.assertEqual(response["content"], output.getvalue())
+
+    def test_validate(self):
+        response = self.server.handle({"op": "validate", "content": CONTENT[:45]})
+        self.assertEqual(response["errors"][0]["error_type"], "content")
+
+    def test_in_place(self):
+        response = self.server.handle(
+            {
+                "op": "rate",
+                "path": self.path,
+                "args": {"initial": 25, "final": 50},
+                "in_place": True,
+            }
+        )
+        self.assertEqual(response, {"ok": True, "id": None})
+        self.assertTrue(os.path.exists(self.path + ".bak"))
+        self.assertEqual(SubRipFile.open(self.path)[0].end.ordinal, 8000)
+
+    def test_split(self):
+        response = self.server.handle(
+            {"op": "split", "path": self.path, "args": {"limits": ["1m"]}}
+        )
+        self.assertEqual(len(response["paths"]), 2)
+        self.assertTrue(all(os.path.exists(path) for path in response["paths"]))
+
+    def test_errors(self):
+        for request in (
+            {"op": "rm", "path": self.path},
+            {"op": "shift", "args": {"time_offset": 1}},
+            {"op": "split", "content": CONTENT, "args": {"limits": [1]}},
+            {"op": "shift", "path": os.path.join(self.temp_dir, "missing.srt")},
+        ):
+            response = self.server.handle(request)
+            self.assertFalse(response["ok"])
+            self.assertIn("error", response)
+
+        response = self.server.handle({"op": "break", "content": CONTENT})
+        self.assertEqual(response["error"], "ValueError: break needs the arguments: length")
+
+    def test_serve_stdio(self):
+        requests = [
+            json.dumps({"id": index, "op": "shift", "content": CONTENT, "args": {"time_offset": 1}})
+            for index in range(10)
+        ]
+        output = io.StringIO()
+        self.server.serve_stdio(io.StringIO("\n".join(requests + ["not json"]) + "\n"), output)
+        responses = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(len(responses), 11)
+        self.assertEqual(sorted(r["id"] for r in responses if r["ok"]), list(range(10)))
+
+    def test_unix_socket(self):
+        socket_path = os.path.join(self.temp_dir, "srt.sock")
+        unix_server = self.server.listen(socket_path)
+        thread = threading.Thread(target=unix_server.serve_forever)
+        thread.start()
+        try:
+            response = send_request(socket_path, {"op": "shift", "content": CONTENT, "args": {}})
+            self.assertFalse(response["ok"])  # missing time_offset
+            self.assertEqual(os.stat(socket_path).st_mode & 0o777, 0o600)
+            for index in range(20):
+                response = send_request(
+                    socket_path, {"id": index, "op": "validate", "path": self.path}
+                )
+                self.assertEqual(response["id"], index)
+            expected = self.run_command("shift", "2s", self.path)
+            with mock.patch.object(self.server, "handle", wraps=self.server.handle) as handle:
+                self.assertEqual(
+                    self.run_command("--daemon", socket_path, "shift", "2s", self.path), expected
+                )
+            self.assertEqual(handle.call_count, 1)  # answered by the daemon
+            with self.assertRaises(OSError):
+                self.server.listen(socket_path)
+        finally:
+            unix_server.shutdown()
+            unix_server.server_close()
+            thread.join()
+
+    def test_fallback_without_daemon(self):
+        missing = os.path.join(self.temp_dir, "missing.sock")
+        self.assertEqual(
+            self.run_command("--daemon", missing, "shift", "2s", self.path),
+            self.run_command("shift", "2s", self.path),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
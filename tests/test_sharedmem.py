@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""Tests for shared memory transport and pickling of SubRipFile."""
+
+import copy
+import multiprocessing
+import os
+import pickle
+import unittest
+
+import pysrt
+from pysrt import SubRipFile, SubRipItem
+from pysrt.sharedmem import SharedTrack
+
+FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+class CustomItem(SubRipItem):
+    pass
+
+
+def longest_cue(name):
+    with SharedTrack.attach(name) as track:
+        return max(end - start for start, end in zip(track.starts, track.ends))
+
+
+class TestSharedTrack(unittest.TestCase):
+    def setUp(self):
+        self.file = pysrt.open(os.path.join(FILE_PATH, "tests", "static", "utf-8.srt"))
+
+    def test_columns(self):
+        with self.file.to_shared_memory() as track:
+            self.assertEqual(len(track), len(self.file))
+            self.assertEqual(list(track.starts), [i.start.ordinal for i in self.file])
+            self.assertEqual(list(track.ends), [i.end.ordinal for i in self.file])
+            self.assertEqual(track.text(3), self.file[3].text)
+            self.assertEqual(str(track[-1]), str(self.file[-1]))
+
+    def test_attach_is_read_only(self):
+        with self.file.to_shared_memory() as track, SharedTrack.attach(track.name) as view:
+            self.assertEqual(view.encoding, "utf_8")
+            with self.assertRaises(TypeError):
+                view.starts[0] = 0
+
+    def test_to_srt_file(self):
+        srt_file = SubRipFile(
+            [SubRipItem("intro", 0, 1000, "Hi", "X1:1"), SubRipItem(2, 1000, 2000, "")],
+            eol="\r\n",
+        )
+        with srt_file.to_shared_memory() as track:
+            copied = track.to_srt_file()
+        self.assertEqual(copied.eol, "\r\n")
+        self.assertEqual([str(i) for i in copied], [str(i) for i in srt_file])
+
+    def test_missing_indexes(self):
+        srt_file = SubRipFile([SubRipItem(None, 0, 1000, "Hi"), SubRipItem("None", 1000, 2000)])
+        with srt_file.to_shared_memory() as track:
+            self.assertEqual([item.index for item in track], [None, "None"])
+
+    def test_worker_process(self):
+        with self.file.to_shared_memory() as track:
+            with multiprocessing.Pool(2) as pool:
+                results = pool.map(longest_cue, [track.name] * 2)
+        expected = max(i.duration.ordinal for i in self.file)
+        self.assertEqual(results, [expected, expected])
+
+
+class TestPickle(unittest.TestCase):
+    def test_round_trip(self):
+        srt_file = pysrt.open(
+            os.path.join(FILE_PATH, "tests", "static", "windows-1252.srt"), encoding="windows-1252"
+        )
+        srt_file.extra = "kept"
+        loaded = pickle.loads(pickle.dumps(srt_file))
+        self.assertEqual(loaded.path, srt_file.path)
+        self.assertEqual(loaded.encoding, "windows-1252")
+        self.assertEqual(loaded.eol, "\r\n")
+        self.assertEqual(loaded.extra, "kept")
+        self.assertEqual([str(i) for i in loaded], [str(i) for i in srt_file])
+
+    def test_pickle_keeps_item_subclasses(self):
+        item = CustomItem(None, 0, 1000, "Hi")
+        item.speaker = "Alice"
+        srt_file = SubRipFile([item, SubRipItem(2, 1000, 2000, "Bye")])
+        loaded = pickle.loads(pickle.dumps(srt_file))
+        self.assertIsInstance(loaded[0], CustomItem)
+        self.assertIsNone(loaded[0].index)
+        self.assertEqual(loaded[0].speaker, "Alice")
+        self.assertEqual([str(i) for i in loaded], [str(i) for i in srt_file])
+        plain = SubRipFile([SubRipItem(2, 1000, 2000, "Bye")])
+        self.assertEqual(plain.__reduce_ex__(pickle.HIGHEST_PROTOCOL)[0], SubRipFile.from_bytes)
+
+    def test_copy_still_shares_items(self):
+        srt_file = SubRipFile([SubRipItem(1, 0, 1000, "Hi")])
+        self.assertIs(copy.copy(srt_file)[0], srt_file[0])
+        self.assertIsNot(copy.deepcopy(srt_file)[0], srt_file[0])
+
+    def test_deepcopy_keeps_items(self):
+        item = CustomItem(None, 0, 1000, "Hi")
+        item.speaker = "Alice"
+        srt_file = SubRipFile([item], path="movie.srt")
+        srt_file.extra = ["kept"]
+        copied = copy.deepcopy(srt_file)
+        self.assertIsInstance(copied[0], CustomItem)
+        self.assertIsNone(copied[0].index)
+        self.assertEqual(copied[0].speaker, "Alice")
+        self.assertEqual(copied.path, "movie.srt")
+        self.assertEqual(copied.extra, ["kept"])
+        self.assertIsNot(copied.extra, srt_file.extra)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -106,6 +106,47 @@ class TestSlice(unittest.TestCase):
         self.assertEqual(len(self.file.at(seconds=31)), 1)
 
 
+class TestWindow(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(FILE_PATH, "tests", "static", "utf-8.srt")
+        self.file = pysrt.open(self.path)
+
+    def test_open_window(self):
+        start, end = {"minutes": 42}, {"minutes": 45}
+        expected = self.file.slice(ends_after=start, starts_before=end)
+        self.assertEqual(len(expected), 47)
+        self.assertEqual(pysrt.open(self.path, start=start, end=end), expected)
+        self.assertEqual(pysrt.open(self.path, end=end), self.file.slice(starts_before=end))
+        self.assertEqual(pysrt.open(self.path, start=start), self.file.slice(ends_after=start))
+
+    def test_rebase(self):
+        start = (0, 42, 0, 0)
+        srt_file = pysrt.open(self.path, start=start, end=(0, 45, 0, 0), rebase=True)
+        first = self.file.slice(ends_after=start)[0]
+        self.assertEqual(srt_file[0].index, 1)
+        self.assertEqual(srt_file[0].start.ordinal, first.start.ordinal - 42 * 60 * 1000)
+
+    def test_stops_reading_after_window(self):
+        with open(self.path, encoding="utf-8", newline="") as source_file:
+            lines = iter(source_file)
+            items = list(SubRipFile.stream(lines, start=(0, 0, 40, 0), end=(0, 1, 0, 0)))
+            self.assertEqual(
+                items, self.file.slice(ends_after=(0, 0, 40, 0), starts_before=(0, 1, 0, 0)).data
+            )
+            self.assertTrue(next(lines))  # the rest of the file was not consumed
+
+    def test_unsorted(self):
+        source = (
+            "1\n00:00:05,000 --> 00:00:06,000\nlate\n\n"
+            "2\n00:00:01,000 --> 00:00:02,000\nearly\n\n"
+            "3\n --> 00:00:01,000\nno start\n\n"
+        ).splitlines(True)
+        window = {"start": 0, "end": 3000}
+        self.assertEqual(list(SubRipFile.stream(source, **window)), [])
+        items = list(SubRipFile.stream(source, assume_sorted=False, **window))
+        self.assertEqual([item.text for item in items], ["early", "no start"])
+
+
 class TestShifting(unittest.TestCase):
     def test_shift(self):
         srt_file = SubRipFile([SubRipItem()])
@@ -26,6 +26,14 @@ class TestAttributes(unittest.TestCase):
         self.assertTrue(hasattr(self.item, "end"))
         self.assertTrue(isinstance(self.item.end, SubRipTime))
 
+    def test_from_values(self):
+        item = SubRipItem.from_values(None, 1000, 2000, "<i>Hi</i>", "X1:1")
+        expected = SubRipItem(None, 1000, 2000, "<i>Hi</i>", "X1:1")
+        self.assertEqual(vars(item).keys(), vars(expected).keys())
+        self.assertEqual(str(item), str(expected))
+        self.assertEqual(item.text_without_tags, "Hi")
+        self.assertEqual(vars(item.start), vars(expected.start))
+
 
 class TestDuration(unittest.TestCase):
     def setUp(self):
@@ -110,6 +110,7 @@ class TestCoercing(unittest.TestCase):
     def test_from_ordinal(self):
         self.assertEqual(SubRipTime.from_ordinal(3600000), {"hours": 1})
         self.assertEqual(SubRipTime(1), 3600000)
+        self.assertEqual(SubRipTime.from_int_ordinal(3600000), {"hours": 1})
 
 
 class TestOperators(unittest.TestCase):
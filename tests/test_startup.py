@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""Import time budget of the `srt` command."""
+
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import unittest
+
+FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Cumulative `-X importtime` budget, in microseconds, for `import pysrt.commands`.
+# Generous on purpose: it is meant to catch heavy imports creeping back in,
+# not to benchmark the machine running the tests.
+STARTUP_BUDGET_US = 150_000
+
+HEAVY_MODULES = (
+    "chardet",
+    "dataclasses",
+    "asyncio",
+    "multiprocessing",
+    "concurrent.futures",
+    "sqlite3",
+    "numpy",
+    "shutil",
+    "pysrt.validation",
+    "pysrt.timing",
+)
+
+
+def import_times(module):
+    """Return {module name: cumulative import time in us} for `import module`."""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=FILE_PATH,
+    ).stderr
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup(unittest.TestCase):
+    def test_no_heavy_imports(self):
+        for module in ("pysrt", "pysrt.commands"):
+            imported = import_times(module)
+            for heavy_module in HEAVY_MODULES:
+                self.assertNotIn(heavy_module, imported, f"imported by {module}")
+
+    def test_budget(self):
+        elapsed = min(import_times("pysrt.commands")["pysrt.commands"] for _ in range(3))
+        self.assertLess(elapsed, STARTUP_BUDGET_US)
+
+    def test_lazy_validation_names(self):
+        import pysrt
+        from pysrt.validation import ValidationError
+
+        self.assertIs(pysrt.ValidationError, ValidationError)
+        self.assertRaises(AttributeError, getattr, pysrt, "NoSuchName")
+
+
+class TestCommandLine(unittest.TestCase):
+    def test_command_is_required(self):
+        from pysrt.commands import SubRipShifter
+
+        for args in ([], ["-i"]):
+            stderr = io.StringIO()
+            with contextlib.redirect_stderr(stderr), self.assertRaises(SystemExit) as context:
+                SubRipShifter().run(args)
+            self.assertEqual(context.exception.code, 2)
+            self.assertIn("the following arguments are required: command", stderr.getvalue())
+
+    def test_find_command_skips_option_values(self):
+        from pysrt.commands import SubRipShifter
+
+        shifter = SubRipShifter()
+        self.assertEqual(shifter.find_command(["--daemon", "split", "shift", "1s", "a"]), "shift")
+        self.assertEqual(shifter.find_command(["--dae", "split", "-i", "rate", "1", "2"]), "rate")
+        self.assertEqual(shifter.find_command(["--daemon=split", "shift", "1s", "a"]), "shift")
+        self.assertEqual(shifter.find_command(["-e", "latin-1", "break", "42", "a"]), "break")
+        self.assertIsNone(shifter.find_command(["-i"]))
+        args = ["--daemon", "split", "shift", "1s", "movie.srt"]
+        self.assertEqual(shifter.build_parser(args).parse_args(args).time_offset, 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Tests for incremental decoding and binary streaming."""
+
+import io
+import os
+import unittest
+
+import pysrt
+from pysrt.streaming import LineSplitter, TextDecoder
+
+FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+STATIC_PATH = os.path.join(FILE_PATH, "tests", "static")
+
+
+def byte_by_byte(data):
+    return (data[i : i + 1] for i in range(len(data)))
+
+
+class TestLineSplitter(unittest.TestCase):
+    def test_same_as_file_iteration(self):
+        text = "a\r\nb\rc\n\r\nd"
+        for size in (1, 2, 3, len(text)):
+            splitter = LineSplitter()
+            lines = []
+            for start in range(0, len(text), size):
+                lines += splitter.feed(text[start : start + size])
+            lines += splitter.close()
+            self.assertEqual(lines, io.StringIO(text, newline="").readlines())
+
+
+class TestTextDecoder(unittest.TestCase):
+    def test_sniff_bom(self):
+        decoder = TextDecoder()
+        data = "\ufeffHé".encode("utf-32-le")
+        text = "".join(decoder.decode(byte) for byte in byte_by_byte(data))
+        self.assertEqual(text + decoder.decode(b"", final=True), "Hé")
+        self.assertEqual(decoder.encoding, "utf_32_le")
+
+    def test_default_to_utf8(self):
+        decoder = TextDecoder()
+        self.assertEqual(decoder.decode(b"Hi", final=True), "Hi")
+        self.assertEqual(decoder.encoding, "utf_8")
+
+
+class TestStreamBytes(unittest.TestCase):
+    def _assert_same_as_open(self, name, **kwargs):
+        path = os.path.join(STATIC_PATH, name)
+        expected = [str(i) for i in pysrt.open(path, **kwargs)]
+        with open(path, "rb") as source:
+            self.assertEqual([str(i) for i in pysrt.stream_bytes(source, **kwargs)], expected)
+        with open(path, "rb") as source:
+            data = source.read()
+        self.assertEqual(
+            [str(i) for i in pysrt.stream_bytes(byte_by_byte(data), **kwargs)], expected
+        )
+
+    def test_boms(self):
+        for encoding in ("utf-8", "utf-16-le", "utf-16-be", "utf-32-le", "utf-32-be"):
+            self._assert_same_as_open(f"bom-{encoding}.srt")
+
+    def test_claimed_encoding(self):
+        self._assert_same_as_open("windows-1252.srt", encoding="windows-1252")
+
+    def test_lazy(self):
+        chunks = iter([b"1\n00:00:01,000 --> 00:00:02,000\nHi\n\n", b"garbage"])
+        items = pysrt.stream_bytes(chunks)
+        self.assertEqual(next(items).text, "Hi")
+        self.assertEqual(next(chunks), b"garbage")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""Tests for automatic synchronization."""
+
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from pysrt import SubRipFile, SubRipItem, sync
+from pysrt.commands import SubRipShifter
+from pysrt.sync import fft, robust_linear_fit, speech_signal, synchronize
+
+FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SOURCE = os.path.join(FILE_PATH, "tests", "static", "utf-8.srt")
+
+
+def out_of_sync(ratio, milliseconds, seed=1):
+    """The reference track, with cues dropped and jittered, then shifted so
+    that `ratio` and `milliseconds` bring it back in sync."""
+    rng = random.Random(seed)
+    target = SubRipFile.open(SOURCE)
+    target.data = [item for item in target if rng.random() > 0.3 and item.start.ordinal > 0]
+    for item in target:
+        item.start.shift(milliseconds=rng.randint(-100, 100))
+        item.end.shift(milliseconds=rng.randint(-200, 200))
+    target.shift(milliseconds=-milliseconds)
+    target.shift(ratio=1 / ratio)
+    return target
+
+
+class TestSignals(unittest.TestCase):
+    def test_fft(self):
+        rng = random.Random(0)
+        values = [complex(rng.random(), rng.random()) for _ in range(64)]
+        spectrum = fft(values)
+        self.assertAlmostEqual(spectrum[0], sum(values))
+        for expected, value in zip(values, fft(spectrum, inverse=True)):
+            self.assertAlmostEqual(expected, value)
+
+    def test_speech_signal(self):
+        self.assertEqual(
+            speech_signal([(50, 250), (300, 350)], resolution=100), [0.5, 1.0, 0.5, 0.5, 0.0]
+        )
+        self.assertEqual(speech_signal([(100, 200)], resolution=100, ratio=2), [0, 0, 1, 1, 0])
+
+    def test_robust_linear_fit(self):
+        xs = list(range(0, 100000, 1000))
+        ys = [x * 1.5 + 300 for x in xs]
+        ys[10] += 50000
+        ys[20] -= 3000
+        slope, intercept, inliers = robust_linear_fit(xs, ys)
+        self.assertAlmostEqual(slope, 1.5)
+        self.assertAlmostEqual(intercept, 300)
+        self.assertEqual(inliers, 98)
+
+
+class TestSynchronize(unittest.TestCase):
+    def setUp(self):
+        self.reference = SubRipFile.open(SOURCE)
+
+    def check(self, ratio, milliseconds, **kwargs):
+        result = synchronize(self.reference, out_of_sync(ratio, milliseconds), **kwargs)
+        self.assertAlmostEqual(result.ratio, ratio, places=5)
+        self.assertAlmostEqual(result.offset, milliseconds, delta=15)
+        self.assertGreater(result.anchors, 1000)
+        return result
+
+    def test_offset(self):
+        self.check(1.0, 3200)
+        self.check(1.0, -45678)
+
+    def test_frame_rate_drift(self):
+        self.check(25 / 23.976, 2500)
+        self.check(24 / 25, 120000)
+
+    def test_small_drift(self):
+        self.check(1.0007, -700)
+
+    def test_resolutions(self):
+        self.check(1.0, 3200, resolution=100)
+        result = synchronize(self.reference, out_of_sync(1.0, 3200), resolution=100, refine=False)
+        self.assertEqual(result.anchors, 0)
+        self.assertAlmostEqual(result.offset, 3200, delta=100)
+
+    def test_max_offset(self):
+        result = synchronize(self.reference, out_of_sync(1.0, 120000), max_offset=60000)
+        self.assertNotAlmostEqual(result.offset, 120000, delta=1000)
+
+    def test_apply(self):
+        target = out_of_sync(25 / 24, 1000)
+        result = synchronize(self.reference, target)
+        self.assertIs(result.apply(target), target)
+        reference_starts = {item.start.ordinal for item in self.reference}
+        for item in target:
+            self.assertTrue(
+                any(abs(item.start.ordinal - start) <= 120 for start in reference_starts)
+            )
+
+    def test_empty(self):
+        self.assertRaises(ValueError, synchronize, self.reference, SubRipFile())
+
+    def test_noise(self):
+        target = out_of_sync(1.0, 5000)
+        rng = random.Random(2)
+        for _ in range(100):
+            start = rng.randint(0, 5000000)
+            target.append(SubRipItem(0, start, start + 2000, "noise"))
+        result = synchronize(self.reference, target)
+        self.assertAlmostEqual(result.offset, 5000, delta=15)
+
+    @unittest.skipIf(sync.numpy is None, "NumPy is not installed")
+    def test_numpy_and_pure_python_agree(self):
+        target = out_of_sync(25 / 23.976, 2500)
+        accelerated = synchronize(self.reference, target, resolution=200)
+        with mock.patch.object(sync, "numpy", None):
+            pure = synchronize(self.reference, target, resolution=200)
+        self.assertAlmostEqual(accelerated.ratio, pure.ratio, places=6)
+        self.assertAlmostEqual(accelerated.offset, pure.offset, delta=1)
+
+
+class TestSyncCommand(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "movie.srt")
+        out_of_sync(25 / 23.976, 2500).save(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def run_command(self, *args):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(io.StringIO()):
+            SubRipShifter().run(list(args))
+        return output.getvalue()
+
+    def test_estimate(self):
+        estimate = json.loads(self.run_command("sync", "--estimate", SOURCE, self.path))
+        self.assertAlmostEqual(estimate["ratio"], 25 / 23.976, places=5)
+        self.assertAlmostEqual(estimate["offset"], 2500, delta=15)
+
+    def test_in_place(self):
+        self.run_command("-i", "sync", SOURCE, self.path)
+        self.assertTrue(os.path.exists(self.path + ".bak"))
+        synced = SubRipFile.open(self.path)
+        reference = {item.text: item.start.ordinal for item in SubRipFile.open(SOURCE)}
+        self.assertAlmostEqual(synced[-1].start.ordinal, reference[synced[-1].text], delta=150)
@@ -1,7 +1,16 @@
+import json
+
 import pytest
 
 from pysrt import SubRipFile, SubRipItem
-from pysrt.timing import calculate_optimal_duration_ms
+from pysrt.commands import SubRipShifter
+from pysrt.timing import (
+    ShotChangeAdjustment,
+    UnsatisfiedCue,
+    calculate_optimal_duration_ms,
+    parse_timestamp,
+    read_shot_changes,
+)
 
 
 def test_optimal_duration_calculation():
@@ -73,3 +82,185 @@ def test_fix_overlaps_close_timing():
     # Should adjust to have at least 20ms buffer
     gap_ms = (subs[1].start - subs[0].end).ordinal
     assert gap_ms >= 20
+
+
+def make_subs(*times):
+    return SubRipFile(
+        [
+            SubRipItem(i + 1, start=start, end=end, text=f"Cue {i + 1}")
+            for i, (start, end) in enumerate(times)
+        ]
+    )
+
+
+def test_parse_timestamp():
+    assert parse_timestamp("00:01:02,500").ordinal == 62500
+    assert parse_timestamp(" 62500\n").ordinal == 62500
+    assert parse_timestamp((0, 1, 2, 500)).ordinal == 62500
+
+
+def test_remap_interpolates_between_anchors():
+    subs = make_subs((1000, 2000), (150000, 151000), (400000, 401000))
+    removed = subs.remap([("00:01:00,000", "00:01:02,000"), (300000, 301000)])
+    assert removed == []
+    # Offset of the nearest anchor outside, linear in between
+    assert [(sub.start.ordinal, sub.end.ordinal) for sub in subs] == [
+        (3000, 4000),
+        (151625, 152621),
+        (401000, 402000),
+    ]
+
+
+def test_remap_single_anchor_is_a_shift():
+    subs = make_subs((1000, 2000))
+    subs.remap([({"seconds": 10}, {"seconds": 12})])
+    assert (subs[0].start.ordinal, subs[0].end.ordinal) == (3000, 4000)
+
+
+def test_remap_clips_removed_segments():
+    subs = make_subs((50000, 61000), (65000, 70000), (119000, 125000), (130000, 131000))
+    anchors = [("00:01:00,000", "00:01:00,000"), ("00:02:00,000", "00:01:00,000")]
+    removed = subs.remap(anchors)
+    assert [sub.index for sub in removed] == [2]
+    assert [(sub.start.ordinal, sub.end.ordinal) for sub in subs] == [
+        (50000, 60000),
+        (60000, 65000),
+        (70000, 71000),
+    ]
+
+
+def test_remap_drops_removed_segments():
+    subs = make_subs((50000, 60000), (59000, 61000), (119000, 125000), (120000, 121000))
+    anchors = [("00:01:00,000", "00:01:00,000"), ("00:02:00,000", "00:01:00,000")]
+    removed = subs.remap(anchors, drop=True)
+    assert [sub.index for sub in removed] == [2, 3]
+    assert [sub.index for sub in subs] == [1, 4]
+    assert subs[1].start.ordinal == 60000
+
+
+@pytest.mark.parametrize(
+    "anchors",
+    [[], [(1000, 2000), (1000, 3000)], [(1000, 5000), (2000, 4000)]],
+)
+def test_remap_rejects_invalid_anchors(anchors):
+    with pytest.raises(ValueError):
+        make_subs((0, 1000)).remap(anchors)
+
+
+def test_remap_command(tmp_path, capsys):
+    path = tmp_path / "movie.srt"
+    make_subs((50000, 52000), (65000, 70000), (130000, 131000)).save(str(path))
+    anchors = tmp_path / "anchors.txt"
+    anchors.write_text("# cut\n00:01:00,000 00:01:00,000\n\n120000 60000\n")
+    SubRipShifter().run(["-i", "remap", "--anchors", str(anchors), str(path)])
+    assert capsys.readouterr().err == "Removed 1 cues\n"
+    subs = SubRipFile.open(str(path))
+    assert [(sub.index, sub.start.ordinal) for sub in subs] == [(1, 50000), (2, 70000)]
+
+    SubRipShifter().run(["remap", "1m=1m", "1m30s=1m", str(path)])
+    assert "00:00:50,000 --> 00:00:52,000" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("line", ["00:01:00,000", "1000 2000 3000", "1000 bogus"])
+def test_remap_command_reports_bad_anchors(tmp_path, capsys, line):
+    path = tmp_path / "movie.srt"
+    make_subs((50000, 52000)).save(str(path))
+    anchors = tmp_path / "anchors.txt"
+    anchors.write_text(f"# anchors\n0 0\n{line}\n")
+    with pytest.raises(SystemExit) as exit_info:
+        SubRipShifter().run(["remap", "--anchors", str(anchors), str(path)])
+    assert exit_info.value.code == 2
+    assert capsys.readouterr().err.startswith(f"{anchors}:3: ")
+
+
+def test_read_shot_changes(tmp_path):
+    path = tmp_path / "shots.txt"
+    path.write_text("# shot changes\n00:00:02,000\n\n1000\n00:00:01,500\n")
+    assert read_shot_changes(str(path)) == [1000, 1500, 2000]
+
+
+def test_snap_to_nearest_shot_change():
+    subs = make_subs((1000, 3000), (10000, 12000))
+    adjustments = subs.snap_to_shot_changes([900, 1300, 3400, 9000, 20000])
+    assert [(sub.start.ordinal, sub.end.ordinal) for sub in subs] == [(900, 3400), (10000, 12000)]
+    assert adjustments == [ShotChangeAdjustment(0, 1, -100, 400)]
+
+
+def test_snap_keeps_min_gap():
+    # Both cues want the shot change at 3000: the first one ends 2 frames before it
+    subs = make_subs((1000, 2950), (3050, 5000))
+    subs.snap_to_shot_changes([3000], min_gap_ms=80)
+    assert [(sub.start.ordinal, sub.end.ordinal) for sub in subs] == [(1000, 2920), (3000, 5000)]
+    # A start too close to the end before it is not snapped
+    subs = make_subs((1000, 2950), (3200, 5000))
+    subs.snap_to_shot_changes([2990], min_gap_ms=80)
+    assert subs[1].start.ordinal == 3200
+
+
+def test_snap_keeps_min_duration():
+    subs = make_subs((1000, 2000))
+    assert subs.snap_to_shot_changes([1400, 1600], min_duration_ms=833) == []
+    subs.snap_to_shot_changes([1100, 1600], min_duration_ms=500)
+    assert (subs[0].start.ordinal, subs[0].end.ordinal) == (1100, 1600)
+
+
+def test_snap_command(tmp_path, capsys):
+    path = tmp_path / "movie.srt"
+    make_subs((1000, 3000), (10000, 12000)).save(str(path))
+    shots = tmp_path / "shots.txt"
+    shots.write_text("00:00:00,900\n11800\n")
+    report = tmp_path / "report.ndjson"
+    SubRipShifter().run(
+        ["-i", "snap", "--window", "250ms", "--report", str(report), str(shots), str(path)]
+    )
+    assert capsys.readouterr().err == "Snapped 2 of 2 cues\n"
+    assert [sub.end.ordinal for sub in SubRipFile.open(str(path))] == [3000, 11800]
+    assert [json.loads(line)["end_shift_ms"] for line in report.read_text().splitlines()] == [
+        0,
+        -200,
+    ]
+
+
+def test_retime_extends_into_gaps():
+    # 34 characters need 2000ms at 17 cps
+    subs = make_subs((1000, 2000), (5000, 8000))
+    subs[0].text = "<i>Seventeen characters</i>\nagain, 17 more"
+    assert subs.retime_for_cps(max_cps=17) == []
+    assert subs[0].end.ordinal == 3000
+
+
+def test_retime_borrows_from_neighbours():
+    text = "x" * 34  # 2000ms at 17 cps
+    subs = make_subs((1000, 2000), (2100, 6000), (10000, 11000), (11080, 11500))
+    for sub in subs:
+        sub.text = text
+    assert subs.retime_for_cps(max_cps=17, min_gap_ms=80) == []
+    assert [(sub.start.ordinal, sub.end.ordinal) for sub in subs] == [
+        (1000, 3000),  # into the gap, then the next cue starts later
+        (3080, 6000),
+        (9000, 11000),  # earlier into the gap before
+        (11080, 13080),  # the end is free after the last cue
+    ]
+
+
+def test_retime_reports_unsatisfied_cues():
+    # The second cue has no spare time to lend
+    subs = make_subs((1000, 1500), (1580, 2413), (6000, 20000))
+    subs[0].text = "x" * 34
+    unsatisfied = subs.retime_for_cps(max_cps=17, min_duration_ms=833, max_duration_ms=7000)
+    assert [(sub.start.ordinal, sub.end.ordinal) for sub in subs] == [
+        (0, 1500),
+        (1580, 2413),
+        (6000, 13000),
+    ]
+    assert unsatisfied == [UnsatisfiedCue(0, 1, 22.67, 500)]
+
+
+def test_retime_command(tmp_path, capsys):
+    path = tmp_path / "movie.srt"
+    subs = make_subs((0, 500), (580, 700))
+    subs[0].text = "x" * 34
+    subs.save(str(path))
+    SubRipShifter().run(["-i", "retime", "--cps", "20", "--min-duration", "1s", str(path)])
+    assert capsys.readouterr().err == "Still too fast or too short:\n  #1 68.0 cps, 1200ms short\n"
+    assert SubRipFile.open(str(path))[1].end.ordinal == 1580
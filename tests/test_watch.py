@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""Tests for watching directories."""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from pysrt import SubRipFile
+from pysrt.commands import SubRipShifter
+from pysrt.watch import InotifyMonitor, SubRipWatcher
+
+FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SOURCE = os.path.join(FILE_PATH, "tests", "static", "utf-8.srt")
+
+
+class TestSubRipWatcher(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.directory = os.path.join(self.temp_dir, "incoming")
+        os.makedirs(self.directory)
+        self.path = os.path.join(self.directory, "movie.srt")
+        shutil.copy(SOURCE, self.path)
+        self.records = []
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def watcher(self, operations=(("shift", {"time_offset": 1000}),), **kwargs):
+        kwargs.setdefault("debounce", 0.05)
+        kwargs.setdefault("interval", 0.05)
+        return SubRipWatcher(self.directory, operations, report=self.records.append, **kwargs)
+
+    def first_start(self, path=None):
+        return SubRipFile.open(path or self.path)[0].start.ordinal
+
+    def test_only_new_or_changed_files(self):
+        self.assertEqual(self.watcher().run_once(), [self.path])
+        self.assertEqual(self.first_start(), 2000)
+        self.assertTrue(os.path.exists(self.path + ".bak"))
+
+        # The state file survives restarts, and in place edits are not
+        # mistaken for new changes.
+        self.assertEqual(self.watcher().run_once(), [])
+        self.assertEqual(self.first_start(), 2000)
+
+        os.utime(self.path, ns=(0, 0))  # touched, but same content
+        self.assertEqual(self.watcher().run_once(), [])
+
+        shutil.copy(SOURCE, self.path)
+        other_path = os.path.join(self.directory, "other.srt")
+        shutil.copy(SOURCE, other_path)
+        self.assertEqual(sorted(self.watcher().run_once()), [self.path, other_path])
+        self.assertEqual(self.first_start(), 2000)
+
+    def test_removed_files_are_forgotten(self):
+        watcher = self.watcher(operations=[("validate", {})])
+        watcher.run_once()
+        self.assertIn("movie.srt", watcher.load_state())
+        os.remove(self.path)
+        watcher.run_once()
+        self.assertEqual(watcher.load_state(), {})
+
+    def test_chained_operations_with_output_dir(self):
+        output_dir = os.path.join(self.directory, "out")
+        operations = [("shift", {"time_offset": 1000}), ("rate", {"initial": 25, "final": 50})]
+        self.watcher(operations, output_dir=output_dir).run_once()
+        output_path = os.path.join(output_dir, "movie.srt")
+        self.assertEqual(self.first_start(output_path), 4000)
+        self.assertEqual(self.first_start(), 1000)
+        self.assertEqual([record["op"] for record in self.records], ["shift", "rate"])
+        # Outputs are not watched.
+        self.assertEqual(self.watcher(operations, output_dir=output_dir).run_once(), [])
+
+    def test_split(self):
+        operations = [("split", {"limits": [60000]})]
+        self.watcher(operations).run_once()
+        parts = [os.path.join(self.directory, f"movie.{part}.srt") for part in (1, 2)]
+        self.assertEqual(self.records[0]["paths"], parts)
+        self.assertTrue(all(os.path.exists(part) for part in parts))
+        self.assertFalse(os.path.exists(self.path + ".bak"))
+        # The parts are not split in turn.
+        self.assertEqual(self.watcher(operations).run_once(), [])
+
+    def test_split_with_output_dir(self):
+        output_dir = os.path.join(self.temp_dir, "out")
+        operations = [("shift", {"time_offset": 1000}), ("split", {"limits": [60000]})]
+        self.watcher(operations, output_dir=output_dir).run_once()
+        self.assertEqual(
+            sorted(os.listdir(output_dir)), ["movie.1.srt", "movie.2.srt", "movie.srt"]
+        )
+        self.assertEqual(self.first_start(os.path.join(output_dir, "movie.1.srt")), 2000)
+        self.assertEqual(sorted(os.listdir(self.directory)), [".srt-watch.json", "movie.srt"])
+
+    def test_failures_are_reported(self):
+        with open(self.path, "wb") as broken:
+            broken.write(b"\xff\xfe\x00")
+        self.assertEqual(self.watcher().run_once(), [self.path])
+        self.assertFalse(self.records[0]["ok"])
+        self.assertEqual(self.watcher().run_once(), [])
+
+    def wait_for(self, count, timeout=5):
+        deadline = time.monotonic() + timeout
+        while len(self.records) < count and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(len(self.records), count)
+
+    def check_watch(self, polling):
+        watcher = self.watcher(polling=polling)
+        thread = threading.Thread(target=watcher.watch)
+        thread.start()
+        try:
+            self.wait_for(1)  # catch up with the existing file
+            os.makedirs(os.path.join(self.directory, "season1"))
+            new_path = os.path.join(self.directory, "season1", "e01.srt")
+            shutil.copy(SOURCE, new_path)
+            self.wait_for(2)
+            self.assertEqual(self.records[1]["path"], new_path)
+            self.assertEqual(self.first_start(new_path), 2000)
+            time.sleep(0.2)
+            self.assertEqual(len(self.records), 2)
+        finally:
+            watcher.stop()
+            thread.join()
+
+    def test_watch_polling(self):
+        self.check_watch(polling=True)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux only")
+    def test_watch_inotify(self):
+        InotifyMonitor(self.directory).close()
+        self.check_watch(polling=False)
+
+    def test_parse_operations(self):
+        shifter = SubRipShifter()
+        shifter.arguments = argparse.Namespace(command="watch")
+        self.assertEqual(
+            shifter.parse_operations(["--", "shift", "-1s", "--", "fix-overlaps", "--buffer", "5"]),
+            [("shift", {"time_offset": -1000}), ("fix-overlaps", {"buffer": 5})],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""Tests for the append-only live writer."""
+
+import copy
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import pysrt
+from pysrt import SubRipItem
+from pysrt.writer import SubRipWriter
+
+FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+class TestSubRipWriter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "live.srt")
+        self.file = pysrt.open(
+            os.path.join(FILE_PATH, "tests", "static", "windows-1252.srt"), encoding="windows-1252"
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def expected(self, srt_file, eol="\r\n"):
+        srt_file.clean_indexes()
+        output = io.StringIO()
+        srt_file.write_into(output, eol=eol)
+        return output.getvalue()
+
+    def test_same_as_write_into(self):
+        with SubRipWriter(self.path, eol="\r\n", encoding="windows-1252") as writer:
+            writer.extend(copy.deepcopy(self.file))
+        with open(self.path, encoding="windows-1252", newline="") as written:
+            self.assertEqual(written.read(), self.expected(self.file))
+
+    def test_each_cue_is_flushed(self):
+        writer = SubRipWriter(self.path, eol="\n")
+        writer.append(SubRipItem(0, 1000, 2000, "Hello"))
+        with open(self.path) as written:
+            self.assertEqual(written.read(), "1\n00:00:01,000 --> 00:00:02,000\nHello\n\n")
+        writer.close()
+
+    def test_fix_overlaps(self):
+        output = io.StringIO()
+        with SubRipWriter(output, eol="\n", fix_overlaps=True, buffer_ms=50) as writer:
+            writer.extend(copy.deepcopy(self.file))
+        self.assertEqual(
+            output.getvalue(), self.expected(self.file.fix_overlaps(buffer_ms=50), "\n")
+        )
+
+    def test_window(self):
+        output = io.StringIO()
+        writer = SubRipWriter(output, window_ms=5000)
+        for second in range(0, 60, 2):
+            writer.append(SubRipItem(0, {"seconds": second}, {"seconds": second + 1}, "Hi"))
+        self.assertEqual([item.start.seconds for item in writer.recent], [52, 54, 56, 58])
+        self.assertEqual(writer.count, 30)
+
+
+if __name__ == "__main__":
+    unittest.main()